@@ -12,6 +12,7 @@ Ana Özellikler:
 - Çok dilli destek (Türkçe/İngilizce)
 - Bütçe yönetimi
 - Bağımlılık tabanlı akış kontrolü
+- İstek süre bütçesi (app.deadline): süre yetmezse degraded öneriler
 
 Ana Sınıflar:
 - Agent: Ana agent sınıfı, kullanıcı etkileşimlerini yönetir
@@ -45,7 +46,13 @@ Kullanım:
 import json
 import os
 from .config import setup_gemini, get_gemini_model, generate_with_retry
-import json
+from .answer_normalizer import AnswerNormalizer, is_budget_answer
+from .recommendation_scoring import filter_by_budget
+from .price_parser import parse_budget_band
+from .telemetry import traced
+from .category_index import get_category_matcher
+from .fallback_catalog import get_fallback_catalog
+from .json_codec import PreencodedDict, dumps_text, load_file, with_fields
 
 def detect_category_from_query(query):
     """
@@ -61,7 +68,7 @@ def detect_category_from_query(query):
         str or None: Tespit edilen kategori adı veya None (bulunamazsa)
         
     Özellikler:
-        - Yerel Türkçe-İngilizce eşleştirme
+        - Yerel Türkçe-İngilizce bulanık eşleştirme (ek, yazım hatası toleranslı)
         - AI destekli kategori tanıma
         - Yeni kategori oluşturma
         - Hata yönetimi ve loglama
@@ -77,30 +84,13 @@ def detect_category_from_query(query):
     try:
         print(f"🔍 Detecting category for query: '{query}'")
         
-        # Quick local mapping for common Turkish terms
-        # Only include categories that actually exist in categories.json
-        local_mappings = {
-            'kulaklık': 'Headphones',
-            'kulaklik': 'Headphones',
-            'headphones': 'Headphones',
-            'klima': 'Klima',
-            'airconditioner': 'Klima',
-            'lastik': 'Tire',
-            'tire': 'Tire',
-            'televizyon': 'Television',
-            'tv': 'Television',
-            'television': 'Television',
-            # Removed non-existing categories: Phone, Laptop, Mouse, Charger, Drill, Hair Dryer
-            # These will be handled by CategoryGenerator AI creation
-        }
-        
-        query_lower = query.strip().lower()
-        
-        # Check local mappings first
-        if query_lower in local_mappings:
-            mapped_category = local_mappings[query_lower]
-            print(f"✅ Local mapping found: '{query}' → '{mapped_category}'")
-            return mapped_category
+        # Quick local match: names, synonyms, Turkish suffixes and typos
+        # resolve without Gemini; low-confidence queries fall through to AI
+        local_match = get_category_matcher().match(query)
+        if local_match:
+            print(f"✅ Local match found: '{query}' → '{local_match['category']}' "
+                  f"({local_match['method']}, confidence {local_match['confidence']})")
+            return local_match['category']
         
         from .category_generator import CategoryGenerator
         
@@ -109,7 +99,7 @@ def detect_category_from_query(query):
         result = category_generator.intelligent_category_detection(query)
         
         # Handle different match types
-        if result['match_type'] in ['exact', 'partial', 'ai_recognition']:
+        if result['match_type'] in ['exact', 'local', 'partial', 'ai_recognition']:
             print(f"✅ Category found: {result['match_type']} - '{result['category']}'")
             return result['category']
             
@@ -161,14 +151,27 @@ class Agent:
     """
     
     def __init__(self):
+        self.answer_normalizer = AnswerNormalizer()
+        # Kodlanmış soru payload'ları: (id(spec), dil, neden) → (spec, PreencodedDict)
+        self._question_cache = {}
+        self._categories_mtime = None
         self.categories = self.load_categories()
 
+    @traced('load_categories')
     def load_categories(self):
         try:
-            with open('categories.json', 'r', encoding='utf-8') as f:
-                return json.load(f)
+            # Dosya değişmediyse ayrıştırılmış katalog ve soru payload'ları aynen kullanılır
+            mtime = os.path.getmtime('categories.json')
+            if mtime == self._categories_mtime:
+                return self.categories
+            # Dosya değiştiyse cevap önbelleği eski option etiketlerini tutmasın
+            self._categories_mtime = mtime
+            self.answer_normalizer.clear()
+            self._question_cache.clear()
+            return load_file('categories.json')
         except FileNotFoundError:
             print("❌ categories.json dosyası bulunamadı!")
+            self._categories_mtime = None
             return {}
 
     def handle(self, data):
@@ -180,14 +183,14 @@ class Agent:
         language = data.get('language', 'en')
         
         print(f"🔄 Agent.handle çağrıldı - Step: {step}, Category: {category}, Answers: {answers}")
-        print(f"📊 Raw data: {json.dumps(data, indent=2, ensure_ascii=False)}")
+        print(f"📊 Raw data: {dumps_text(data, indent=True)}")
         
         if step == 0:
             # İlk adım: Kategori seçimi
-            return {
+            return self._cached_payload(('categories', language), lambda: {
                 'question': 'What tech are you shopping for?' if language == 'en' else 'Hangi teknoloji ürününü arıyorsunuz?',
                 'categories': list(self.categories.keys())
-            }
+            })
         
         elif category:
             # Check if category exists, if not try to create it with CategoryGenerator
@@ -203,7 +206,7 @@ class Agent:
                     # Reload categories to include the new one
                     self.categories = self.load_categories()
                     category = result['category']  # Use the AI-determined category name
-                elif result['match_type'] in ['exact', 'partial', 'ai_recognition']:
+                elif result['match_type'] in ['exact', 'local', 'partial', 'ai_recognition']:
                     print(f"✅ Category mapped to existing: '{result['category']}'")
                     category = result['category']
                 else:
@@ -215,7 +218,7 @@ class Agent:
                 specs = self.categories[category]['specs']
                 
                 # Kullanıcının mevcut tercihlerini analiz et
-                preferences = self._analyze_current_preferences(answers, specs)
+                preferences = self._analyze_current_preferences(answers, specs, category)
                 
                 # Frontend'den gelen özel alanları ekle (budget_band gibi)
                 if 'budget_band' in data:
@@ -226,7 +229,7 @@ class Agent:
                 
                 confidence_score = self._calculate_confidence_score(preferences, specs)
                 
-                print(f"🎯 Preferences: {json.dumps(preferences, indent=2, ensure_ascii=False)}")
+                print(f"🎯 Preferences: {dumps_text(preferences, indent=True)}")
                 print(f"📈 Confidence Score: {confidence_score}")
                 print(f"📋 Asked specs so far: {asked_specs}")
                 
@@ -236,8 +239,7 @@ class Agent:
                 if next_question:
                     # Progress bilgisi ekle
                     progress = self._calculate_progress(preferences, specs)
-                    next_question['progress'] = progress
-                    return next_question
+                    return with_fields(next_question, progress=progress)
                 else:
                     # Tüm gerekli bilgiler toplandı, öneri ver
                     return self._generate_recommendations(category, preferences, specs, language)
@@ -252,92 +254,27 @@ class Agent:
             print(f"   Available categories: {list(self.categories.keys())}")
             return {'error': 'Invalid category or step'}
 
-    def _analyze_current_preferences(self, answers, specs):
-        """FindFlow kullanıcı tercihlerini analiz etme"""
+    def _analyze_current_preferences(self, answers, specs, category=None):
+        """FindFlow kullanıcı tercihlerini analiz etme - tek geçişte, önbellekli normalizasyon ile"""
         preferences = {}
         
         print(f"🔍 _analyze_current_preferences:")
         print(f"  📊 answers_count={len(answers)}")
         print(f"  📋 specs_count={len(specs)}")
         print(f"  📝 answers={answers}")
-        # Fix the budge t_band issue by ensuring proper formatting of spec IDs
-        print(f"  🏷️ spec_ids=[{', '.join([spec['id'].strip() for spec in specs])}]")
         
-        # answered_specs - sadece cevaplanan spec'leri işle
         for i, answer in enumerate(answers):
+            # answered_specs - sadece cevaplanan spec'leri işle
             if i < len(specs) and answer is not None:
                 spec = specs[i]
-                spec_id = spec['id']
-                
-                print(f"  📋 Processing spec {i}: {spec_id} = '{answer}' (type: {spec['type']})")
-                
-                if spec['type'] == 'boolean':
-                    normalized_answer = answer.lower().strip()
-                    if normalized_answer in ['yes', 'evet', 'true', 'evet önemli', 'önemli']:
-                        preferences[spec_id] = True
-                        print(f"    ✅ Boolean value: True")
-                    elif normalized_answer in ['no', 'hayır', 'false', 'önemli değil', 'değil']:
-                        preferences[spec_id] = False
-                        print(f"    ✅ Boolean value: False")
-                    elif normalized_answer in ['no preference', 'fark etmez', 'bilmiyorum', 'farketmez', 'i don\'t know', 'unknown']:
-                        preferences[spec_id] = None  # No preference
-                        print(f"    ✅ Boolean value: No preference (None)")
-                    else:
-                        print(f"    ❌ Invalid boolean answer: '{normalized_answer}' - treating as no preference")
-                        preferences[spec_id] = None
-                elif spec['type'] == 'single_choice':
-                    # Seçilen option'ın ID'sini bul
-                    option_found = False
-                    for opt in spec['options']:
-                        if opt['label']['en'] == answer or opt['label']['tr'] == answer:
-                            preferences[spec_id] = opt['id']
-                            option_found = True
-                            print(f"    ✅ Mapped to option_id: {opt['id']}")
-                            break
-                    
-                    # Eğer eşleşme bulunamadıysa, "Bilmiyorum" veya "Fark etmez" benzeri cevapları kontrol et
-                    if not option_found:
-                        normalized_answer = answer.lower().strip()
-                        if normalized_answer in ['bilmiyorum', 'i don\'t know', 'unknown', 'dont know']:
-                            # "unknown" veya "no_preference" option_id'si varsa kullan
-                            for opt in spec['options']:
-                                if opt['id'] in ['unknown', 'no_preference']:
-                                    preferences[spec_id] = opt['id']
-                                    option_found = True
-                                    print(f"    ✅ Mapped 'Bilmiyorum' to option_id: {opt['id']}")
-                                    break
-                            # Eğer hiçbir option bulunmadıysa, null olarak set et (cevaplandı ama bilmiyor)
-                            if not option_found:
-                                preferences[spec_id] = None
-                                option_found = True
-                                print(f"    ✅ Mapped 'Bilmiyorum' to null (answered but unknown)")
-                        elif normalized_answer in ['fark etmez', 'farketmez', 'no preference', 'doesnt matter']:
-                            # "no_preference" option_id'si varsa kullan
-                            for opt in spec['options']:
-                                if opt['id'] == 'no_preference':
-                                    preferences[spec_id] = opt['id']
-                                    option_found = True
-                                    print(f"    ✅ Mapped 'Fark etmez' to option_id: {opt['id']}")
-                                    break
-                            # Eğer no_preference option'ı yoksa, null olarak set et
-                            if not option_found:
-                                preferences[spec_id] = None
-                                option_found = True
-                                print(f"    ✅ Mapped 'Fark etmez' to null (answered but no preference)")
-                    
-                    if not option_found:
-                        print(f"    ❌ No option found for answer: '{answer}'")
-                elif spec['type'] == 'number':
-                    try:
-                        preferences[spec_id] = int(answer)
-                        print(f"    ✅ Converted to number: {int(answer)}")
-                    except ValueError:
-                        preferences[spec_id] = None
-                        print(f"    ❌ Could not convert to number: '{answer}'")
-        
-        # Özel bütçe kontrolü - Para birimi sembolü içeren yanıtları bütçe olarak tanı
-        for i, answer in enumerate(answers):
-            if answer and ('$' in answer or '₺' in answer):
+                found, value = self.answer_normalizer.normalize(category, spec, answer)
+                if found:
+                    preferences[spec['id']] = value
+                else:
+                    print(f"    ❌ No option found for {spec['id']}: '{answer}'")
+            
+            # Özel bütçe kontrolü - Para birimi sembolü içeren yanıtları bütçe olarak tanı
+            if answer and is_budget_answer(answer):
                 preferences['budget_band'] = answer
                 print(f"  💰 Special budget detection: '{answer}' added as budget_band")
                 
@@ -348,7 +285,8 @@ class Agent:
                         preferences[spec_id] = None
                         print(f"  ⚠️ Clearing {spec_id} since this was actually a budget answer")
         
-        print(f"  🎯 Final preferences: {json.dumps(preferences, indent=2, ensure_ascii=False)}")
+        print(f"  ⚡ Answer cache: hits={self.answer_normalizer.hits}, misses={self.answer_normalizer.misses}")
+        print(f"  🎯 Final preferences: {dumps_text(preferences, indent=True)}")
         return preferences
 
     def _has_unsatisfied_dependencies(self, spec, preferences):
@@ -570,19 +508,17 @@ class Agent:
         print(f"  ❌ Budget missing, will ask for it")
         
         # Kategori-spesifik bütçe aralıkları
-        budget_ranges = self._get_category_budget_ranges(category, language)
-        
         # Ensure ID is always correctly formatted without spaces
-        return {
+        return self._cached_payload(('budget', category, language), lambda: {
             'id': 'budget_band', # Consistent ID without spaces
             'type': 'single_choice',
             'question': 'What\'s your budget range?' if language == 'en' else 'Bütçe aralığın nedir?',
             'emoji': '💰',
-            'options': budget_ranges,
+            'options': self._get_category_budget_ranges(category, language),
             'reason': 'budget',
             'tooltip': 'This helps me recommend products in your price range' if language == 'en' 
                       else 'Bu, fiyat aralığınıza uygun ürünler önermeme yardımcı olur'
-        }
+        })
 
     def _get_category_budget_ranges(self, category, language):
         """Kategori-spesifik bütçe aralıklarını döndür"""
@@ -642,8 +578,29 @@ class Agent:
         
         return True
 
+    def _cached_payload(self, key, build):
+        """Katalogdan türeyen sabit payload'ı bir kez kurup kodlanmış haliyle önbellekler"""
+        payload = self._question_cache.get(key)
+        if payload is None:
+            payload = PreencodedDict(build())
+            payload.encoded()
+            self._question_cache[key] = payload
+        return payload
+
     def _format_question(self, spec, language, reason=None):
-        """Spec'i soru formatına çevir"""
+        """Spec'i soru formatına çevir - katalog değişene kadar kodlanmış payload önbellekte"""
+        key = (id(spec), language, reason)
+        entry = self._question_cache.get(key)
+        # Kimlik kontrolü: aynı id'yi alan başka bir spec nesnesi eski payload'ı almasın
+        if entry is not None and entry[0] is spec:
+            return entry[1]
+        question_data = PreencodedDict(self._build_question(spec, language, reason))
+        question_data.encoded()
+        self._question_cache[key] = (spec, question_data)
+        return question_data
+
+    def _build_question(self, spec, language, reason=None):
+        """Spec'ten soru payload'ını oluşturur"""
         question_data = {
             'question': spec['label'][language],
             'emoji': spec.get('emoji', ''),
@@ -748,6 +705,10 @@ class Agent:
                     'filtered_count': len(filtered_recommendations)
                 }
                 
+                # Fallback'e düşen upstream'ler veya istek bütçesi yüzünden kısaltılmış arama
+                if search_results.get('degraded'):
+                    response_data['degraded'] = search_results['degraded']
+                
                 print(f"🎯 Response data keys: {list(response_data.keys())}")
                 print(f"📊 Recommendations count in response: {len(response_data['recommendations'])}")
                 print(f"📦 First recommendation preview: {response_data['recommendations'][0] if response_data['recommendations'] else 'None'}")
@@ -756,7 +717,7 @@ class Agent:
             else:
                 print(f"⚠️ Modern search engine başarısız veya boş sonuç, fallback'e geçiliyor")
                 fallback_recommendations = self._get_fallback_recommendations(category, preferences, language)
-                return {
+                response_data = {
                     'type': 'fallback_recommendation',
                     'message': 'Arama sistemi geçici olarak sınırlı, önerilerimizi sunuyoruz',
                     'recommendations': fallback_recommendations,
@@ -764,6 +725,12 @@ class Agent:
                     'preferences': preferences,
                     'confidence_score': self._calculate_confidence_score(preferences, specs)
                 }
+                # Açık devre (unavailable) veya arama hatası nedeni
+                if search_results.get('message'):
+                    response_data['fallback_reason'] = search_results['message']
+                if search_results.get('degraded'):
+                    response_data['degraded'] = search_results['degraded']
+                return response_data
             
         except Exception as e:
             print(f"❌ Modern search engine hatası: {e}")
@@ -780,7 +747,7 @@ class Agent:
             }
     
     def _filter_recommendations_by_budget(self, recommendations, preferences, category):
-        """Önerileri kullanıcının bütçe aralığına göre filtrele"""
+        """Önerileri kullanıcının bütçe aralığına göre toplu olarak filtrele"""
         try:
             budget_min, budget_max = self._extract_budget_range(preferences)
             
@@ -790,47 +757,8 @@ class Agent:
             
             print(f"💰 Budget filtreleme: {budget_min} - {budget_max} TL")
             
-            filtered = []
-            for rec in recommendations:
-                try:
-                    # Fiyat bilgisini çıkar
-                    price_value = None
-                    
-                    if 'price' in rec:
-                        if isinstance(rec['price'], dict):
-                            price_value = rec['price'].get('value')
-                        elif isinstance(rec['price'], (int, float)):
-                            price_value = rec['price']
-                        elif isinstance(rec['price'], str):
-                            # String fiyat parse et
-                            import re
-                            price_match = re.search(r'(\d+(?:\.\d+)?)', rec['price'].replace('.', '').replace(',', ''))
-                            if price_match:
-                                price_value = float(price_match.group(1))
-                    
-                    if price_value is None:
-                        print(f"⚠️ Fiyat bilgisi bulunamadı: {rec.get('title', 'Unknown')}")
-                        continue
-                    
-                    # Budget kontrolü
-                    price_in_range = True
-                    
-                    if budget_min and price_value < budget_min:
-                        price_in_range = False
-                        print(f"❌ {rec.get('title', 'Unknown')}: {price_value} TL < {budget_min} TL (minimum)")
-                    
-                    if budget_max and price_value > budget_max:
-                        price_in_range = False
-                        print(f"❌ {rec.get('title', 'Unknown')}: {price_value} TL > {budget_max} TL (maximum)")
-                    
-                    if price_in_range:
-                        print(f"✅ {rec.get('title', 'Unknown')}: {price_value} TL - Bütçe aralığında")
-                        filtered.append(rec)
-                    
-                except Exception as e:
-                    print(f"⚠️ Fiyat filtreleme hatası {rec.get('title', 'Unknown')}: {e}")
-                    # Hata durumunda ürünü dahil et
-                    filtered.append(rec)
+            # Fiyatlar bir kez çıkarılır, maske tüm listeye tek seferde uygulanır
+            filtered = filter_by_budget(recommendations, budget_min, budget_max)
             
             print(f"💰 Filtreleme tamamlandı: {len(recommendations)} -> {len(filtered)} ürün")
             return filtered
@@ -866,392 +794,26 @@ class Agent:
         """Budget aralığını çıkar - 'k' formatını da destekler"""
         budget_band = preferences.get('budget_band', '')
         
-        if not budget_band:
+        if not budget_band or not isinstance(budget_band, str):
             return None, None
         
-        print(f"🔍 Budget band parsing: '{budget_band}'")
-        
-        # "2-5k₺", "20-40k₺" formatını parse et
-        import re
-        
-        # 'k' formatını kontrol et
-        if 'k' in budget_band.lower():
-            # "20-40k₺" -> [20000, 40000]  
-            k_pattern = r'(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)k'
-            k_match = re.search(k_pattern, budget_band.lower())
-            
-            if k_match:
-                min_val = int(float(k_match.group(1)) * 1000)
-                max_val = int(float(k_match.group(2)) * 1000)
-                print(f"✅ K format parsed: {min_val} - {max_val}")
-                return min_val, max_val
-            
-            # Tek k değeri "40k₺+" formatı
-            single_k = re.search(r'(\d+(?:\.\d+)?)k', budget_band.lower())
-            if single_k:
-                base_value = int(float(single_k.group(1)) * 1000)
-                if '+' in budget_band:
-                    print(f"✅ K+ format parsed: {base_value} - {base_value * 2}")
-                    return base_value, base_value * 2
-                else:
-                    print(f"✅ K max format parsed: None - {base_value}")
-                    return None, base_value
-        
-        # Normal format "500-1000₺" veya "15.000-40.000₺"
-        # Türkçe binlik ayırıcı noktaları da destekle
-        normal_pattern = r'([\d.]+)\s*-\s*([\d.]+)'
-        normal_match = re.search(normal_pattern, budget_band)
-        
-        if normal_match:
-            # Binlik ayırıcı noktaları kaldır (15.000 -> 15000)
-            min_str = normal_match.group(1).replace('.', '') if normal_match.group(1).count('.') > 0 and not normal_match.group(1).endswith('.') else normal_match.group(1)
-            max_str = normal_match.group(2).replace('.', '') if normal_match.group(2).count('.') > 0 and not normal_match.group(2).endswith('.') else normal_match.group(2)
-            
-            min_val = int(float(min_str))
-            max_val = int(float(max_str))
-            print(f"✅ Normal format parsed: {min_val} - {max_val}")
-            return min_val, max_val
-        
-        # Tek değer - binlik ayırıcı noktaları da destekle
-        single_match = re.search(r'([\d.]+)', budget_band)
-        if single_match:
-            # Binlik ayırıcı noktaları kaldır
-            value_str = single_match.group(1).replace('.', '') if single_match.group(1).count('.') > 0 and not single_match.group(1).endswith('.') else single_match.group(1)
-            value = int(float(value_str))
-            if '+' in budget_band:
-                print(f"✅ Single+ format parsed: {value} - {value * 2}")
-                return value, value * 2
-            else:
-                print(f"✅ Single format parsed: None - {value}")
-                return None, value
+        # "2-5k₺", "20-40k₺", "15.000-40.000₺", "50k₺+" - sonuçlar LRU önbellekte
+        budget_min, budget_max = parse_budget_band(budget_band)
         
-        print(f"❌ Budget parsing failed for: '{budget_band}'")
-        return None, None
+        if budget_min is None and budget_max is None:
+            print(f"❌ Budget parsing failed for: '{budget_band}'")
+        else:
+            print(f"✅ Budget band parsed: '{budget_band}' → {budget_min} - {budget_max}")
+        return budget_min, budget_max
     
     def _get_fallback_recommendations(self, category, preferences, language):
-        """Fallback öneriler - doğru çalışan linklerle"""
+        """Fallback öneriler - fallback_products.json kataloğundan bütçe dilimi"""
         
         # Bütçe bilgisini al
         budget_min, budget_max = self._extract_budget_range(preferences)
         
-        if category == 'Drone':
-            return [
-                {
-                    'title': 'DJI Mini 3',
-                    'price': {'value': min(budget_max or 15000, 15000), 'currency': 'TRY', 'display': f'{min(budget_max or 15000, 15000):.0f} ₺'},
-                    'features': ['4K Kamera', '38 Dakika Uçuş', 'Katlanabilir Tasarım', 'GPS'],
-                    'pros': ['Güvenilir marka', 'Uzun uçuş süresi', 'Kompakt taşınabilir'],
-                    'cons': ['Yüksek fiyat', 'Rüzgara hassas'],
-                    'match_score': 90,
-                    'source_site': 'hepsiburada.com',
-                    'product_url': 'https://www.hepsiburada.com/ara?q=dji+mini+3+drone',
-                    'link_status': 'fallback',
-                    'link_message': 'Hepsiburada arama sayfası',
-                    'why_recommended': 'Başlangıç seviyesi için mükemmel drone'
-                },
-                {
-                    'title': 'DJI Air 2S',
-                    'price': {'value': min(budget_max or 25000, 25000), 'currency': 'TRY', 'display': f'{min(budget_max or 25000, 25000):.0f} ₺'},
-                    'features': ['5.4K Video', '31 Dakika Uçuş', 'Engel Algılama', '1 inch Sensör'],
-                    'pros': ['Profesyonel kalite', 'Güçlü özellikler', 'İleri seviye kamera'],
-                    'cons': ['Pahalı', 'Ağır'],
-                    'match_score': 85,
-                    'source_site': 'teknosa.com',
-                    'product_url': 'https://www.teknosa.com/arama?q=dji+air+2s+drone',
-                    'link_status': 'fallback',
-                    'link_message': 'Teknosa arama sayfası',
-                    'why_recommended': 'Profesyonel çekimler için ideal'
-                },
-                {
-                    'title': 'Hubsan H117S Zino',
-                    'price': {'value': min(budget_max or 8000, 8000), 'currency': 'TRY', 'display': f'{min(budget_max or 8000, 8000):.0f} ₺'},
-                    'features': ['4K Kamera', '23 Dakika Uçuş', '1km Menzil', 'GPS Return'],
-                    'pros': ['Uygun fiyat', 'İyi kamera', 'Kolay kullanım'],
-                    'cons': ['Daha kısa uçuş süresi', 'Sınırlı özellikler'],
-                    'match_score': 75,
-                    'source_site': 'trendyol.com',
-                    'product_url': 'https://www.trendyol.com/sr?q=hubsan+zino+drone',
-                    'link_status': 'fallback',
-                    'link_message': 'Trendyol arama sayfası',
-                    'why_recommended': 'Bütçe dostu seçenek'
-                }
-            ]
-        
-        elif category == 'Phone':
-            return [
-                {
-                    'title': 'Samsung Galaxy A54 5G 128GB',
-                    'price': {'value': min(budget_max or 15000, 15000), 'currency': 'TRY', 'display': f'{min(budget_max or 15000, 15000):.0f} ₺'},
-                    'features': ['5G Destekli', '128GB Depolama', '50MP Kamera', '5000mAh Pil'],
-                    'pros': ['Güvenilir marka', 'Uzun pil ömrü', 'İyi kamera'],
-                    'cons': ['Orta segment işlemci'],
-                    'match_score': 80,
-                    'source_site': 'hepsiburada.com',
-                    'product_url': 'https://www.hepsiburada.com/ara?q=samsung+galaxy+a54+5g',
-                    'link_status': 'fallback',
-                    'link_message': 'Hepsiburada arama sayfası',
-                    'why_recommended': 'Güvenilir orta segment telefon'
-                },
-                {
-                    'title': 'Xiaomi Redmi Note 12 256GB',
-                    'price': {'value': min(budget_max or 10000, 10000), 'currency': 'TRY', 'display': f'{min(budget_max or 10000, 10000):.0f} ₺'},
-                    'features': ['256GB Depolama', '48MP Kamera', '5000mAh Pil', 'Hızlı Şarj'],
-                    'pros': ['Büyük depolama', 'Uygun fiyat', 'Hızlı şarj'],
-                    'cons': ['MIUI arayüzü'],
-                    'match_score': 75,
-                    'source_site': 'trendyol.com',
-                    'product_url': 'https://www.trendyol.com/sr?q=xiaomi+redmi+note+12+256gb',
-                    'link_status': 'fallback',
-                    'link_message': 'Trendyol arama sayfası',
-                    'why_recommended': 'Fiyat/performans odaklı seçim'
-                },
-                {
-                    'title': 'iPhone 13 128GB (Yenilenmiş)',
-                    'price': {'value': min(budget_max or 20000, 20000), 'currency': 'TRY', 'display': f'{min(budget_max or 20000, 20000):.0f} ₺'},
-                    'features': ['A15 Bionic Chip', '128GB Depolama', 'Dual Kamera', 'Face ID'],
-                    'pros': ['iOS ekosistemi', 'Premium yapı', 'Uzun destek'],
-                    'cons': ['Yenilenmiş ürün', 'Yüksek fiyat'],
-                    'match_score': 85,
-                    'source_site': 'teknosa.com',
-                    'product_url': 'https://www.teknosa.com/arama?q=iphone+13+128gb',
-                    'link_status': 'fallback',
-                    'link_message': 'Teknosa arama sayfası',
-                    'why_recommended': 'Apple kullanıcıları için uygun seçenek'
-                }
-            ]
-        
-        elif category == 'Headphones':
-            return [
-                {
-                    'title': 'Sony WH-1000XM5',
-                    'price': {'value': min(budget_max or 12000, 12000), 'currency': 'TRY', 'display': f'{min(budget_max or 12000, 12000):.0f} ₺'},
-                    'features': ['Üst Seviye ANC', '30 Saat Pil', 'Kablosuz', 'Premium Ses'],
-                    'pros': ['Mükemmel ses kalitesi', 'Güçlü gürültü engelleme', 'Konforlu'],
-                    'cons': ['Pahalı', 'Büyük boyut'],
-                    'match_score': 90,
-                    'source_site': 'hepsiburada.com',
-                    'product_url': 'https://www.hepsiburada.com/ara?q=sony+wh-1000xm5',
-                    'link_status': 'fallback',
-                    'link_message': 'Hepsiburada arama sayfası',
-                    'why_recommended': 'Premium ses deneyimi için ideal'
-                },
-                {
-                    'title': 'Apple AirPods Pro 2',
-                    'price': {'value': min(budget_max or 8000, 8000), 'currency': 'TRY', 'display': f'{min(budget_max or 8000, 8000):.0f} ₺'},
-                    'features': ['Uzamsal Ses', 'ANC', 'İOS Entegrasyonu', 'Kablosuz Şarj'],
-                    'pros': ['Apple ekosistemi', 'Kompakt tasarım', 'İyi ANC'],
-                    'cons': ['İOS odaklı', 'Pahalı'],
-                    'match_score': 85,
-                    'source_site': 'teknosa.com',
-                    'product_url': 'https://www.teknosa.com/arama?q=apple+airpods+pro+2',
-                    'link_status': 'fallback',
-                    'link_message': 'Teknosa arama sayfası',
-                    'why_recommended': 'Apple kullanıcıları için mükemmel'
-                },
-                {
-                    'title': 'JBL Tune 770NC',
-                    'price': {'value': min(budget_max or 3000, 3000), 'currency': 'TRY', 'display': f'{min(budget_max or 3000, 3000):.0f} ₺'},
-                    'features': ['ANC', 'Bluetooth', '70 Saat Pil', 'Hızlı Şarj'],
-                    'pros': ['Uygun fiyat', 'Uzun pil ömrü', 'İyi ses'],
-                    'cons': ['Orta seviye build quality'],
-                    'match_score': 75,
-                    'source_site': 'trendyol.com',
-                    'product_url': 'https://www.trendyol.com/sr?q=jbl+tune+770nc',
-                    'link_status': 'fallback',
-                    'link_message': 'Trendyol arama sayfası',
-                    'why_recommended': 'Bütçe dostu ANC kulaklık'
-                }
-            ]
-
-        elif category == 'Klima':
-            return [
-                {
-                    'title': 'Daikin FTXM35R Comfora',
-                    'price': {'value': min(budget_max or 25000, 25000), 'currency': 'TRY', 'display': f'{min(budget_max or 25000, 25000):.0f} ₺'},
-                    'features': ['Inverter', 'A++ Enerji', '12.000 BTU', 'R32 Gaz'],
-                    'pros': ['Güvenilir marka', 'Sessiz çalışma', 'Enerji tasarrufu'],
-                    'cons': ['Yüksek fiyat', 'Kurulum gerekli'],
-                    'match_score': 90,
-                    'source_site': 'hepsiburada.com',
-                    'product_url': 'https://www.hepsiburada.com/ara?q=daikin+comfora+klima',
-                    'link_status': 'fallback',
-                    'link_message': 'Hepsiburada arama sayfası',
-                    'why_recommended': 'Premium kalite ve enerji tasarrufu'
-                },
-                {
-                    'title': 'Mitsubishi MSZ-HR25VF',
-                    'price': {'value': min(budget_max or 20000, 20000), 'currency': 'TRY', 'display': f'{min(budget_max or 20000, 20000):.0f} ₺'},
-                    'features': ['Inverter', 'Wi-Fi', '9.000 BTU', 'Plasma Quad Plus'],
-                    'pros': ['Japon teknolojisi', 'Akıllı özellikler', 'Güçlü soğutma'],
-                    'cons': ['Pahalı servis', 'Karmaşık kumanda'],
-                    'match_score': 85,
-                    'source_site': 'teknosa.com',
-                    'product_url': 'https://www.teknosa.com/arama?q=mitsubishi+klima',
-                    'link_status': 'fallback',
-                    'link_message': 'Teknosa arama sayfası',
-                    'why_recommended': 'Teknoloji ve kalite odaklı'
-                },
-                {
-                    'title': 'Arçelik Inverter 12570 EI',
-                    'price': {'value': min(budget_max or 15000, 15000), 'currency': 'TRY', 'display': f'{min(budget_max or 15000, 15000):.0f} ₺'},
-                    'features': ['Inverter', 'A+ Enerji', '12.000 BTU', '10 Yıl Garanti'],
-                    'pros': ['Türk markası', 'Uygun fiyat', 'Yaygın servis'],
-                    'cons': ['Daha az özellik', 'Ses seviyesi'],
-                    'match_score': 75,
-                    'source_site': 'trendyol.com',
-                    'product_url': 'https://www.trendyol.com/sr?q=arcelik+inverter+klima',
-                    'link_status': 'fallback',
-                    'link_message': 'Trendyol arama sayfası',
-                    'why_recommended': 'Yerli üretim güvenilir seçenek'
-                }
-            ]
-
-        elif category == 'Television':
-            return [
-                {
-                    'title': 'Samsung 55" QN90C Neo QLED',
-                    'price': {'value': min(budget_max or 40000, 40000), 'currency': 'TRY', 'display': f'{min(budget_max or 40000, 40000):.0f} ₺'},
-                    'features': ['4K', 'Neo QLED', 'Quantum Matrix', 'Tizen OS'],
-                    'pros': ['Mükemmel görüntü', 'Akıllı özellikler', 'Premium tasarım'],
-                    'cons': ['Pahalı', 'Karmaşık menüler'],
-                    'match_score': 90,
-                    'source_site': 'hepsiburada.com',
-                    'product_url': 'https://www.hepsiburada.com/ara?q=samsung+55+qn90c+neo+qled',
-                    'link_status': 'fallback',
-                    'link_message': 'Hepsiburada arama sayfası',
-                    'why_recommended': 'Premium görüntü kalitesi'
-                },
-                {
-                    'title': 'LG 55" C3 OLED evo',
-                    'price': {'value': min(budget_max or 35000, 35000), 'currency': 'TRY', 'display': f'{min(budget_max or 35000, 35000):.0f} ₺'},
-                    'features': ['4K OLED', 'WebOS', 'Dolby Vision', '120Hz'],
-                    'pros': ['OLED teknolojisi', 'Sinema kalitesi', 'Gaming desteği'],
-                    'cons': ['Burn-in riski', 'Parlak ortamlarda sorun'],
-                    'match_score': 85,
-                    'source_site': 'teknosa.com',
-                    'product_url': 'https://www.teknosa.com/arama?q=lg+55+c3+oled',
-                    'link_status': 'fallback',
-                    'link_message': 'Teknosa arama sayfası',
-                    'why_recommended': 'Sinema ve oyun deneyimi'
-                },
-                {
-                    'title': 'Xiaomi TV A2 43"',
-                    'price': {'value': min(budget_max or 8000, 8000), 'currency': 'TRY', 'display': f'{min(budget_max or 8000, 8000):.0f} ₺'},
-                    'features': ['4K HDR', 'Android TV', 'Dolby Audio', 'Chromecast'],
-                    'pros': ['Uygun fiyat', 'Android TV', 'İyi özellikler'],
-                    'cons': ['Orta seviye panel', 'Ses kalitesi'],
-                    'match_score': 75,
-                    'source_site': 'trendyol.com',
-                    'product_url': 'https://www.trendyol.com/sr?q=xiaomi+tv+a2+43',
-                    'link_status': 'fallback',
-                    'link_message': 'Trendyol arama sayfası',
-                    'why_recommended': 'Bütçe dostu akıllı TV'
-                }
-            ]
-
-        elif category == 'Tire':
-            return [
-                {
-                    'title': 'Michelin Pilot Sport 4 225/45 R17',
-                    'price': {'value': min(budget_max or 2500, 2500), 'currency': 'TRY', 'display': f'{min(budget_max or 2500, 2500):.0f} ₺'},
-                    'features': ['Spor Lastik', 'Yüksek Performans', 'Islak Yol Tutuşu', 'Uzun Ömür'],
-                    'pros': ['Mükemmel tutuş', 'Premium marka', 'Güvenli'],
-                    'cons': ['Pahalı', 'Gürültü seviyesi'],
-                    'match_score': 90,
-                    'source_site': 'hepsiburada.com',
-                    'product_url': 'https://www.hepsiburada.com/ara?q=michelin+pilot+sport+4',
-                    'link_status': 'fallback',
-                    'link_message': 'Hepsiburada arama sayfası',
-                    'why_recommended': 'Premium performans lastiği'
-                },
-                {
-                    'title': 'Bridgestone Turanza T005 205/55 R16',
-                    'price': {'value': min(budget_max or 1800, 1800), 'currency': 'TRY', 'display': f'{min(budget_max or 1800, 1800):.0f} ₺'},
-                    'features': ['Konfor Odaklı', 'Düşük Gürültü', 'Enerji Tasarrufu', 'Uzun Ömür'],
-                    'pros': ['Konforlu sürüş', 'Güvenilir marka', 'Dayanıklı'],
-                    'cons': ['Spor performans sınırlı'],
-                    'match_score': 85,
-                    'source_site': 'teknosa.com',
-                    'product_url': 'https://www.teknosa.com/arama?q=bridgestone+turanza+t005',
-                    'link_status': 'fallback',
-                    'link_message': 'Teknosa arama sayfası',
-                    'why_recommended': 'Konfor ve güvenlik odaklı'
-                },
-                {
-                    'title': 'Lassa Competus H/P 215/60 R17',
-                    'price': {'value': min(budget_max or 1200, 1200), 'currency': 'TRY', 'display': f'{min(budget_max or 1200, 1200):.0f} ₺'},
-                    'features': ['SUV Lastiği', 'Türk Malı', 'Uygun Fiyat', 'Dört Mevsim'],
-                    'pros': ['Uygun fiyat', 'Yerli üretim', 'SUV uyumlu'],
-                    'cons': ['Performans sınırlı', 'Gürültü'],
-                    'match_score': 75,
-                    'source_site': 'trendyol.com',
-                    'product_url': 'https://www.trendyol.com/sr?q=lassa+competus+suv+lastik',
-                    'link_status': 'fallback',
-                    'link_message': 'Trendyol arama sayfası',
-                    'why_recommended': 'Bütçe dostu yerli seçenek'
-                }
-            ]
-
-        elif category == 'Telefon':
-            return [
-                {
-                    'title': 'iPhone 15 128GB',
-                    'price': {'value': min(budget_max or 35000, 35000), 'currency': 'TRY', 'display': f'{min(budget_max or 35000, 35000):.0f} ₺'},
-                    'features': ['A17 Pro Chip', '48MP Kamera', 'iOS 17', 'USB-C'],
-                    'pros': ['Premium performans', 'Uzun destek', 'Mükemmel kamera'],
-                    'cons': ['Pahalı', 'Lightning yerine USB-C'],
-                    'match_score': 90,
-                    'source_site': 'hepsiburada.com',
-                    'product_url': 'https://www.hepsiburada.com/ara?q=iphone+15+128gb',
-                    'link_status': 'fallback',
-                    'link_message': 'Hepsiburada arama sayfası',
-                    'why_recommended': 'Premium iPhone deneyimi'
-                },
-                {
-                    'title': 'Samsung Galaxy S23 256GB',
-                    'price': {'value': min(budget_max or 25000, 25000), 'currency': 'TRY', 'display': f'{min(budget_max or 25000, 25000):.0f} ₺'},
-                    'features': ['Snapdragon 8 Gen 2', '50MP Kamera', 'Android 14', '8GB RAM'],
-                    'pros': ['Güçlü performans', 'İyi kamera', 'Samsung ekosistemi'],
-                    'cons': ['OneUI arayüzü', 'Pil ömrü'],
-                    'match_score': 85,
-                    'source_site': 'teknosa.com',
-                    'product_url': 'https://www.teknosa.com/arama?q=samsung+galaxy+s23+256gb',
-                    'link_status': 'fallback',
-                    'link_message': 'Teknosa arama sayfası',
-                    'why_recommended': 'Android flagship deneyimi'
-                },
-                {
-                    'title': 'Xiaomi Redmi Note 13 Pro 256GB',
-                    'price': {'value': min(budget_max or 12000, 12000), 'currency': 'TRY', 'display': f'{min(budget_max or 12000, 12000):.0f} ₺'},
-                    'features': ['Dimensity 7200', '200MP Kamera', 'AMOLED Ekran', '67W Şarj'],
-                    'pros': ['Fiyat/performans', 'Hızlı şarj', 'İyi ekran'],
-                    'cons': ['MIUI arayüzü', 'Plastik gövde'],
-                    'match_score': 80,
-                    'source_site': 'trendyol.com',
-                    'product_url': 'https://www.trendyol.com/sr?q=xiaomi+redmi+note+13+pro',
-                    'link_status': 'fallback',
-                    'link_message': 'Trendyol arama sayfası',
-                    'why_recommended': 'En iyi fiyat/performans'
-                }
-            ]
-
-        # Diğer kategoriler için genel fallback
-        else:
-            return [
-                {
-                    'title': f'Önerilen {category}',
-                    'price': {'value': budget_min or 1000, 'currency': 'TRY', 'display': f'{budget_min or 1000:.0f} ₺'},
-                    'features': ['Kaliteli', 'Güvenilir'],
-                    'pros': ['İyi performans'],
-                    'cons': ['Sınırlı bilgi'],
-                    'match_score': 75,
-                    'source_site': 'hepsiburada.com',
-                    'product_url': f'https://www.hepsiburada.com/ara?q={category.lower()}',
-                    'link_status': 'fallback',
-                'link_message': 'Hepsiburada arama sayfası',
-                'why_recommended': 'Genel öneri - detaylı arama yapılamadı'
-            }
-        ]
+        # Katalog kategori + fiyat indeksli; bütçe aralığı bisect ile bulunan bir dilim
+        return get_fallback_catalog().lookup(category, budget_min, budget_max)
     
     # Amazon entegrasyonu kaldırıldı - modern search sistemi kullanılacak
 
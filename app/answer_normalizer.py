@@ -0,0 +1,202 @@
+"""
+FindFlow Cevap Normalizasyon Modülü
+===================================
+
+Bu modül, soru-cevap akışında gelen ham kullanıcı cevaplarını spec değerlerine
+(True/False/None, option id, sayı) dönüştüren normalizasyon katmanını içerir.
+
+Her /ask isteği o ana kadarki tüm cevapları yeniden gönderdiği için aynı
+cevaplar defalarca ayrıştırılır. Bu katman eş anlamlı tablolarını modül
+yüklenirken bir kez derler ve her (kategori, spec id, ham cevap) üçlüsünün
+sonucunu sınırlı bir LRU önbellekte saklar.
+
+Ana Sınıflar:
+- AnswerNormalizer: Önbellekli cevap normalizasyonu
+
+Sabitler:
+- BOOLEAN_SYNONYMS: Dil bazlı evet/hayır/fark etmez eş anlamlıları
+- UNKNOWN_ANSWERS: "Bilmiyorum" benzeri cevaplar
+- NO_PREFERENCE_ANSWERS: "Fark etmez" benzeri cevaplar
+
+Kullanım:
+    from app.answer_normalizer import AnswerNormalizer
+
+    normalizer = AnswerNormalizer()
+    found, value = normalizer.normalize('Phone', spec, 'Evet')
+"""
+
+import threading
+from collections import OrderedDict
+
+from .telemetry import record_cache
+
+# Dil bazlı boolean eş anlamlıları (küçük harf, boşluksuz uçlar)
+BOOLEAN_SYNONYMS = {
+    'tr': {
+        True: ('evet', 'evet önemli', 'önemli'),
+        False: ('hayır', 'önemli değil', 'değil'),
+        None: ('fark etmez', 'bilmiyorum', 'farketmez'),
+    },
+    'en': {
+        True: ('yes', 'true'),
+        False: ('no', 'false'),
+        None: ('no preference', "i don't know", 'unknown'),
+    },
+}
+
+# single_choice için "bilmiyorum" benzeri cevaplar
+UNKNOWN_ANSWERS = {
+    'tr': ('bilmiyorum',),
+    'en': ("i don't know", 'unknown', 'dont know'),
+}
+
+# single_choice için "fark etmez" benzeri cevaplar
+NO_PREFERENCE_ANSWERS = {
+    'tr': ('fark etmez', 'farketmez'),
+    'en': ('no preference', 'doesnt matter'),
+}
+
+# Bütçe cevaplarını tanıyan para birimi sembolleri
+BUDGET_SYMBOLS = ('$', '₺')
+
+# Cevabın hiçbir spec değerine eşlenmediğini belirten işaret
+MISSING = object()
+_NOT_CACHED = object()
+
+
+def _compile_table(synonyms):
+    """Dil bazlı eş anlamlı tablolarını tek bir arama sözlüğüne derler."""
+    table = {}
+    for language_table in synonyms.values():
+        for value, words in language_table.items():
+            for word in words:
+                table.setdefault(word, value)
+    return table
+
+
+def _compile_set(synonyms):
+    """Dil bazlı kelime listelerini tek bir frozenset'e derler."""
+    return frozenset(word for words in synonyms.values() for word in words)
+
+
+_BOOLEAN_TABLE = _compile_table(BOOLEAN_SYNONYMS)
+_UNKNOWN_SET = _compile_set(UNKNOWN_ANSWERS)
+_NO_PREFERENCE_SET = _compile_set(NO_PREFERENCE_ANSWERS)
+
+
+def is_budget_answer(answer):
+    """Cevap para birimi sembolü içeriyorsa bütçe cevabıdır."""
+    return isinstance(answer, str) and any(symbol in answer for symbol in BUDGET_SYMBOLS)
+
+
+class AnswerNormalizer:
+    """
+    Ham kullanıcı cevaplarını spec değerlerine dönüştüren önbellekli katman.
+
+    Sonuçlar (kategori, spec id, ham cevap) anahtarıyla sınırlı bir LRU
+    önbellekte tutulur. Kategori dosyası değiştiğinde clear() çağrılmalıdır.
+
+    Özellikler:
+    - maxsize: Önbellekteki maksimum cevap sayısı
+    - hits / misses: Önbellek istatistikleri
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._option_index = {}
+        self._lock = threading.Lock()
+
+    def clear(self):
+        """Cevap ve option önbelleklerini temizler."""
+        with self._lock:
+            self._cache.clear()
+            self._option_index.clear()
+
+    def normalize(self, category, spec, answer):
+        """
+        Tek bir cevabı spec tipine göre normalize eder.
+
+        Args:
+            category (str): Kategori adı (önbellek anahtarı için)
+            spec (dict): Cevaplanan spec
+            answer: Ham kullanıcı cevabı
+
+        Returns:
+            tuple: (found, value) - found False ise cevap hiçbir değere eşlenmedi
+        """
+        if not isinstance(answer, str):
+            return self._finish(self._normalize_uncached(category, spec, answer))
+
+        key = (category, spec['id'], answer)
+        with self._lock:
+            value = self._cache.get(key, _NOT_CACHED)
+            hit = value is not _NOT_CACHED
+            if hit:
+                self._cache.move_to_end(key)
+                self.hits += 1
+        record_cache('answer_normalizer', hit)
+        if hit:
+            return self._finish(value)
+
+        value = self._normalize_uncached(category, spec, answer)
+
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = value
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return self._finish(value)
+
+    def _finish(self, value):
+        if value is MISSING:
+            return False, None
+        return True, value
+
+    def _normalize_uncached(self, category, spec, answer):
+        spec_type = spec['type']
+
+        if spec_type == 'boolean':
+            # Tanınmayan boolean cevaplar "tercih yok" sayılır
+            return _BOOLEAN_TABLE.get(answer.lower().strip())
+
+        if spec_type == 'single_choice':
+            labels, unknown_id, no_preference_id = self._get_option_index(category, spec)
+            if answer in labels:
+                return labels[answer]
+
+            normalized_answer = answer.lower().strip()
+            if normalized_answer in _UNKNOWN_SET:
+                return unknown_id
+            if normalized_answer in _NO_PREFERENCE_SET:
+                return no_preference_id
+            return MISSING
+
+        if spec_type == 'number':
+            try:
+                return int(answer)
+            except (TypeError, ValueError):
+                return None
+
+        return MISSING
+
+    def _get_option_index(self, category, spec):
+        """Spec'in option etiketlerini id'lere eşleyen indeksi döndürür."""
+        key = (category, spec['id'])
+        index = self._option_index.get(key)
+        if index is None:
+            labels = {}
+            unknown_id = None
+            no_preference_id = None
+            for opt in spec.get('options', []):
+                for label in (opt['label']['en'], opt['label']['tr']):
+                    labels.setdefault(label, opt['id'])
+                if unknown_id is None and opt['id'] in ('unknown', 'no_preference'):
+                    unknown_id = opt['id']
+                if no_preference_id is None and opt['id'] == 'no_preference':
+                    no_preference_id = opt['id']
+            index = (labels, unknown_id, no_preference_id)
+            self._option_index[key] = index
+        return index
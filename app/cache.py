@@ -0,0 +1,548 @@
+"""
+FindFlow Katmanlı Önbellek
+==========================
+
+Bu modül, CategoryGenerator, ModernSearchEngine ve Agent'ın paylaştığı iki
+katmanlı önbelleği içerir:
+
+- L1: Süreç içi, TTL'li, sınırlı LRU (her worker'da ayrı)
+- L2: İsteğe bağlı, Redis protokolü (RESP) konuşan paylaşımlı sunucu.
+  Tüm worker ve node'lar aynı L2'yi kullandığı için isabet oranı süreç
+  trafiğiyle değil küme trafiğiyle ölçeklenir. İstemci bağımlılık
+  gerektirmez; RESP2 doğrudan konuşulur
+
+Değerler iki katmanda da JSON bytes olarak (json_codec) saklanır. Her
+okuma yeni bir nesne döndürür; istekler birbirinin sonuçlarını değiştiremez
+ve paylaşılan depodan güvenilmeyen pickle yüklenmez.
+
+Stampede koruması (get_or_set):
+- Süreç içinde istek birleştirme (app.coalescing): aynı anahtarı aynı anda
+  yalnızca bir thread hesaplar, diğerleri onun sonucunu istek bütçesi
+  kadar bekler; süre dolarsa kendileri hesaplamaz, CoalescedCallTimeout alır
+- L2'de SET NX PX kilidi: kümede aynı anda yalnızca bir worker hesaplar;
+  diğerleri değer gelene veya kilit bırakılana kadar kısa aralıklarla bakar.
+  Kilit rastgele bir token taşır ve yalnızca sahibi siler; hesaplama
+  LOCK_TTL_MS'i aşarsa, o sırada kilidi almış başka bir worker'ın kilidi
+  silinmez
+- TTL'ler %10'a kadar rastgele kısaltılır; aynı anda yazılan anahtarlar
+  aynı anda düşmez
+
+L2 erişilemezse istekler bozulmaz: hata sayılır, L2 L2_RETRY_SECONDS
+boyunca atlanır ve yalnızca L1 kullanılır.
+
+Yapılandırma:
+- CACHE_REDIS_URL=redis://[:parola@]host:6379/0 → L2'yi açar
+- CACHE_BACKEND=fake → süreç içinde sahte Redis sunucusu başlatılır (test)
+- CACHE_TTLS="search_results=600,category_detection=86400" (saniye)
+- CACHE_L1_MAX_ENTRIES=2048
+- CACHE_REDIS_TIMEOUT=0.25 (bağlantı/okuma zaman aşımı, saniye)
+
+Ad alanları ve varsayılan TTL'ler:
+- category_detection: 86400 (AI tanıma/oluşturma sonuçları)
+- search_results: 1800 (search_products sonuçları)
+
+Ana Sınıflar:
+- LocalCache: L1 katmanı
+- RedisClient: Minimal RESP2 istemcisi (bağlantı havuzlu)
+- TieredCache: L1 + L2, serileştirme, TTL ve stampede koruması
+
+Fonksiyonlar:
+- get_cache(): Ad alanı için paylaşımlı önbellek
+
+Kullanım:
+    cache = get_cache('search_results')
+    result = cache.get_or_set(key, lambda: self._search_uncached(prefs),
+                              cache_if=lambda r: r['status'] == 'success')
+"""
+
+import hashlib
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from urllib.parse import unquote, urlparse
+
+from .coalescing import InflightRegistry
+from .deadline import remaining_budget
+from .json_codec import dumps, loads
+from .telemetry import REGISTRY, record_cache
+
+DEFAULT_TTLS = {
+    'category_detection': 86400,
+    'search_results': 1800,
+}
+DEFAULT_TTL = 600
+
+# Ad alanı başına L1 kapasitesi (arama sonuçları büyük olduğu için daha az)
+DEFAULT_L1_ENTRIES = {'search_results': 256}
+DEFAULT_L1_MAX_ENTRIES = 2048
+
+# L2 açıkken L1 en fazla bu kadar tutulur; L2'deki güncellemeler worker'lara yayılır
+L1_TTL_WITH_L2 = 60
+
+TTL_JITTER = 0.1
+LOCK_TTL_MS = 30000
+LOCK_WAIT_SECONDS = 10.0
+LOCK_POLL_SECONDS = 0.05
+L2_RETRY_SECONDS = 30.0
+KEY_PREFIX = 'findflow'
+
+L2_REQUESTS = REGISTRY.counter(
+    'findflow_cache_l2_requests_total', 'Shared (L2) cache lookups by namespace and result', ('namespace', 'result'))
+STAMPEDE_WAITS = REGISTRY.counter(
+    'findflow_cache_stampede_waits_total', 'get_or_set calls that waited for another worker\'s computation', ('namespace',))
+
+
+class LocalCache:
+    """Süreç içi, girdi başına TTL'li LRU önbellek (değerler bytes)."""
+
+    def __init__(self, max_entries=DEFAULT_L1_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisError(Exception):
+    """L2 sunucusuna erişilemedi veya sunucu hata döndürdü."""
+
+
+class RedisClient:
+    """
+    Redis protokolü (RESP2) konuşan minimal, thread-safe istemci.
+
+    Yalnızca önbelleğin kullandığı komutlar sarılmıştır (GET, MGET, SET,
+    DEL, PING; GET + DEL ile koşullu silme); diğerleri execute() ile gönderilebilir. Bağlantılar bir
+    havuzda tutulur; hata alan bağlantı kapatılır.
+    """
+
+    def __init__(self, host='127.0.0.1', port=6379, db=0, password=None, timeout=0.25, max_idle=8):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        """redis://[:parola@]host:port/db adresinden istemci oluşturur."""
+        parsed = urlparse(url)
+        db = parsed.path.lstrip('/')
+        return cls(
+            host=parsed.hostname or '127.0.0.1',
+            port=parsed.port or 6379,
+            db=int(db) if db else 0,
+            password=unquote(parsed.password) if parsed.password else None,
+            **kwargs
+        )
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn = (sock, sock.makefile('rb'))
+        if self.password:
+            self._call(conn, ('AUTH', self.password))
+        if self.db:
+            self._call(conn, ('SELECT', self.db))
+        return conn
+
+    @staticmethod
+    def _encode(args):
+        parts = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode('utf-8')
+            parts.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+        return b''.join(parts)
+
+    @classmethod
+    def _read(cls, reader):
+        line = reader.readline()
+        if not line.endswith(b'\r\n'):
+            raise RedisError('connection closed')
+        kind, payload = line[:1], line[1:-2]
+        if kind == b'+':
+            return payload.decode('utf-8')
+        if kind == b'-':
+            raise RedisError(payload.decode('utf-8', 'replace'))
+        if kind == b':':
+            return int(payload)
+        if kind == b'$':
+            length = int(payload)
+            if length < 0:
+                return None
+            data = reader.read(length + 2)
+            if len(data) != length + 2:
+                raise RedisError('connection closed')
+            return data[:-2]
+        if kind == b'*':
+            count = int(payload)
+            return None if count < 0 else [cls._read(reader) for _ in range(count)]
+        raise RedisError(f'unexpected reply: {line!r}')
+
+    def _call(self, conn, args):
+        sock, reader = conn
+        sock.sendall(self._encode(args))
+        return self._read(reader)
+
+    def execute(self, *args):
+        """Komutu gönderir ve yanıtı döndürür; bağlantı/protokol hatasında RedisError."""
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        try:
+            if conn is None:
+                conn = self._connect()
+            reply = self._call(conn, args)
+        except RedisError as e:
+            # Sunucu hata yanıtı bağlantıyı bozmaz; okunamayan yanıt bozar
+            if conn is not None and str(e) != 'connection closed':
+                self._release(conn)
+            elif conn is not None:
+                self._close(conn)
+            raise
+        except OSError as e:
+            if conn is not None:
+                self._close(conn)
+            raise RedisError(str(e)) from e
+        self._release(conn)
+        return reply
+
+    def _release(self, conn):
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        self._close(conn)
+
+    @staticmethod
+    def _close(conn):
+        for resource in reversed(conn):
+            try:
+                resource.close()
+            except OSError:
+                pass
+
+    def ping(self):
+        return self.execute('PING') == 'PONG'
+
+    def get(self, key):
+        return self.execute('GET', key)
+
+    def mget(self, keys):
+        return self.execute('MGET', *keys) if keys else []
+
+    def set(self, key, value, px=None, nx=False):
+        """SET; nx=True iken anahtar zaten varsa False döner."""
+        args = ['SET', key, value]
+        if px:
+            args += ['PX', int(px)]
+        if nx:
+            args.append('NX')
+        return self.execute(*args) == 'OK'
+
+    def delete(self, *keys):
+        return self.execute('DEL', *keys)
+
+    def delete_if_equal(self, key, value):
+        """
+        Anahtarı yalnızca değeri `value` ise siler (GET + DEL).
+
+        İki komut atomik değildir: GET ile DEL arasında anahtarın süresi dolup
+        başka bir sahip tarafından alınma penceresi kalır (milisaniyeler).
+        Kilit TTL'i hesaplama süresinden uzun tutulduğu sürece bu pencere
+        pratikte kapanır.
+
+        Returns:
+            bool: Silindiyse True
+        """
+        current = self.execute('GET', key)
+        expected = value.encode('utf-8') if isinstance(value, str) else value
+        if current != expected:
+            return False
+        return bool(self.execute('DEL', key))
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._close(conn)
+
+
+def configured_ttls():
+    """Varsayılan TTL'ler + CACHE_TTLS ortam değişkeni (ad=saniye,...)."""
+    ttls = dict(DEFAULT_TTLS)
+    for item in os.getenv('CACHE_TTLS', '').split(','):
+        name, _, value = item.partition('=')
+        if name.strip() and value.strip():
+            ttls[name.strip()] = int(value)
+    return ttls
+
+
+class TieredCache:
+    """
+    L1 (süreç içi) + isteğe bağlı L2 (Redis) önbellek, tek bir ad alanı için.
+
+    Anahtarlar str veya str'ye çevrilebilir öğelerden oluşan tuple olabilir;
+    uzun anahtarlar hash'lenir. Değerler JSON'a kodlanabilir olmalıdır.
+    """
+
+    def __init__(self, namespace, l1=None, l2=None, ttl=DEFAULT_TTL):
+        """
+        Args:
+            namespace (str): Ad alanı (anahtar öneki ve metrik etiketi)
+            l1 (LocalCache): Süreç içi katman
+            l2 (RedisClient): Paylaşımlı katman (None: yalnızca L1)
+            ttl (int): Varsayılan TTL (saniye)
+        """
+        self.namespace = namespace
+        self.l1 = l1 or LocalCache()
+        self.l2 = l2
+        self.ttl = ttl
+        self._l2_down_until = 0.0
+        self._inflight = InflightRegistry(namespace)
+
+    def _key(self, key):
+        if isinstance(key, tuple):
+            key = '|'.join('' if part is None else str(part) for part in key)
+        if len(key) > 200:
+            key = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+        return f'{KEY_PREFIX}:{self.namespace}:{key}'
+
+    def _l2_available(self):
+        return self.l2 is not None and time.monotonic() >= self._l2_down_until
+
+    def _l2_call(self, method, *args, **kwargs):
+        """L2 çağrısı; hata olursa L2'yi bir süre devre dışı bırakır ve None döner."""
+        try:
+            return getattr(self.l2, method)(*args, **kwargs)
+        except RedisError as e:
+            if time.monotonic() >= self._l2_down_until:
+                print(f"⚠️ Paylaşımlı önbellek (L2) erişilemiyor [{self.namespace}]: {e} - "
+                      f"{L2_RETRY_SECONDS:.0f} sn yalnızca L1")
+            self._l2_down_until = time.monotonic() + L2_RETRY_SECONDS
+            L2_REQUESTS.inc(namespace=self.namespace, result='error')
+            return None
+
+    def _l1_ttl(self, ttl):
+        return min(ttl, L1_TTL_WITH_L2) if self.l2 is not None else ttl
+
+    def _get_raw(self, full_key):
+        raw = self.l1.get(full_key)
+        if raw is not None or not self._l2_available():
+            return raw
+        raw = self._l2_call('get', full_key)
+        if raw is not None:
+            self.l1.set(full_key, raw, self._l1_ttl(self.ttl))
+        if self.l2 is not None:
+            L2_REQUESTS.inc(namespace=self.namespace, result='hit' if raw is not None else 'miss')
+        return raw
+
+    def get(self, key, default=None):
+        """Değeri (yeni bir nesne olarak) döndürür; yoksa default."""
+        raw = self._get_raw(self._key(key))
+        record_cache(self.namespace, raw is not None)
+        return default if raw is None else loads(raw)
+
+    def get_many(self, keys):
+        """
+        Birden çok anahtarı okur; L1'de olmayanlar tek bir MGET ile L2'den alınır.
+
+        Returns:
+            dict: Bulunan anahtar → değer
+        """
+        found = {}
+        missing = []
+        for key in keys:
+            full_key = self._key(key)
+            raw = self.l1.get(full_key)
+            if raw is None:
+                missing.append((key, full_key))
+            else:
+                found[key] = raw
+        if missing and self._l2_available():
+            values = self._l2_call('mget', [full_key for _, full_key in missing]) or []
+            for (key, full_key), raw in zip(missing, values):
+                L2_REQUESTS.inc(namespace=self.namespace, result='hit' if raw is not None else 'miss')
+                if raw is not None:
+                    self.l1.set(full_key, raw, self._l1_ttl(self.ttl))
+                    found[key] = raw
+        for key in keys:
+            record_cache(self.namespace, key in found)
+        return {key: loads(raw) for key, raw in found.items()}
+
+    def set(self, key, value, ttl=None):
+        """Değeri iki katmana yazar (TTL'e %10'a kadar jitter uygulanır)."""
+        ttl = ttl or self.ttl
+        ttl = ttl * random.uniform(1 - TTL_JITTER, 1.0)
+        try:
+            raw = dumps(value)
+        except TypeError as e:
+            print(f"⚠️ Önbelleğe yazılamadı [{self.namespace}]: {e}")
+            return
+        full_key = self._key(key)
+        self.l1.set(full_key, raw, self._l1_ttl(ttl))
+        if self._l2_available():
+            self._l2_call('set', full_key, raw, px=int(ttl * 1000))
+
+    def delete(self, key):
+        full_key = self._key(key)
+        self.l1.delete(full_key)
+        if self._l2_available():
+            self._l2_call('delete', full_key)
+
+    def clear_local(self):
+        """Yalnızca bu sürecin L1 katmanını temizler."""
+        self.l1.clear()
+
+    def _wait_for_peer(self, full_key, lock_key):
+        """Başka bir worker hesaplarken değer yazılana veya kilit bırakılana kadar bekler."""
+        STAMPEDE_WAITS.inc(namespace=self.namespace)
+        deadline = time.monotonic() + remaining_budget(LOCK_WAIT_SECONDS)
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_SECONDS)
+            reply = self._l2_call('mget', [full_key, lock_key])
+            if reply is None:
+                return None
+            raw, lock = reply
+            if raw is not None:
+                self.l1.set(full_key, raw, self._l1_ttl(self.ttl))
+                return raw
+            if lock is None:
+                return None
+        return None
+
+    def get_or_set(self, key, compute, ttl=None, cache_if=None):
+        """
+        Değeri önbellekten döndürür; yoksa compute() ile hesaplayıp yazar.
+
+        Aynı anahtar için eşzamanlı çağrılarda compute() süreç içinde bir kez
+        çalışır ve bekleyenler aynı sonucu alır (InflightRegistry; sonuç
+        yazılmaya uygun olmasa bile). L2 açıksa kümede (kilit süresi içinde)
+        bir kez çalışır.
+
+        Args:
+            key: Anahtar
+            compute (Callable): Değeri üreten fonksiyon
+            ttl (int): TTL (saniye, varsayılan ad alanı TTL'i)
+            cache_if (Callable): Değer alıp yazılıp yazılmayacağını döndüren fonksiyon
+
+        Returns:
+            Değer (önbellekten geldiyse yeni bir nesne)
+
+        Raises:
+            CoalescedCallTimeout: Bekleyen çağıran istek bütçesi içinde sonucu alamadı
+        """
+        full_key = self._key(key)
+        raw = self._get_raw(full_key)
+        record_cache(self.namespace, raw is not None)
+        if raw is not None:
+            return loads(raw)
+
+        # Takipçi en fazla istek bütçesi kadar bekler (app.deadline); süre dolarsa
+        # upstream çağrısını tekrarlamak yerine CoalescedCallTimeout fırlatır
+        return self._inflight.run(full_key, lambda: self._compute_and_set(key, full_key, compute, ttl, cache_if),
+                                  timeout=remaining_budget(None))
+
+    def _compute_and_set(self, key, full_key, compute, ttl, cache_if):
+        """get_or_set'in lider tarafı: L2 kilidini alır, hesaplar ve yazar."""
+        # Bu çağrıdan hemen önce biten bir lider değeri yazmış olabilir
+        raw = self.l1.get(full_key)
+        if raw is not None:
+            return loads(raw)
+
+        lock_key = f'{full_key}:lock'
+        token = None
+        if self._l2_available():
+            token = uuid.uuid4().hex
+            if self._l2_call('set', lock_key, token, px=LOCK_TTL_MS, nx=True) is False:
+                token = None
+                raw = self._wait_for_peer(full_key, lock_key)
+                if raw is not None:
+                    return loads(raw)
+
+        try:
+            value = compute()
+            if cache_if is None or cache_if(value):
+                self.set(key, value, ttl)
+            return value
+        finally:
+            if token is not None:
+                # Kilit süresi dolup başka worker'a geçtiyse onun kilidine dokunulmaz
+                self._l2_call('delete_if_equal', lock_key, token)
+
+_caches = {}
+_l2_client = None
+_caches_lock = threading.Lock()
+
+
+def _shared_l2():
+    """CACHE_REDIS_URL / CACHE_BACKEND'e göre paylaşımlı L2 istemcisi (yoksa None)."""
+    global _l2_client
+    if _l2_client is None:
+        url = os.getenv('CACHE_REDIS_URL')
+        if os.getenv('CACHE_BACKEND') == 'fake':
+            from .fake_upstreams import get_fake_redis_url
+            url = get_fake_redis_url()
+        if url:
+            _l2_client = RedisClient.from_url(url, timeout=float(os.getenv('CACHE_REDIS_TIMEOUT', '0.25')))
+            print(f"🗄️ Paylaşımlı önbellek (L2): {url.split('@')[-1]}")
+    return _l2_client
+
+
+def get_cache(namespace):
+    """
+    Ad alanı için paylaşımlı TieredCache'i döndürür.
+
+    Args:
+        namespace (str): Ad alanı (örn. 'search_results')
+
+    Returns:
+        TieredCache: Aynı süreçteki tüm çağıranların paylaştığı önbellek
+    """
+    with _caches_lock:
+        cache = _caches.get(namespace)
+        if cache is None:
+            max_entries = int(os.getenv('CACHE_L1_MAX_ENTRIES', DEFAULT_L1_ENTRIES.get(namespace, DEFAULT_L1_MAX_ENTRIES)))
+            cache = TieredCache(
+                namespace,
+                l1=LocalCache(max_entries),
+                l2=_shared_l2(),
+                ttl=configured_ttls().get(namespace, DEFAULT_TTL)
+            )
+            _caches[namespace] = cache
+        return cache
@@ -15,7 +15,7 @@ Fonksiyonlar:
 - add_dynamic_category_route: Flask uygulamasına dinamik kategori rotaları ekler
 
 Özellikler:
-- Akıllı kategori tespiti (exact, partial, AI recognition)
+- Akıllı kategori tespiti (exact, local fuzzy, AI recognition)
 - Yeni kategori oluşturma
 - Prompt-chained AI mimarisi
 - Confidence scoring
@@ -31,6 +31,42 @@ Gereksinimler:
 import json
 import os
 from .config import setup_gemini, get_gemini_model, generate_with_retry
+from .telemetry import traced
+from .gemini_usage import CONTEXT_SLOT, fit_prompt
+from .category_index import get_category_index, get_category_matcher
+from .json_codec import dump_file, load_file
+from .cache import get_cache
+from .coalescing import CoalescedCallTimeout
+from .rate_limiter import BACKGROUND, upstream_priority
+
+# Spec üretim prompt'undaki kategori örneklerinin bağlam seviyeleri (büyükten küçüğe)
+EXAMPLE_LEVELS = ('indented', 'compact', 'single', 'single_no_tooltips')
+
+# Recognition prompt'una girecek aday kategori sayısı (katalog boyutundan bağımsız)
+RECOGNITION_TOP_K = 8
+
+# structured: kategori + güven tek JSON çağrısında; two_step: isim ve güven ayrı çağrılarda
+# (CATEGORY_RECOGNITION_MODE ile değiştirilebilir)
+RECOGNITION_MODE = 'structured'
+RECOGNITION_MIN_CONFIDENCE = 0.6
+STRUCTURED_GENERATION_CONFIG = {'response_mime_type': 'application/json', 'temperature': 0.0}
+
+# Toplu tespitte Gemini çağrısı başına sorgu sayısı (CATEGORY_BATCH_SIZE)
+DEFAULT_BATCH_SIZE = 25
+MAX_BATCH_QUERIES = 5000
+# create_missing ile istek başına en fazla kategori oluşturma denemesi (CATEGORY_BATCH_MAX_CREATIONS);
+# her deneme ayrı Gemini çağrıları ve categories.json yazımı demektir
+DEFAULT_MAX_BATCH_CREATIONS = 20
+
+# Paylaşımlı önbelleğe yalnızca AI sonuçları yazılır (exact/local eşleşmeler zaten ucuz;
+# hatalar ve başarısız oluşturmalar yazılmaz; eşzamanlı bekleyenler lider sonucunu olduğu gibi alır).
+# Kategori verisi yazılmaz, okurken eklenir.
+CACHEABLE_MATCH_TYPES = ('ai_recognition', 'ai_created')
+CACHED_DETECTION_FIELDS = ('match_type', 'category', 'original', 'original_query', 'confidence', 'message')
+
+class RecognitionUnavailable(Exception):
+    """Gemini tanıma yanıtı alınamadı (açık devre, dolan istek bütçesi veya upstream hatası)."""
+
 
 class CategoryGenerator:
     """
@@ -42,7 +78,7 @@ class CategoryGenerator:
     Özellikler:
     - model: Gemini AI modeli
     - categories_file: Kategori dosyası yolu
-    - category_cache: Kategori önbelleği
+    - detection_cache: AI tespit sonuçları için paylaşımlı önbellek (app.cache)
     
     Ana Metodlar:
     - intelligent_category_detection(): Ana kategori tespit metodu
@@ -61,12 +97,12 @@ class CategoryGenerator:
         CategoryGenerator'ı başlatır ve AI modelini yapılandırır.
         
         Gemini API'yi yapılandırır, kategori dosyası yolunu belirler
-        ve kategori önbelleğini başlatır.
+        ve paylaşımlı tespit önbelleğini bağlar.
         """
         self.model = None
         self.setup_ai()
         self.categories_file = 'categories.json'
-        self.category_cache = {}
+        self.detection_cache = get_cache('category_detection')
         
     def setup_ai(self):
         """
@@ -94,7 +130,7 @@ class CategoryGenerator:
             
         Returns:
             dict: Tespit sonucu
-                - match_type: Eşleşme türü (exact, partial, ai_recognition, ai_created)
+                - match_type: Eşleşme türü (exact, local, partial, ai_recognition, ai_created)
                 - category: Kategori adı
                 - confidence: Güven skoru (0.0-1.0)
                 - data: Kategori verileri
@@ -108,41 +144,92 @@ class CategoryGenerator:
         query = query.strip().lower()
         print(f"🔍 Starting intelligent category detection for: '{query}'")
         
-        # 🛡️ Check cache first to prevent duplicate API calls
-        if query in self.category_cache:
-            print(f"⚡ Cache hit for query: '{query}' → '{self.category_cache[query]}'")
-            return self.category_cache[query]
-        
         # Load existing categories
         categories = self._load_categories()
         
         # Step 1: Direct exact match
         exact_match = self._check_exact_match(query, categories)
         if exact_match:
-            # 🛡️ Cache the result
-            self.category_cache[query] = exact_match
             return exact_match
             
-        # Step 2: DISABLED - Partial matching causes too many false positives
-        # Skip partial matching to avoid "headphones" -> "Phone" issues
-        # partial_match = self._check_partial_match(query, categories)
-        # if partial_match:
-        #     # 🛡️ Cache the result
-        #     self.category_cache[query] = partial_match
-        #     return partial_match
+        # Step 2: Local fuzzy match (synonyms, suffixes, typos) with calibrated confidence
+        # Substring partial matching stays disabled ("headphones" -> "Phone");
+        # below the threshold the query goes to AI recognition
+        local_match = self._check_local_match(query, categories)
+        if local_match:
+            return local_match
+        
+        # 🛡️ Steps 3-4 go through the shared cache: AI results are reused across
+        # requests/workers and concurrent detections of the same query run once
+        computed = {}
+        
+        def detect():
+            computed['result'] = self._ai_detection(query, categories)
+            return self._detection_summary(computed['result'])
+        
+        try:
+            summary = self.detection_cache.get_or_set(
+                query, detect, cache_if=lambda summary: summary.get('match_type') in CACHEABLE_MATCH_TYPES)
+        except CoalescedCallTimeout:
+            # Aynı sorgunun tespiti başka bir istekte sürüyor ve bütçe doldu
+            print(f"⏳ Category detection still in flight for: '{query}'")
+            return {"match_type": "error", "message": "Category detection timed out"}
+        if 'result' in computed:
+            return computed['result']
+        
+        if summary.get('match_type') not in CACHEABLE_MATCH_TYPES:
+            # Leader's no_match/error result: re-running would repeat AI
+            # recognition (and possibly category creation) for every follower
+            return dict(summary)
+        
+        cached = self._rehydrate_detection(summary)
+        if cached:
+            print(f"⚡ Cache hit for query: '{query}' → '{cached['category']}'")
+            return cached
+        
+        # Cached category no longer exists in this node's categories.json
+        self.detection_cache.delete(query)
+        return self._ai_detection(query, self._load_categories())
+    
+    def _ai_detection(self, query, categories):
+        """
+        AI tanıma (mevcut kategoriler), eşleşme yoksa AI ile kategori oluşturma.
+        
+        Args:
+            query (str): Normalize edilmiş sorgu
+            categories (dict): Mevcut kategoriler
             
+        Returns:
+            dict: Tespit sonucu
+        """
         # Step 3: AI-powered category recognition (existing categories)
         ai_recognition = self._ai_category_recognition(query, categories)
         if ai_recognition['match_type'] != 'no_match':
-            # 🛡️ Cache the result
-            self.category_cache[query] = ai_recognition
+            # 'error' (Gemini yanıt vermedi) da burada döner; oluşturma denenmez
             return ai_recognition
             
         # Step 4: AI-powered category creation (new categories)
-        ai_creation = self._ai_category_creation(query)
-        # 🛡️ Cache the result
-        self.category_cache[query] = ai_creation
-        return ai_creation
+        return self._ai_category_creation(query)
+    
+    @staticmethod
+    def _detection_summary(result):
+        """Önbelleğe yazılan alanlar (kategori verisi hariç; okurken güncel dosyadan eklenir)."""
+        return {key: result[key] for key in CACHED_DETECTION_FIELDS if key in result}
+    
+    def _rehydrate_detection(self, summary, categories=None):
+        """
+        Önbellekteki özet sonucu güncel kategori verisiyle tamamlar.
+        
+        Returns:
+            dict: Tespit sonucu; kategori artık yoksa None
+        """
+        if summary.get('match_type') not in CACHEABLE_MATCH_TYPES:
+            return None
+        categories = self._load_categories() if categories is None else categories
+        data = categories.get(summary.get('category'))
+        if data is None:
+            return None
+        return dict(summary, data=data)
     
     def _check_exact_match(self, query, categories):
         """
@@ -165,6 +252,30 @@ class CategoryGenerator:
             }
         return None
     
+    def _check_local_match(self, query, categories):
+        """
+        Yerel eşleştirici ile (AI çağrısı olmadan) kategori tespit eder.
+        
+        Args:
+            query (str): Kullanıcı sorgusu
+            categories (dict): Mevcut kategoriler
+            
+        Returns:
+            dict or None: Güven eşiği aşılırsa sonuç, yoksa None
+        """
+        match = get_category_matcher().match(query)
+        if not match or match['category'] not in categories:
+            return None
+        print(f"⚡ Local match found: '{query}' → '{match['category']}' "
+              f"({match['method']}, confidence {match['confidence']})")
+        return {
+            "match_type": "local",
+            "category": match['category'],
+            "original_query": query,
+            "confidence": match['confidence'],
+            "data": categories[match['category']]
+        }
+    
     def _check_partial_match(self, query, categories):
         """
         Mevcut kategorilerde kısmi eşleşme kontrol eder.
@@ -217,7 +328,12 @@ class CategoryGenerator:
         AI ile mevcut kategorilerde akıllı eşleştirme yapar.
         
         Gemini AI kullanarak kullanıcı sorgusunu mevcut kategorilerle
-        semantik olarak eşleştirir.
+        semantik olarak eşleştirir. Varsayılan (structured) modda kategori ve
+        güven skoru tek JSON çağrısında alınır; yanıt ayrıştırılamazsa veya
+        bilinen kategorilerden biri değilse iki adımlı yola (isim +
+        _validate_recognition_confidence) düşülür. Gemini hiç yanıt
+        vermezse ikinci bir retry turu yapılmaz: 'error' döner ve
+        _ai_detection kategori oluşturmaya geçmez.
         
         Args:
             query (str): Kullanıcı sorgusu
@@ -232,17 +348,59 @@ class CategoryGenerator:
         try:
             print(f"🤖 AI category recognition for: '{query}'")
             
-            # Create detailed category context
-            category_context = self._build_category_context(categories)
+            # Katalog yerine yalnızca sorguya en yakın K aday prompt'a girer
+            candidate_names = get_category_index().candidates(query, RECOGNITION_TOP_K)
+            candidates = {name: categories[name] for name in candidate_names if name in categories}
+            print(f"🎯 Recognition candidates ({len(candidates)}/{len(categories)}): {list(candidates)}")
+            
+            recognized = None
+            if os.getenv('CATEGORY_RECOGNITION_MODE', RECOGNITION_MODE) == 'structured':
+                recognized = self._structured_recognition(query, candidates, categories)
+                if recognized is None:
+                    print("↩️ Structured recognition unparseable, falling back to two-step recognition")
+            if recognized is None:
+                recognized = self._two_step_recognition(query, candidates, categories)
+            
+            suggested_category, confidence = recognized
+            if suggested_category:
+                if confidence >= RECOGNITION_MIN_CONFIDENCE:
+                    return {
+                        "match_type": "ai_recognition",
+                        "category": suggested_category,
+                        "original_query": query,
+                        "confidence": confidence,
+                        "data": categories[suggested_category]
+                    }
+                else:
+                    print(f"⚠️ Low confidence score: {confidence}, proceeding to creation")
+            
+        except RecognitionUnavailable as e:
+            print(f"❌ AI recognition unavailable: {e}")
+            return {"match_type": "error", "category": None, "original": query,
+                    "message": "AI recognition unavailable"}
+        except Exception as e:
+            print(f"❌ AI recognition error: {e}")
             
-            # Recognition prompt
-            recognition_prompt = f"""
+        return {"match_type": "no_match", "category": None, "original": query}
+    
+    def _recognition_prompt(self, query, candidates, response_format, call_site):
+        """
+        Recognition prompt'unu oluşturur; kategori bağlamı bütçeye göre
+        (3 spec → 1 spec → sadece isim) doldurulur.
+        
+        Args:
+            query (str): Kullanıcı sorgusu
+            candidates (dict): Prompt'a girecek aday kategoriler
+            response_format (str): Prompt sonuna eklenen yanıt formatı talimatı
+            call_site (str): Bütçe için çağrı noktası adı
+        """
+        recognition_template = f"""
             You are an intelligent category recognition agent. Your task is to map user queries to existing product categories.
             
             USER QUERY: "{query}"
             
             EXISTING CATEGORIES WITH DETAILS:
-            {category_context}
+            {CONTEXT_SLOT}
             
             RECOGNITION RULES:
             1. Look for semantic similarity between the query and existing categories
@@ -253,39 +411,296 @@ class CategoryGenerator:
                - "apple telefon" should map to "phone" or "telefon"
                - "ac" should map to "klima" (air conditioner)
                - "şarj aleti" should map to relevant charging category
+            {response_format}
+            """
+        return fit_prompt(
+            call_site,
+            lambda specs: recognition_template.replace(CONTEXT_SLOT, self._build_category_context(candidates, specs)),
+            [3, 1, 0]
+        )
+    
+    def _structured_recognition(self, query, candidates, categories):
+        """
+        Kategori ve güven skorunu tek Gemini çağrısında JSON olarak alır.
+        
+        Returns:
+            tuple or None: (kategori veya None, güven); yanıt ayrıştırılamazsa None
+            
+        Raises:
+            RecognitionUnavailable: Gemini yanıt vermedi
+        """
+        prompt = self._recognition_prompt(query, candidates, """
+            RESPONSE FORMAT:
+            Respond with ONLY a JSON object:
+            {"category": "<exact category name from the list or NO_MATCH>", "confidence": <0.0-1.0>}
+            The confidence is how accurately the category matches the query
+            (semantic similarity, language appropriateness, logical connection).
+            
+            RECOGNITION JSON:
+            """, 'category_recognition_structured')
+        
+        response = generate_with_retry(self.model, prompt, max_retries=2, delay=2,
+                                       call_site='category_recognition_structured',
+                                       generation_config=STRUCTURED_GENERATION_CONFIG)
+        if not response:
+            raise RecognitionUnavailable('category_recognition_structured: no response')
+        try:
+            category, confidence = self._parse_recognition_json(response.text, categories)
+        except ValueError as e:
+            print(f"⚠️ Invalid structured recognition response: {e}")
+            return None
+        
+        print(f"🤖 AI recognition result: '{query}' → '{category or 'NO_MATCH'}' (confidence {confidence})")
+        return category, confidence
+    
+    def _parse_recognition_json(self, text, categories):
+        """
+        Structured recognition yanıtını ayrıştırır ve bilinen kategorilere göre doğrular.
+        
+        Args:
+            text (str): Model yanıtı
+            categories (dict): Mevcut kategoriler
+            
+        Returns:
+            tuple: (kategori adı veya NO_MATCH için None, güven 0.0-1.0)
             
+        Raises:
+            ValueError: JSON bulunamazsa, alanlar eksikse veya kategori bilinmiyorsa
+        """
+        start, end = text.find('{'), text.rfind('}')
+        if start == -1 or end <= start:
+            raise ValueError("no JSON object")
+        return self._validate_recognition(json.loads(text[start:end + 1]), categories)
+    
+    def _validate_recognition(self, payload, categories):
+        """
+        Tek bir {"category", "confidence"} nesnesini bilinen kategorilere göre doğrular.
+        
+        Returns:
+            tuple: (kategori adı veya NO_MATCH için None, güven 0.0-1.0)
+            
+        Raises:
+            ValueError: Alanlar eksikse veya kategori bilinmiyorsa
+        """
+        if not isinstance(payload, dict) or 'category' not in payload:
+            raise ValueError("missing 'category'")
+        
+        name = str(payload['category']).strip()
+        if name.upper() == 'NO_MATCH' or not name:
+            return None, 0.0
+        if name not in categories:
+            # Büyük/küçük harf farkını tolere et, uydurma isimleri reddet
+            lookup = {existing.lower(): existing for existing in categories}
+            if name.lower() not in lookup:
+                raise ValueError(f"unknown category '{name}'")
+            name = lookup[name.lower()]
+        
+        try:
+            confidence = float(payload.get('confidence'))
+        except (TypeError, ValueError):
+            raise ValueError("missing or invalid 'confidence'")
+        return name, min(max(confidence, 0.0), 1.0)
+    
+    def _two_step_recognition(self, query, candidates, categories):
+        """
+        İki adımlı tanıma: önce kategori adı, sonra ayrı çağrıyla güven skoru.
+        
+        Returns:
+            tuple: (kategori veya None, güven)
+            
+        Raises:
+            RecognitionUnavailable: Gemini yanıt vermedi
+        """
+        recognition_prompt = self._recognition_prompt(query, candidates, """
             RESPONSE FORMAT:
             If you find a match, respond with ONLY the exact category name from the list.
             If no match exists, respond with "NO_MATCH".
             
             CATEGORY NAME OR NO_MATCH:
-            """
-            
-            response = generate_with_retry(self.model, recognition_prompt, max_retries=2, delay=2)
-            suggested_category = response.text.strip()
-            
-            print(f"🤖 AI recognition result: '{query}' → '{suggested_category}'")
+            """, 'category_recognition')
+        
+        response = generate_with_retry(self.model, recognition_prompt, max_retries=2, delay=2,
+                                       call_site='category_recognition')
+        if not response:
+            raise RecognitionUnavailable('category_recognition: no response')
+        suggested_category = response.text.strip()
+        
+        print(f"🤖 AI recognition result: '{query}' → '{suggested_category}'")
+        
+        # Validate the suggestion
+        if suggested_category != "NO_MATCH" and suggested_category in categories:
+            # Confidence validation
+            return suggested_category, self._validate_recognition_confidence(query, suggested_category)
+        return None, 0.0
+    
+    def batch_category_detection(self, queries, batch_size=None, create_missing=False):
+        """
+        Çok sayıda sorguyu toplu olarak kategorilere eşler.
+        
+        Exact ve yerel (bulanık) eşleşmeler süreç içinde, daha önce tanınmış
+        sorgular paylaşımlı önbellekten tek MGET ile çözülür;
+        kalan sorgular batch_size'lık gruplar halinde tek Gemini çağrısıyla
+        tanınır. Böylece toplu eşlemede çağrı sayısı sorgu başına değil grup
+        başınadır.
+        
+        Args:
+            queries (list): Sorgular (tekrarlar tek kez çözülür)
+            batch_size (int): Gemini çağrısı başına sorgu (varsayılan: CATEGORY_BATCH_SIZE veya 25)
+            create_missing (bool): Tanınamayan sorgular için tek tek yeni kategori oluştur
+                (istek başına en fazla CATEGORY_BATCH_MAX_CREATIONS deneme; kalanlar
+                no_match döner ve 'creation_skipped' olarak sayılır)
             
-            # Validate the suggestion
-            if suggested_category != "NO_MATCH" and suggested_category in categories:
-                # Confidence validation
-                confidence = self._validate_recognition_confidence(query, suggested_category)
-                
-                if confidence >= 0.6:  # Minimum confidence threshold
-                    return {
+        Returns:
+            tuple: (girdi sırasıyla sonuç listesi, istatistikler)
+                Sonuç: match_type, category, confidence (data içermez)
+        """
+        # Toplu eşleme arka plan işidir; Gemini kuyruğunda etkileşimli çağrıların arkasında bekler
+        with upstream_priority(BACKGROUND):
+            return self._batch_category_detection(queries, batch_size, create_missing)
+    
+    def _batch_category_detection(self, queries, batch_size, create_missing):
+        """batch_category_detection gövdesi (BACKGROUND öncelikli bağlamda çalışır)."""
+        batch_size = max(1, batch_size or int(os.getenv('CATEGORY_BATCH_SIZE', DEFAULT_BATCH_SIZE)))
+        normalized = [str(query).strip().lower() for query in queries]
+        unique = list(dict.fromkeys(q for q in normalized if q))
+        stats = {'total': len(normalized), 'unique': len(unique), 'cached': 0, 'exact': 0,
+                 'local': 0, 'ai_batches': 0, 'ai_recognized': 0, 'created': 0, 'creation_skipped': 0,
+                 'unresolved': 0}
+        creation_budget = int(os.getenv('CATEGORY_BATCH_MAX_CREATIONS', DEFAULT_MAX_BATCH_CREATIONS))
+        print(f"📦 Batch category detection: {len(normalized)} queries, {len(unique)} unique")
+        
+        categories = self._load_categories()
+        resolved = {}
+        unmatched = []
+        for query in unique:
+            match = self._check_exact_match(query, categories) or self._check_local_match(query, categories)
+            if match:
+                resolved[query] = match
+                stats[match['match_type']] += 1
+            else:
+                unmatched.append(query)
+        
+        # Previously recognized queries: one MGET against the shared cache
+        pending = []
+        cached = self.detection_cache.get_many(unmatched) if unmatched else {}
+        for query in unmatched:
+            match = self._rehydrate_detection(cached[query], categories) if query in cached else None
+            if match:
+                resolved[query] = match
+                stats['cached'] += 1
+            else:
+                pending.append(query)
+        
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            stats['ai_batches'] += 1
+            for query, (category, confidence) in zip(chunk, self._batch_recognition(chunk, categories)):
+                if category and confidence >= RECOGNITION_MIN_CONFIDENCE:
+                    resolved[query] = {
                         "match_type": "ai_recognition",
-                        "category": suggested_category,
+                        "category": category,
                         "original_query": query,
                         "confidence": confidence,
-                        "data": categories[suggested_category]
+                        "data": categories[category]
                     }
-                else:
-                    print(f"⚠️ Low confidence score: {confidence}, proceeding to creation")
+                    self.detection_cache.set(query, self._detection_summary(resolved[query]))
+                    stats['ai_recognized'] += 1
+        
+        for query in pending:
+            if query in resolved:
+                continue
+            if create_missing and creation_budget > 0:
+                # Oluşturma kategori başına ayrı çağrılar gerektirir
+                creation_budget -= 1
+                resolved[query] = self.intelligent_category_detection(query)
+                if resolved[query].get('match_type') == 'ai_created':
+                    stats['created'] += 1
+                    categories = self._load_categories()
+                    continue
+            else:
+                if create_missing:
+                    stats['creation_skipped'] += 1
+                resolved[query] = {"match_type": "no_match", "category": None, "original": query}
+            stats['unresolved'] += 1
+        
+        results = []
+        for query in normalized:
+            result = resolved.get(query) or {"match_type": "no_match", "category": None}
+            results.append({
+                "query": query,
+                "match_type": result.get('match_type'),
+                "category": result.get('category'),
+                "confidence": result.get('confidence', 1.0 if result.get('category') else 0.0)
+            })
+        print(f"📦 Batch done: {stats}")
+        return results, stats
+    
+    def _batch_recognition(self, queries, categories):
+        """
+        Bir grup sorguyu tek Gemini çağrısıyla mevcut kategorilere eşler.
+        
+        Returns:
+            list: Her sorgu için (kategori veya None, güven); geçersiz/eksik
+                yanıt öğeleri (None, 0.0) olur
+        """
+        empty = [(None, 0.0)] * len(queries)
+        if not self.model:
+            return empty
+        
+        # Adaylar sorguların top-K adaylarının birleşimi (katalog sırasıyla)
+        index = get_category_index()
+        wanted = set()
+        for query in queries:
+            wanted.update(index.candidates(query, RECOGNITION_TOP_K))
+        candidates = {name: categories[name] for name in categories if name in wanted}
+        
+        query_lines = '\n'.join(f'{i}. "{query}"' for i, query in enumerate(queries, 1))
+        template = f"""
+            You are an intelligent category recognition agent. Map EACH user query to one of the existing product categories.
             
-        except Exception as e:
-            print(f"❌ AI recognition error: {e}")
+            USER QUERIES:
+            {query_lines}
             
-        return {"match_type": "no_match", "category": None, "original": query}
+            EXISTING CATEGORIES WITH DETAILS:
+            {CONTEXT_SLOT}
+            
+            RECOGNITION RULES:
+            1. Look for semantic similarity, synonyms, abbreviations and English/Turkish variants
+            2. Use "NO_MATCH" when no existing category fits the query
+            3. The confidence is how accurately the category matches the query (0.0-1.0)
+            
+            RESPONSE FORMAT:
+            Respond with ONLY a JSON array with one object per query, in order:
+            [{{"index": 1, "category": "<exact category name or NO_MATCH>", "confidence": <0.0-1.0>}}, ...]
+            
+            BATCH RECOGNITION JSON:
+            """
+        prompt = fit_prompt(
+            'category_recognition_batch',
+            lambda specs: template.replace(CONTEXT_SLOT, self._build_category_context(candidates, specs)),
+            [1, 0]
+        )
+        
+        try:
+            response = generate_with_retry(self.model, prompt, max_retries=2, delay=2,
+                                           call_site='category_recognition_batch',
+                                           generation_config=STRUCTURED_GENERATION_CONFIG)
+            text = response.text if response else ''
+            start, end = text.find('['), text.rfind(']')
+            items = json.loads(text[start:end + 1]) if start != -1 and end > start else []
+        except Exception as e:
+            print(f"❌ Batch recognition error: {e}")
+            return empty
+        
+        recognized = list(empty)
+        for position, item in enumerate(items if isinstance(items, list) else []):
+            try:
+                index_value = int(item.get('index', position + 1)) - 1
+                if 0 <= index_value < len(queries):
+                    recognized[index_value] = self._validate_recognition(item, categories)
+            except (AttributeError, TypeError, ValueError) as e:
+                print(f"⚠️ Invalid batch recognition item {item!r}: {e}")
+        return recognized
     
     def _validate_recognition_confidence(self, query, suggested_category):
         """
@@ -313,7 +728,8 @@ class CategoryGenerator:
             Respond with ONLY a decimal number between 0.0 and 1.0:
             """
             
-            response = generate_with_retry(self.model, validation_prompt, max_retries=2, delay=1)
+            response = generate_with_retry(self.model, validation_prompt, max_retries=2, delay=1,
+                                           call_site='recognition_confidence')
             confidence = float(response.text.strip())
             return min(max(confidence, 0.0), 1.0)  # Clamp between 0-1
             
@@ -336,6 +752,12 @@ class CategoryGenerator:
         if not self.model:
             return {"match_type": "error", "message": "AI model not available"}
             
+        # Oluşturma çağrıları (isim, fiyat araştırması, specler) etkileşimli çağrıların arkasında kuyruğa girer
+        with upstream_priority(BACKGROUND):
+            return self._create_category(query)
+    
+    def _create_category(self, query):
+        """_ai_category_creation gövdesi (BACKGROUND öncelikli bağlamda çalışır)."""
         try:
             print(f"🆕 AI category creation for: '{query}'")
             
@@ -394,7 +816,8 @@ class CategoryGenerator:
             Respond with ONLY the category name (1-2 words maximum):
             """
             
-            response = generate_with_retry(self.model, naming_prompt, max_retries=2, delay=1)
+            response = generate_with_retry(self.model, naming_prompt, max_retries=2, delay=1,
+                                           call_site='category_naming')
             category_name = response.text.strip().title()
             
             # Sanitize the name
@@ -419,19 +842,19 @@ class CategoryGenerator:
         try:
             # Load existing categories for examples
             categories = self._load_categories()
-            examples = self._get_category_examples(categories)
             
             # Get Turkish market price research
             price_research = self._research_turkish_market_prices(category_name)
             
-            generation_prompt = f"""
+            # Örnekler bütçeye göre (indent'li → kompakt → tek örnek → tooltip'siz) doldurulur
+            generation_template = f"""
             Generate a complete category specification for "{category_name}" following the exact format of existing categories.
             
             TURKISH MARKET PRICE RESEARCH:
             {price_research}
             
             EXISTING CATEGORY EXAMPLES:
-            {examples}
+            {CONTEXT_SLOT}
             
             REQUIREMENTS:
             1. Create "budget_bands" with 5 realistic price ranges based on Turkish market research
@@ -521,8 +944,15 @@ class CategoryGenerator:
             OUTPUT ONLY VALID JSON (no markdown, no explanations):
             """
             
+            generation_prompt = fit_prompt(
+                'category_specs',
+                lambda level: generation_template.replace(CONTEXT_SLOT, self._get_category_examples(categories, level)),
+                list(EXAMPLE_LEVELS)
+            )
+            
             print(f"🤖 Yeni kategori oluşturuluyor: {category_name} (Detaylı specler ve Türkiye pazarı araştırması ile)")
-            response = generate_with_retry(self.model, generation_prompt, max_retries=3, delay=3)
+            response = generate_with_retry(self.model, generation_prompt, max_retries=3, delay=3,
+                                           call_site='category_specs')
             return self._parse_ai_response(response.text, category_name)
             
         except Exception as e:
@@ -571,7 +1001,8 @@ class CategoryGenerator:
             For {category_name}, provide 5 realistic price bands:
             """
             
-            response = generate_with_retry(self.model, research_prompt, max_retries=2, delay=2)
+            response = generate_with_retry(self.model, research_prompt, max_retries=2, delay=2,
+                                           call_site='price_research')
             return response.text.strip()
             
         except Exception as e:
@@ -606,12 +1037,13 @@ class CategoryGenerator:
         else:
             return f"General Turkish market for {category_name}: Budget 500-2k₺, Mid 2-5k₺, Premium 5-15k₺, Luxury 15k₺+"
     
-    def _build_category_context(self, categories):
+    def _build_category_context(self, categories, specs_per_category=3):
         """
         Mevcut kategoriler için detaylı bağlam oluşturur.
         
         Args:
             categories (dict): Mevcut kategoriler
+            specs_per_category (int): Kategori başına eklenecek spec etiketi (0 = sadece isim)
             
         Returns:
             str: Kategori bağlam metni
@@ -622,7 +1054,7 @@ class CategoryGenerator:
             # Extract key characteristics
             specs_summary = []
             if "specs" in cat_data:
-                for spec in cat_data["specs"][:3]:  # First 3 specs
+                for spec in cat_data["specs"][:specs_per_category]:
                     if "label" in spec and "tr" in spec["label"]:
                         specs_summary.append(spec["label"]["tr"])
             
@@ -632,22 +1064,37 @@ class CategoryGenerator:
         
         return '\n'.join(context_parts)
     
-    def _get_category_examples(self, categories):
+    def _get_category_examples(self, categories, level='indented'):
         """
         AI oluşturma için kategori örnekleri alır.
         
         Args:
             categories (dict): Mevcut kategoriler
+            level (str): Bağlam seviyesi (EXAMPLE_LEVELS, büyükten küçüğe)
+                - indented: İlk 2 kategori, indent'li JSON
+                - compact: İlk 2 kategori, kompakt JSON
+                - single: İlk kategori, kompakt JSON
+                - single_no_tooltips: İlk kategori, tooltip ve shopping_filter olmadan
             
         Returns:
             str: Kategori örnekleri JSON formatında
         """
+        count = 2 if level in ('indented', 'compact') else 1
         examples = []
-        for cat_name, cat_data in list(categories.items())[:2]:  # First 2 categories
-            examples.append(f'"{cat_name}": {json.dumps(cat_data, indent=2, ensure_ascii=False)}')
+        for cat_name, cat_data in list(categories.items())[:count]:
+            if level == 'indented':
+                examples.append(f'"{cat_name}": {json.dumps(cat_data, indent=2, ensure_ascii=False)}')
+                continue
+            if level == 'single_no_tooltips':
+                cat_data = {
+                    'budget_bands': cat_data.get('budget_bands', {}),
+                    'specs': [{k: v for k, v in spec.items() if k != 'tooltip'} for spec in cat_data.get('specs', [])]
+                }
+            examples.append(f'"{cat_name}": {json.dumps(cat_data, separators=(",", ":"), ensure_ascii=False)}')
         
         return '\n\n'.join(examples)
     
+    @traced('parse_ai_response')
     def _parse_ai_response(self, text, category_name):
         """
         AI yanıtını kategori verilerine dönüştürür.
@@ -753,8 +1200,7 @@ class CategoryGenerator:
             root_dir = os.path.dirname(current_dir)
             categories_path = os.path.join(root_dir, self.categories_file)
             
-            with open(categories_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_file(categories_path)
         except:
             return {}
     
@@ -777,8 +1223,7 @@ class CategoryGenerator:
             root_dir = os.path.dirname(current_dir)
             categories_path = os.path.join(root_dir, self.categories_file)
             
-            with open(categories_path, 'w', encoding='utf-8') as f:
-                json.dump(categories, f, indent=2, ensure_ascii=False)
+            dump_file(categories, categories_path)
                 
             print(f"✅ Category '{category_name}' saved successfully with detailed specifications")
             return True
@@ -804,8 +1249,10 @@ def add_dynamic_category_route(app):
         >>> from flask import Flask
         >>> app = Flask(__name__)
         >>> add_dynamic_category_route(app)
-        >>> # /search/<query> endpoint'i artık mevcut
+        >>> # /search/<query> ve /detect_category/batch endpoint'leri artık mevcut
     """
+    from flask import request
+    
     category_generator = CategoryGenerator()
     
     @app.route('/search/<query>', methods=['GET'])
@@ -830,7 +1277,7 @@ def add_dynamic_category_route(app):
             result = category_generator.intelligent_category_detection(query)
             
             # Format response based on match type
-            if result['match_type'] in ['exact', 'partial', 'ai_recognition']:
+            if result['match_type'] in ['exact', 'local', 'partial', 'ai_recognition']:
                 return {
                     "status": "found",
                     "match_type": result['match_type'],
@@ -858,3 +1305,46 @@ def add_dynamic_category_route(app):
         except Exception as e:
             print(f"❌ Search error: {e}")
             return {"status": "error", "message": str(e)}, 500
+    
+    @app.route('/detect_category/batch', methods=['POST'])
+    def detect_category_batch():
+        """
+        Toplu kategori tespiti (katalog içe aktarma ve analiz işleri için).
+        
+        POST isteği bekler:
+        {
+            "queries": ["kablosuz kulaklık", "iphone 15", ...],
+            "batch_size": 25,           # opsiyonel, Gemini çağrısı başına sorgu (pozitif tam sayı)
+            "create_missing": false     # opsiyonel, tanınmayanlar için kategori oluştur
+        }                               # (istek başına en fazla CATEGORY_BATCH_MAX_CREATIONS)
+        
+        Döner:
+        {
+            "results": [{"query", "match_type", "category", "confidence"}, ...],  # girdi sırasıyla
+            "stats": {"total", "unique", "cached", "exact", "local", "ai_batches", ...}
+        }
+        """
+        data = request.get_json(silent=True) or {}
+        queries = data.get('queries')
+        if not isinstance(queries, list) or not queries:
+            return {"status": "error", "message": "'queries' must be a non-empty list"}, 400
+        if len(queries) > MAX_BATCH_QUERIES:
+            return {"status": "error", "message": f"At most {MAX_BATCH_QUERIES} queries per request"}, 400
+        batch_size = data.get('batch_size')
+        if batch_size is not None and (isinstance(batch_size, bool) or not isinstance(batch_size, int)
+                                       or batch_size < 1):
+            return {"status": "error", "message": "'batch_size' must be a positive integer"}, 400
+        create_missing = data.get('create_missing', False)
+        if not isinstance(create_missing, bool):
+            return {"status": "error", "message": "'create_missing' must be a boolean"}, 400
+        
+        try:
+            results, stats = category_generator.batch_category_detection(
+                queries,
+                batch_size=batch_size,
+                create_missing=create_missing
+            )
+            return {"status": "ok", "results": results, "stats": stats}
+        except Exception as e:
+            print(f"❌ Batch detection error: {e}")
+            return {"status": "error", "message": str(e)}, 500
@@ -0,0 +1,490 @@
+"""
+FindFlow Kategori İndeksi ve Yerel Eşleştirici
+==============================================
+
+Bu modül, kategori tespitini Gemini'ye gitmeden yerelde yapan eşleştiriciyi
+ve AI kategori tanıma prompt'u için en yakın K kategoriyi seçen karakter
+n-gram indeksini içerir.
+
+Yerel eşleştirme (CategoryMatcher) sırası:
+1. Tam ifade: Sorgu bir kategori adı / eş anlamlısıyla aynı → güven 1.0
+2. İçerilen ifade: Sorgu bir ad / eş anlamlı ifadesini kelime olarak
+   içeriyor ("apple telefon" → telefon) → 0.95, birden fazla kategori
+   eşit uzunlukta eşleşirse belirsiz kabul edilir
+   Kalan kelimeler kategorinin sözlüğünde (ad, eş anlamlı ve seçenek
+   etiketleri), katalogdaki marka/teknoloji adlarında veya genel
+   niteleyicilerde (QUALIFIER_WORDS: "ucuz", "gaming", "pro") yoksa
+   ("mouse pad", "tablet kalemi") → 0.6 (partial)
+3. Seçenek etiketi: Tek bir kategoriye özgü kısa seçenek etiketi
+   ("daikin", "qled") → 0.85
+4. Yazım hatası: Tek düzenleme uzaklığında düzeltilen kelimeyle ifade
+   eşleşmesi ("kulaklk", "mause") → 0.8
+5. Trigram benzerliği: güven = s1 - 0.5·s2 (s1/s2: en iyi iki kategori
+   skoru); ikinci adaya yakınlık güveni düşürür
+
+İfade, seçenek ve yazım hatası eşleşmelerinde sorgu kategorinin
+shopping_filter exclude listesinden (ve DEFAULT_EXCLUDE) bir ifade
+içeriyorsa ("telefon kılıfı", "klima kumandası") güven 0.2'ye (accessory)
+düşer. Partial ve accessory eşleşmeler eşiğin altındadır; AI tanımaya
+bırakılır.
+
+Güven eşiğin (CATEGORY_MATCH_THRESHOLD, varsayılanı
+benchmarks/category_queries.json üzerinde kalibre edilmiş) altındaysa None
+döner ve AI tanıma devreye girer.
+
+Her iki katmanda da metinler Türkçe karakterler katlanarak (ı/i, ş/s, ğ/g,
+ü/u, ö/o, ç/c) normalize edilir ve yaygın çekim ekleri atılır
+("kulaklıklar", "kulaklığı" → "kulaklik").
+
+Recognition prompt'u yalnızca K aday içerir; katalog büyüdükçe büyümez.
+
+İndekslenen alanlar (categories.json):
+- Kategori adı
+- "synonyms" listesi (örn. Headphones → kulaklık, earbuds, airpods)
+- Spec etiketleri (tr/en)
+
+Her alan ayrı bir doküman olarak trigram TF-IDF vektörüne çevrilir; kategori
+skoru, dokümanlarının kosinüs benzerliklerinin (alan ağırlığıyla) en
+yükseğidir.
+
+Ana Sınıflar:
+- CategoryIndex: Trigram indeksi ve top-K aday seçimi
+- CategoryMatcher: İfade tablosu + indeks ile kalibre güvenli yerel eşleştirme
+
+Fonksiyonlar:
+- normalize_text(): Türkçe duyarlı küçük harf + karakter katlama
+- stem(): Yaygın Türkçe çekim eklerini atar
+- get_category_matcher(): categories.json değiştiğinde yeniden kurulan paylaşımlı eşleştirici
+- get_category_index(): Paylaşımlı eşleştiricinin trigram indeksi
+
+Kullanım:
+    match = get_category_matcher().match("sony kablosuz kulaklıklar")
+    # {'category': 'Headphones', 'confidence': 0.95, 'method': 'phrase', ...}
+"""
+
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from .json_codec import load_file
+from .shopping_filter import DEFAULT_EXCLUDE
+
+CATEGORIES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'categories.json')
+
+# Alan ağırlıkları: isim ve eş anlamlılar spec etiketlerinden daha belirleyici
+NAME_WEIGHT = 1.0
+SYNONYM_WEIGHT = 1.0
+SPEC_LABEL_WEIGHT = 0.6
+
+_FOLD = str.maketrans({'ı': 'i', 'ğ': 'g', 'ü': 'u', 'ş': 's', 'ö': 'o', 'ç': 'c', 'â': 'a', 'î': 'i', 'û': 'u'})
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+# Katlanmış (ASCII) biçimde, uzundan kısaya: çoğul, iyelik ve hal ekleri
+_SUFFIXES = tuple(sorted((
+    'lari', 'leri', 'lar', 'ler',
+    'nin', 'nun', 'dan', 'den', 'tan', 'ten',
+    'si', 'su', 'yi', 'yu', 'in', 'un', 'da', 'de', 'ta', 'te', 'ya', 'ye',
+    'i', 'u'
+), key=len, reverse=True))
+_MIN_STEM = 3
+_VOWELS = set('aeiou')
+
+
+def normalize_text(text: str) -> str:
+    """Türkçe duyarlı küçük harfe çevirir ve aksanlı karakterleri katlar."""
+    text = text.replace('I', 'ı').replace('İ', 'i').lower().translate(_FOLD)
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def stem(word: str) -> str:
+    """
+    Katlanmış kelimeden en fazla iki çekim ekini atar.
+
+    Kök en az 3 harf kalmalıdır. Ünlüyle başlayan ek atıldıysa yumuşamış
+    son ünsüz geri çevrilir ("kulaklig" → "kulaklik"). Sorgu ve indeks aynı
+    kuralla köklendiği için aşırı kesme her iki tarafta da tutarlıdır.
+    """
+    for _ in range(2):
+        for suffix in _SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= _MIN_STEM:
+                word = word[:-len(suffix)]
+                if suffix[0] in _VOWELS and word.endswith('g') and word[-2] in _VOWELS:
+                    word = word[:-1] + 'k'
+                break
+        else:
+            break
+    # İngilizce çoğul (headphones, earbuds)
+    if len(word) > 4 and word.endswith('s') and not word.endswith('ss'):
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalize edilmiş metni köklenmiş kelimelere ayırır."""
+    return [stem(word) for word in _WORD_RE.findall(normalize_text(text))]
+
+
+def trigrams(text: str) -> Dict[str, int]:
+    """Kelime sınırları boşlukla işaretlenmiş karakter trigram frekansları."""
+    counts = defaultdict(int)
+    for word in tokenize(text):
+        padded = f' {word} '
+        for i in range(len(padded) - 2):
+            counts[padded[i:i + 3]] += 1
+    return counts
+
+
+class CategoryIndex:
+    """
+    Kategori adları, eş anlamlılar ve spec etiketleri üzerinde trigram
+    TF-IDF indeksi.
+    """
+
+    def __init__(self, documents: List[Tuple[str, float, str]], order: List[str]):
+        """
+        Args:
+            documents: (kategori, alan ağırlığı, metin) üçlüleri
+            order: Katalogdaki kategori sırası (eşit/boş skorlarda kullanılır)
+        """
+        self.order = list(order)
+        self._doc_category = []
+        self._doc_weight = []
+        self._postings = defaultdict(list)
+
+        doc_vectors = []
+        df = defaultdict(int)
+        for category, weight, text in documents:
+            vector = trigrams(text)
+            if not vector:
+                continue
+            doc_vectors.append((category, weight, vector))
+            for gram in vector:
+                df[gram] += 1
+
+        total = max(len(doc_vectors), 1)
+        self._idf = {gram: math.log(1 + total / count) for gram, count in df.items()}
+        self._default_idf = math.log(1 + total)
+
+        for doc_id, (category, weight, vector) in enumerate(doc_vectors):
+            weighted = {gram: tf * self._idf[gram] for gram, tf in vector.items()}
+            norm = math.sqrt(sum(w * w for w in weighted.values())) or 1.0
+            self._doc_category.append(category)
+            self._doc_weight.append(weight)
+            for gram, w in weighted.items():
+                self._postings[gram].append((doc_id, w / norm))
+
+    @classmethod
+    def from_catalog(cls, categories: Dict) -> 'CategoryIndex':
+        """Kategori kataloğundan indeksi kurar."""
+        documents = []
+        for name, data in categories.items():
+            documents.append((name, NAME_WEIGHT, name))
+            if not isinstance(data, dict):
+                continue
+            for synonym in data.get('synonyms', []):
+                documents.append((name, SYNONYM_WEIGHT, synonym))
+            for spec in data.get('specs', []):
+                for label in (spec.get('label') or {}).values():
+                    documents.append((name, SPEC_LABEL_WEIGHT, label))
+        return cls(documents, list(categories.keys()))
+
+    def search(self, query: str, limit: int = None) -> List[Tuple[str, float]]:
+        """
+        Sorguya benzeyen kategorileri skora göre sıralı döndürür.
+
+        Returns:
+            list: (kategori, skor 0.0-1.0) çiftleri, yalnızca skoru > 0 olanlar
+        """
+        query_vector = trigrams(query)
+        if not query_vector:
+            return []
+
+        weighted = {gram: tf * self._idf.get(gram, self._default_idf) for gram, tf in query_vector.items()}
+        query_norm = math.sqrt(sum(w * w for w in weighted.values())) or 1.0
+
+        doc_scores = defaultdict(float)
+        for gram, w in weighted.items():
+            for doc_id, doc_w in self._postings.get(gram, ()):
+                doc_scores[doc_id] += w * doc_w
+
+        best = {}
+        for doc_id, score in doc_scores.items():
+            category = self._doc_category[doc_id]
+            score = score / query_norm * self._doc_weight[doc_id]
+            if score > best.get(category, 0.0):
+                best[category] = score
+
+        position = {name: i for i, name in enumerate(self.order)}
+        ranked = sorted(best.items(), key=lambda item: (-item[1], position.get(item[0], 0)))
+        return ranked[:limit] if limit else ranked
+
+    def candidates(self, query: str, k: int) -> List[str]:
+        """
+        Recognition prompt'u için tam olarak min(k, katalog) kategori seçer.
+
+        Önce skoru olanlar, sonra katalog sırasındaki diğerleri eklenir; böylece
+        sözcüksel örtüşme olmayan sorgularda da AI anlamsal eşleme yapabilir.
+        """
+        selected = [name for name, _ in self.search(query, k)]
+        if len(selected) < k:
+            chosen = set(selected)
+            selected += [name for name in self.order if name not in chosen][:k - len(selected)]
+        return selected
+
+
+# Yerel eşleşme güvenleri (yöntem bazında)
+PHRASE_CONFIDENCE = 0.95
+OPTION_CONFIDENCE = 0.85
+TYPO_CONFIDENCE = 0.8
+AMBIGUOUS_CONFIDENCE = 0.5
+PARTIAL_CONFIDENCE = 0.6
+ACCESSORY_CONFIDENCE = 0.2
+
+# Her kategoride ürünün kendisini niteleyen, aksesuar belirtmeyen kelimeler
+QUALIFIER_WORDS = (
+    'ucuz', 'uygun', 'fiyatlı', 'en', 'iyi', 'yeni', 'gaming', 'oyuncu', 'oyun',
+    'pro', 'mini', 'max', 'plus', 'lite', 'air'
+)
+
+# Yazım hatası düzeltmesi bu uzunluktan kısa kelimelere uygulanmaz ("klma" ≠ "klima")
+TYPO_MIN_LENGTH = 5
+
+# Bu güvenin altındaki yerel eşleşmeler AI tanımaya bırakılır;
+# benchmarks/bench_category_matcher.py ile kalibre edilmiştir
+DEFAULT_MATCH_THRESHOLD = 0.7
+
+
+def match_threshold() -> float:
+    """CATEGORY_MATCH_THRESHOLD ortam değişkeni veya kalibre edilmiş varsayılan."""
+    try:
+        return float(os.getenv('CATEGORY_MATCH_THRESHOLD', DEFAULT_MATCH_THRESHOLD))
+    except ValueError:
+        return DEFAULT_MATCH_THRESHOLD
+
+
+class CategoryMatcher:
+    """
+    Kategori adları, eş anlamlılar ve seçenek etiketlerinden kurulan ifade
+    tablosu ile trigram indeksini birleştiren yerel eşleştirici.
+
+    Yalnızca tr ve en etiketi aynı olan (çevrilmemiş), rakam içermeyen
+    seçenek etiketleri ifade tablosuna girer: marka ve teknoloji adları ("Daikin", "OLED",
+    "Cherry MX") bir kategoriyi belirlerken "Uzun"/"Long" gibi genel
+    kelimeler belirlemez.
+    """
+
+    def __init__(self, categories: Dict):
+        self.categories = categories
+        self.index = CategoryIndex.from_catalog(categories)
+        self._phrases = defaultdict(set)
+        self._options = defaultdict(set)
+        # Kategori başına: sorguda eşleşen ifadenin yanında kabul edilen kelimeler
+        # ve aksesuar (shopping_filter exclude) ifadeleri
+        self._vocabulary_by_category = defaultdict(set)
+        self._accessories = defaultdict(set)
+        self._qualifiers = {token for word in QUALIFIER_WORDS for token in tokenize(word)}
+
+        for name, data in categories.items():
+            self._add(self._phrases, name, name)
+            self._vocabulary_by_category[name].update(tokenize(name))
+            for phrase in DEFAULT_EXCLUDE:
+                self._add_accessory(phrase, name)
+            if not isinstance(data, dict):
+                continue
+            for synonym in data.get('synonyms', []):
+                self._add(self._phrases, synonym, name)
+                self._vocabulary_by_category[name].update(tokenize(synonym))
+            for phrase in (data.get('shopping_filter') or {}).get('exclude', []):
+                self._add_accessory(phrase, name)
+            for spec in data.get('specs', []):
+                for option in spec.get('options', []):
+                    label = option.get('label') or {}
+                    for text in label.values():
+                        self._vocabulary_by_category[name].update(tokenize(text))
+                    if option.get('id') == 'no_preference' or len(set(label.values())) != 1:
+                        continue
+                    text = re.sub(r'\(.*?\)', '', next(iter(label.values())))
+                    # "128 GB", "144Hz" gibi ölçüler ve "VA" gibi kısaltmalar çok genel
+                    if len(text.strip()) >= 3 and not any(ch.isdigit() for ch in text):
+                        self._add(self._options, text, name)
+                    # Marka/teknoloji adları hangi kategoride geçerse geçsin niteleyicidir
+                    self._qualifiers.update(tokenize(text))
+
+        # Birden fazla kategoriye ait seçenek etiketleri ayırt edici değildir
+        self._options = {phrase: owners for phrase, owners in self._options.items()
+                         if len(owners) == 1 and phrase not in self._phrases}
+        self._max_phrase = max((len(p) for p in list(self._phrases) + list(self._options)), default=0)
+
+        # Yazım hatası düzeltme: ifade kelimelerinin tek harf silinmiş halleri
+        # (symmetric delete); bir silme mesafesindeki kelimeler aynı anahtarda buluşur
+        self._vocabulary = {token for phrase in self._phrases for token in phrase}
+        self._deletes = defaultdict(set)
+        for word in self._vocabulary:
+            if len(word) >= TYPO_MIN_LENGTH - 1:
+                for variant in self._delete_variants(word):
+                    self._deletes[variant].add(word)
+
+    @staticmethod
+    def _delete_variants(word):
+        return {word} | {word[:i] + word[i + 1:] for i in range(len(word))}
+
+    def _correct(self, tokens):
+        """
+        Sözlükte olmayan kelimeleri tek düzenleme uzaklığındaki tek adaya
+        düzeltir; hiçbir kelime düzeltilmezse None döndürür.
+        """
+        corrected, changed = [], False
+        for token in tokens:
+            if token not in self._vocabulary and len(token) >= TYPO_MIN_LENGTH:
+                candidates = set()
+                for variant in self._delete_variants(token):
+                    candidates |= self._deletes.get(variant, set())
+                if len(candidates) == 1:
+                    token, changed = next(iter(candidates)), True
+            corrected.append(token)
+        return tuple(corrected) if changed else None
+
+    @staticmethod
+    def _add(table, text, category):
+        tokens = tuple(tokenize(text))
+        if tokens:
+            table[tokens].add(category)
+
+    def _add_accessory(self, phrase, category):
+        tokens = tuple(tokenize(phrase))
+        if tokens:
+            self._accessories[category].add(tokens)
+
+    def _qualified(self, category, tokens, confidence, method):
+        """
+        İçerilen ifade/seçenek eşleşmesini sorgunun kalan kelimelerine göre sınıflar.
+
+        Aksesuar ifadesi geçiyorsa veya kategorinin sözlüğünde ve
+        niteleyicilerde olmayan (rakam olmayan) bir kelime kalıyorsa güven
+        eşiğin altına düşer.
+        """
+        for accessory in self._accessories.get(category, ()):
+            length = len(accessory)
+            if any(tokens[start:start + length] == accessory for start in range(len(tokens) - length + 1)):
+                return self._result(category, ACCESSORY_CONFIDENCE, 'accessory')
+        vocabulary = self._vocabulary_by_category.get(category, set())
+        if any(token not in vocabulary and token not in self._qualifiers and not token.isdigit()
+               for token in tokens):
+            return self._result(category, PARTIAL_CONFIDENCE, 'partial')
+        return self._result(category, confidence, method)
+
+    def _contained(self, tokens, table):
+        """Sorguda geçen en uzun ifadenin sahibi kategoriler (uzunluk, küme)."""
+        for length in range(min(len(tokens), self._max_phrase), 0, -1):
+            owners = set()
+            for start in range(len(tokens) - length + 1):
+                owners |= table.get(tokens[start:start + length], set())
+            if owners:
+                return length, owners
+        return 0, set()
+
+    def _result(self, category, confidence, method):
+        return {
+            'category': category,
+            'confidence': round(confidence, 3),
+            'method': method,
+            'data': self.categories.get(category)
+        }
+
+    def score(self, query: str) -> Dict:
+        """
+        Sorgu için en iyi yerel adayı ve güvenini döndürür (eşikten bağımsız).
+
+        Returns:
+            dict or None: category, confidence, method (exact, phrase, option,
+            typo, partial, accessory, ambiguous, trigram), data; hiç aday yoksa None
+        """
+        tokens = tuple(tokenize(query))
+        if not tokens:
+            return None
+
+        owners = self._phrases.get(tokens)
+        if owners and len(owners) == 1:
+            return self._result(next(iter(owners)), 1.0, 'exact')
+
+        length, owners = self._contained(tokens, self._phrases)
+        if not owners:
+            length, owners = self._contained(tokens, self._options)
+            if len(owners) == 1:
+                return self._qualified(next(iter(owners)), tokens, OPTION_CONFIDENCE, 'option')
+        elif len(owners) == 1:
+            return self._qualified(next(iter(owners)), tokens, PHRASE_CONFIDENCE, 'phrase')
+
+        if not owners:
+            corrected = self._correct(tokens)
+            if corrected:
+                length, typo_owners = self._contained(corrected, self._phrases)
+                if len(typo_owners) == 1:
+                    return self._qualified(next(iter(typo_owners)), corrected, TYPO_CONFIDENCE, 'typo')
+
+        ranked = self.index.search(query, 2)
+        if owners:
+            # Eşit uzunlukta birden fazla kategori ifadesi: trigram ile sırala
+            ranked = [item for item in ranked if item[0] in owners] or [(sorted(owners)[0], 0.0)]
+            return self._result(ranked[0][0], AMBIGUOUS_CONFIDENCE, 'ambiguous')
+        if not ranked:
+            return None
+
+        best, s1 = ranked[0]
+        s2 = ranked[1][1] if len(ranked) > 1 else 0.0
+        return self._result(best, max(s1 - 0.5 * s2, 0.0), 'trigram')
+
+    def match(self, query: str, threshold: float = None) -> Dict:
+        """
+        Güveni eşiğin üstündeyse yerel eşleşmeyi, değilse None döndürür.
+
+        Args:
+            query (str): Kullanıcı sorgusu
+            threshold (float): Eşik (varsayılan: match_threshold())
+        """
+        result = self.score(query)
+        if threshold is None:
+            threshold = match_threshold()
+        if result is None or result['confidence'] < threshold:
+            return None
+        return result
+
+
+_matcher = None
+_matcher_mtime = None
+_matcher_lock = threading.Lock()
+
+
+def get_category_matcher(path: str = CATEGORIES_FILE) -> CategoryMatcher:
+    """
+    categories.json'dan kurulmuş paylaşımlı eşleştiriciyi döndürür.
+
+    Eşleştirici yalnızca dosya değiştiğinde (mtime) yeniden kurulur; AI ile
+    oluşturulan kategoriler kaydedildiği anda eşleştirmeye ve adaylara katılır.
+    """
+    global _matcher, _matcher_mtime
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+
+    with _matcher_lock:
+        if _matcher is None or mtime != _matcher_mtime:
+            try:
+                categories = load_file(path)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Kategori indeksi yüklenemedi: {e}")
+                categories = {}
+            _matcher = CategoryMatcher(categories)
+            _matcher_mtime = mtime
+        return _matcher
+
+
+def get_category_index(path: str = CATEGORIES_FILE) -> CategoryIndex:
+    """Paylaşımlı eşleştiricinin trigram indeksini döndürür."""
+    return get_category_matcher(path).index
@@ -0,0 +1,224 @@
+"""
+FindFlow Devre Kesici (Circuit Breaker)
+=======================================
+
+Bu modül, Gemini ve SerpAPI için upstream başına devre kesicileri içerir.
+Upstream bozulduğunda istekler tüm retry/timeout zincirini beklemek yerine
+hemen önbellek veya fallback yoluna geçer; böylece olay sırasında kuyruk
+gecikmesi 45 sn'lik istemci zaman aşımına değil devre kesicinin karar
+süresine bağlı kalır.
+
+Durumlar:
+- closed: Çağrılar geçer; son window_seconds içindeki sonuçlar izlenir.
+  En az min_calls çağrıda hata oranı failure_ratio'yu veya yavaş çağrı
+  (> slow_seconds) oranı slow_ratio'yu aşarsa devre açılır
+- open: Çağrılar upstream'e gitmeden reddedilir (open_seconds boyunca)
+- half_open: probe_interval'da bir deneme çağrısına izin verilir; başarılı
+  ve hızlıysa devre kapanır, değilse tekrar açılır
+
+Kota hataları (429) devre kesiciye sayılmaz; onları app.rate_limiter
+governor'ı yönetir.
+
+Varsayılanlar:
+- gemini: slow_seconds=20, min_calls=8
+- serpapi: slow_seconds=8, min_calls=5
+- ortak: failure_ratio=0.5, slow_ratio=0.8, window_seconds=60,
+  open_seconds=30, probe_interval=5
+
+Yapılandırma:
+- CIRCUIT_BREAKERS="gemini.open_seconds=60,serpapi.failure_ratio=0.3"
+  (serpapi.enabled=0 devre kesiciyi kapatır)
+
+Ana Sınıflar:
+- CircuitBreaker: Tek upstream için durum makinesi
+
+Fonksiyonlar:
+- get_breaker(): Upstream için paylaşımlı devre kesici
+
+Kullanım:
+    breaker = get_breaker('serpapi')
+    if not breaker.allow():
+        return fallback()
+    started = time.perf_counter()
+    response = requests.get(url, timeout=10)
+    breaker.record(response.ok, time.perf_counter() - started)
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+from .telemetry import REGISTRY
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+COMMON_SETTINGS = {
+    'enabled': 1,
+    'failure_ratio': 0.5,
+    'slow_ratio': 0.8,
+    'window_seconds': 60,
+    'open_seconds': 30,
+    'probe_interval': 5,
+}
+DEFAULT_BREAKERS = {
+    'gemini': {'slow_seconds': 20, 'min_calls': 8},
+    'serpapi': {'slow_seconds': 8, 'min_calls': 5},
+}
+
+TRANSITIONS = REGISTRY.counter(
+    'findflow_circuit_transitions_total', 'Circuit breaker state changes', ('upstream', 'state'))
+REJECTED = REGISTRY.counter(
+    'findflow_circuit_rejected_total', 'Calls short-circuited by an open breaker', ('upstream',))
+
+
+class CircuitBreaker:
+    """
+    Tek bir upstream için kayan pencereli devre kesici (thread-safe).
+    """
+
+    def __init__(self, name, slow_seconds=10, min_calls=5, failure_ratio=0.5, slow_ratio=0.8,
+                 window_seconds=60, open_seconds=30, probe_interval=5, enabled=True):
+        """
+        Args:
+            name (str): Upstream adı (metrik etiketi)
+            slow_seconds (float): Bu süreyi aşan çağrı yavaş sayılır
+            min_calls (int): Karar için penceredeki en az çağrı
+            failure_ratio (float): Açılma için hata oranı eşiği
+            slow_ratio (float): Açılma için yavaş çağrı oranı eşiği
+            window_seconds (float): Sonuçların tutulduğu pencere
+            open_seconds (float): Açık kalma süresi
+            probe_interval (float): Yarı açıkken deneme çağrıları arası süre
+            enabled (bool): False ise her çağrıya izin verilir
+        """
+        self.name = name
+        self.slow_seconds = slow_seconds
+        self.min_calls = max(1, int(min_calls))
+        self.failure_ratio = failure_ratio
+        self.slow_ratio = slow_ratio
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.probe_interval = probe_interval
+        self.enabled = bool(enabled)
+        self.state = CLOSED
+        self._calls = deque()
+        self._open_until = 0.0
+        self._next_probe = 0.0
+        self._lock = threading.Lock()
+
+    def _transition(self, state, now):
+        self.state = state
+        TRANSITIONS.inc(upstream=self.name, state=state)
+        if state == OPEN:
+            self._open_until = now + self.open_seconds
+            print(f"🔌 {self.name} devresi açıldı: {self.open_seconds:.0f} sn boyunca fallback kullanılacak")
+        elif state == HALF_OPEN:
+            self._next_probe = now
+        else:
+            self._calls.clear()
+            print(f"🔌 {self.name} devresi kapandı")
+
+    def _trim(self, now):
+        cutoff = now - self.window_seconds
+        while self._calls and self._calls[0][0] < cutoff:
+            self._calls.popleft()
+
+    def is_open(self):
+        """Devre açık ve bekleme süresi dolmamış mı (durumu değiştirmez)."""
+        return self.enabled and self.state == OPEN and time.monotonic() < self._open_until
+
+    def allow(self):
+        """
+        Çağrının upstream'e gidip gitmeyeceğine karar verir.
+
+        Returns:
+            bool: True ise çağrı yapılmalı ve sonucu record() ile bildirilmelidir
+        """
+        if not self.enabled:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN and now >= self._open_until:
+                self._transition(HALF_OPEN, now)
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and now >= self._next_probe:
+                self._next_probe = now + self.probe_interval
+                print(f"🔍 {self.name} devresi yarı açık: deneme çağrısı")
+                return True
+        REJECTED.inc(upstream=self.name)
+        return False
+
+    def record(self, ok, duration):
+        """
+        Tamamlanan çağrının sonucunu kaydeder.
+
+        Args:
+            ok (bool): Upstream başarılı yanıt verdi mi
+            duration (float): Çağrı süresi (saniye)
+        """
+        if not self.enabled:
+            return
+        slow = duration > self.slow_seconds
+        with self._lock:
+            now = time.monotonic()
+            if self.state == HALF_OPEN:
+                self._transition(CLOSED if ok and not slow else OPEN, now)
+                return
+            if self.state == OPEN:
+                return
+            self._calls.append((now, ok, slow))
+            self._trim(now)
+            total = len(self._calls)
+            if total < self.min_calls:
+                return
+            failures = sum(1 for _, call_ok, _ in self._calls if not call_ok)
+            slow_calls = sum(1 for _, _, call_slow in self._calls if call_slow)
+            if failures / total >= self.failure_ratio or slow_calls / total >= self.slow_ratio:
+                self._transition(OPEN, now)
+
+
+def configured_breakers():
+    """Varsayılan ayarlar + CIRCUIT_BREAKERS ortam değişkeni (upstream.alan=değer,...)."""
+    settings = {name: dict(COMMON_SETTINGS, **values) for name, values in DEFAULT_BREAKERS.items()}
+    for item in os.getenv('CIRCUIT_BREAKERS', '').split(','):
+        key, _, value = item.partition('=')
+        name, _, field = key.strip().partition('.')
+        if name and field and value.strip():
+            settings.setdefault(name, dict(COMMON_SETTINGS))[field] = float(value)
+    return settings
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """
+    Upstream için paylaşımlı devre kesiciyi döndürür.
+
+    Args:
+        name (str): 'gemini' veya 'serpapi'
+
+    Returns:
+        CircuitBreaker: Süreçteki tüm çağıranların paylaştığı devre kesici
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, **configured_breakers().get(name, COMMON_SETTINGS))
+            _breakers[name] = breaker
+        return breaker
+
+
+def _circuit_states():
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [((breaker.name,), STATE_VALUES[breaker.state]) for breaker in breakers]
+
+
+REGISTRY.gauge_callback('findflow_circuit_state', 'Circuit breaker state (0 closed, 1 half-open, 2 open)',
+                        ('upstream',), _circuit_states)
@@ -0,0 +1,133 @@
+"""
+FindFlow İstek Birleştirme (Request Coalescing)
+===============================================
+
+Bu modül, aynı anahtarla eşzamanlı yapılan pahalı çağrıları tek bir
+çalıştırmaya indirir. İlk çağıran (lider) işi çalıştırır; iş sürerken aynı
+anahtarla gelen çağıranlar (takipçiler) liderin sonucunu bekler ve aynı
+sonucu alır. Sonuç önbelleğe yazılmaya uygun olmasa bile (hata, boş
+sonuç) takipçiler yeniden hesaplamaz; lider hata fırlatırsa aynı hata
+takipçilerde de fırlar.
+
+TTL önbelleğinin (app.cache) tamamlayıcısıdır: önbellek tamamlanmış
+sonuçları, kayıt defteri ise henüz tamamlanmamış çağrıları paylaştırır.
+Böylece trafik sıçramalarında upstream yükü farklı sorgu sayısıyla
+sınırlanır.
+
+Takipçi en fazla `timeout` kadar bekler (get_or_set'te istek bütçesi);
+süre dolarsa fn()'i kendisi çalıştırmaz, CoalescedCallTimeout fırlatır.
+Aksi halde deadline'ı dolmuş her takipçi upstream çağrısını tekrarlardı.
+Çağıran bunu degraded bir sonuca çevirir.
+
+Takipçiler liderin sonucunun JSON kopyasını alır; lider kendi sonucunu
+değiştirse bile (örn. bütçe filtresi) takipçiler etkilenmez. Kopya yalnızca
+takipçi varsa üretilir.
+
+Ana Sınıflar:
+- InflightRegistry: Anahtar → devam eden çağrı kayıt defteri
+- CoalescedCallTimeout: Takipçi liderin sonucunu süresinde alamadı
+
+Kullanım:
+    registry = InflightRegistry('search_results')
+    result = registry.run(key, lambda: expensive_search(preferences))
+"""
+
+import copy
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from .json_codec import dumps, loads
+from .telemetry import REGISTRY
+
+COALESCED = REGISTRY.counter(
+    'findflow_coalesced_requests_total', 'Calls that awaited an identical in-flight call instead of running it', ('name',))
+COALESCE_TIMEOUTS = REGISTRY.counter(
+    'findflow_coalesced_timeouts_total', 'Coalesced calls that gave up waiting for the in-flight result', ('name',))
+
+
+class CoalescedCallTimeout(Exception):
+    """Takipçi, liderin sonucunu bekleme süresi içinde alamadı."""
+
+
+class _InflightCall:
+    __slots__ = ('future', 'followers')
+
+    def __init__(self):
+        self.future = Future()
+        self.followers = 0
+
+
+def _snapshot(result):
+    """Takipçilere verilecek, liderin nesnesinden bağımsız kopya üreticisi."""
+    try:
+        encoded = dumps(result)
+    except TypeError:
+        frozen = copy.deepcopy(result)
+        return lambda: copy.deepcopy(frozen)
+    return lambda: loads(encoded)
+
+
+class InflightRegistry:
+    """
+    Devam eden çağrıları anahtara göre tutan kayıt defteri (thread-safe).
+    """
+
+    def __init__(self, name):
+        """
+        Args:
+            name (str): Metrik etiketi (örn. 'search_results')
+        """
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def in_flight(self):
+        """Şu anda çalışan farklı anahtar sayısı."""
+        return len(self._calls)
+
+    def run(self, key, fn, timeout=None):
+        """
+        fn()'i anahtar için bir kez çalıştırır; eşzamanlı çağıranlar sonucu paylaşır.
+
+        Args:
+            key: Hashlenebilir anahtar (normalize edilmiş)
+            fn (Callable): Sonucu üreten fonksiyon
+            timeout (float): Takipçinin bekleme süresi (None: sınırsız)
+
+        Returns:
+            fn() sonucu (takipçiler için bağımsız kopya)
+
+        Raises:
+            CoalescedCallTimeout: Takipçi süre içinde sonucu alamadı (fn() çalıştırılmaz)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _InflightCall()
+            else:
+                call.followers += 1
+
+        if not leader:
+            COALESCED.inc(name=self.name)
+            try:
+                return call.future.result(timeout)()
+            except FutureTimeoutError:
+                COALESCE_TIMEOUTS.inc(name=self.name)
+                print(f"⏳ Coalesced call timed out [{self.name}] after {timeout:.1f}s")
+                raise CoalescedCallTimeout(f"{self.name}: in-flight call did not finish within {timeout:.1f}s")
+
+        try:
+            result = fn()
+        except BaseException as e:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._calls.pop(key, None)
+            followers = call.followers
+        # Kayıttan çıkarıldıktan sonra yeni takipçi eklenemez; kopya yalnızca gerekiyorsa
+        call.future.set_result(_snapshot(result) if followers else None)
+        return result
@@ -12,11 +12,21 @@ Ana Fonksiyonlar:
 - setup_gemini(): Gemini API'yi yapılandırır
 - get_gemini_model(): Optimize edilmiş Gemini modeli döner
 - generate_with_retry(): Retry mekanizması ile API istekleri gönderir
+- get_serpapi_settings(): SerpAPI adresi ve anahtarını döner
+
+Sahte backend'ler (bkz. app/fake_upstreams.py):
+- GEMINI_BACKEND=fake: Gemini yerine yerel FakeGeminiModel kullanılır
+- SERPAPI_BACKEND=fake: Süreç içinde sahte SerpAPI sunucusu başlatılır
+- SERPAPI_BASE_URL: SerpAPI adresini (örn. harici sahte sunucu) değiştirir
 
 Özellikler:
 - Otomatik API yapılandırması
 - Optimize edilmiş model parametreleri
 - Exponential backoff retry mekanizması
+- Upstream hız sınırı ve öncelik kuyruğu (app.rate_limiter)
+- Devre kesici ile hızlı fallback (app.circuit_breaker)
+- Gecikmeye duyarlı çağrı noktalarında hedge istekleri (app.hedging)
+- İstek süre bütçesine (app.deadline) göre kırpılan deneme ve beklemeler
 - Hata yönetimi ve loglama
 
 Gereksinimler:
@@ -30,6 +40,16 @@ from dotenv import load_dotenv
 import google.generativeai as genai
 import time
 
+from .telemetry import GEMINI_ATTEMPTS, GEMINI_RETRIES, record_upstream, span
+from .gemini_usage import record_call
+from .rate_limiter import UpstreamQueueTimeout, get_governor, is_rate_limit_error
+from .circuit_breaker import get_breaker
+from .hedging import get_hedge_policy
+from .deadline import current_deadline
+
+# İstek bütçesinde bundan az süre kaldıysa yeni Gemini denemesi başlatılmaz
+MIN_ATTEMPT_SECONDS = 2.0
+
 def setup_gemini():
     """
     Gemini API'yi yapılandırır ve başlatır - FindFlow için optimize edilmiş.
@@ -47,6 +67,8 @@ def setup_gemini():
         ...     print("Gemini API yapılandırılamadı")
     """
     load_dotenv()
+    if os.getenv('GEMINI_BACKEND') == 'fake':
+        return True
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
     if GEMINI_API_KEY:
         genai.configure(api_key=GEMINI_API_KEY)
@@ -68,6 +90,10 @@ def get_gemini_model():
         >>> model = get_gemini_model()
         >>> response = model.generate_content("Merhaba")
     """
+    if os.getenv('GEMINI_BACKEND') == 'fake':
+        from .fake_upstreams import FakeGeminiModel
+        return FakeGeminiModel.from_env()
+
     # Relaxed safety settings to prevent empty responses
     safety_settings = [
         {
@@ -99,7 +125,7 @@ def get_gemini_model():
         safety_settings=safety_settings
     )
 
-def generate_with_retry(model, prompt, max_retries=2, delay=10):
+def generate_with_retry(model, prompt, max_retries=2, delay=10, call_site='unknown', generation_config=None):
     """
     Gemini API'ye retry mekanizması ile istek gönderir.
     
@@ -107,11 +133,25 @@ def generate_with_retry(model, prompt, max_retries=2, delay=10):
     exponential backoff retry mekanizması kullanır. Her başarısız
     denemeden sonra bekleme süresi artırılır.
     
+    Her deneme Gemini governor'ından (app.rate_limiter) slot alır. Kota
+    hatasında (429) governor duraklatılır ve yeniden deneme sleep yerine
+    kuyrukta bekler; kuyruk zaman aşımında yeniden denenmez. Gemini devre
+    kesicisi (app.circuit_breaker) açıksa çağrı yapılmadan None döner.
+    Çağrı noktası için hedge açıksa (app.hedging) yavaş kalan deneme
+    ikinci bir kopya ile yarıştırılır.
+    
+    İstek deadline'ı (app.deadline) varsa kuyruk beklemesi, çağrı zaman
+    aşımı ve retry beklemesi kalan süreye kırpılır; kalan süre
+    MIN_ATTEMPT_SECONDS'tan azsa yeni deneme yapılmadan None döner.
+    
     Args:
         model (genai.GenerativeModel): Gemini model nesnesi
         prompt (str): AI'ya gönderilecek prompt metni
         max_retries (int): Maksimum deneme sayısı (varsayılan: 3)
         delay (int): İlk deneme arası bekleme süresi (varsayılan: 2)
+        call_site (str): Token/maliyet muhasebesi için çağrı noktası adı
+        generation_config (dict): Model ayarlarının üzerine yazılacak çağrı bazlı
+            ayarlar (örn. {'response_mime_type': 'application/json'})
         
     Returns:
         genai.types.GenerateContentResponse or None: API yanıtı veya None
@@ -125,17 +165,54 @@ def generate_with_retry(model, prompt, max_retries=2, delay=10):
         >>> if response:
         ...     print(response.text)
     """
+    started = time.perf_counter()
+    request_options = {'generation_config': generation_config} if generation_config else {}
+    governor = get_governor('gemini')
+    breaker = get_breaker('gemini')
+    hedge_policy = get_hedge_policy(call_site)
+    deadline = current_deadline()
+    attempts = 0
     for attempt in range(max_retries):
+        attempts = attempt + 1
+        throttled = False
+        call_started = None
+        if deadline is not None and not deadline.allows(MIN_ATTEMPT_SECONDS):
+            print(f"⏱️ İstek süresi doluyor, Gemini denemesi atlandı [{call_site}]")
+            record_upstream('gemini', False, 'deadline')
+            deadline.note('gemini')
+            break
+        if not breaker.allow():
+            print(f"🔌 Gemini devresi açık, çağrı atlandı [{call_site}]")
+            record_upstream('gemini', False, 'circuit_open')
+            break
         try:
             print(f"🔄 Gemini API isteği (deneme {attempt + 1}/{max_retries})")
-            response = model.generate_content(prompt)
+            queue_timeout = deadline.timeout(governor.queue_timeout) if deadline is not None else None
+            with governor.slot(timeout=queue_timeout):
+                call_started = time.perf_counter()
+                call_options = dict(request_options)
+                if deadline is not None:
+                    call_options['request_options'] = {'timeout': deadline.remaining()}
+                with span('gemini_attempt'):
+                    if hedge_policy:
+                        response = hedge_policy.call(lambda: model.generate_content(prompt, **call_options),
+                                                     governor, breaker)
+                    else:
+                        response = model.generate_content(prompt, **call_options)
+            # Boş/engellenmiş yanıt da upstream'in yanıt verdiği anlamına gelir
+            breaker.record(True, time.perf_counter() - call_started)
             
             # Detailed response checking
             if response and hasattr(response, 'text') and response.text:
                 print(f"✅ Gemini API başarılı (deneme {attempt + 1})")
                 print(f"📄 Response length: {len(response.text)} characters")
+                GEMINI_ATTEMPTS.inc(result='success')
+                record_upstream('gemini', True)
+                record_call(call_site, prompt, response, time.perf_counter() - started, attempt + 1, True)
                 return response
-            elif response and hasattr(response, 'candidates') and response.candidates:
+            GEMINI_ATTEMPTS.inc(result='empty')
+            record_upstream('gemini', False, 'empty')
+            if response and hasattr(response, 'candidates') and response.candidates:
                 # Check if response was blocked
                 candidate = response.candidates[0]
                 if hasattr(candidate, 'finish_reason'):
@@ -147,14 +224,64 @@ def generate_with_retry(model, prompt, max_retries=2, delay=10):
             else:
                 print(f"⚠️ Geçersiz response objesi (deneme {attempt + 1})")
                 
+        except UpstreamQueueTimeout as e:
+            # Kuyruk zaten doluyken yeniden denemek yükü artırır
+            print(f"⏳ Gemini kuyruğu zaman aşımı: {e}")
+            record_upstream('gemini', False, 'queue_timeout')
+            if deadline is not None and not deadline.allows(MIN_ATTEMPT_SECONDS):
+                deadline.note('gemini')
+            break
         except Exception as e:
             print(f"❌ Gemini API hatası (deneme {attempt + 1}): {e}")
+            GEMINI_ATTEMPTS.inc(result='error')
+            throttled = is_rate_limit_error(e)
+            record_upstream('gemini', False, 'http_429' if throttled else None)
+            if throttled:
+                governor.report_throttled()
+            elif deadline is not None and not deadline.allows(MIN_ATTEMPT_SECONDS):
+                # Bütçeye kırpılan zaman aşımı upstream hatası sayılmaz
+                deadline.note('gemini')
+            elif call_started is not None:
+                breaker.record(False, time.perf_counter() - call_started)
             
         # Wait before retry (except on last attempt)
         if attempt < max_retries - 1:
+            if breaker.is_open():
+                # Devre bu istek sırasında açıldı; kalan denemeler boşuna beklenmez
+                continue
+            if throttled and governor.limited:
+                # Governor duraklatıldı; yeniden deneme kuyrukta bekler, ayrıca uyumaz
+                GEMINI_RETRIES.inc()
+                continue
+            if deadline is not None and not deadline.allows(delay + MIN_ATTEMPT_SECONDS):
+                # Beklemeden sonra deneme için süre kalmayacak
+                print(f"⏱️ İstek süresi yetmiyor, {delay} sn retry beklemesi atlandı [{call_site}]")
+                deadline.note('gemini')
+                break
             print(f"⏳ {delay} saniye bekleniyor...")
+            GEMINI_RETRIES.inc()
             time.sleep(delay)
             delay *= 1.5  # Exponential backoff
     
-    print(f"❌ Tüm denemeler başarısız oldu ({max_retries} deneme)")
+    print(f"❌ Tüm denemeler başarısız oldu ({attempts} deneme)")
+    record_call(call_site, prompt, None, time.perf_counter() - started, attempts, False)
     return None
+
+SERPAPI_BASE_URL = "https://serpapi.com/search"
+
+def get_serpapi_settings():
+    """
+    SerpAPI adresini ve API anahtarını döner.
+    
+    SERPAPI_BACKEND=fake ise süreç içi sahte sunucu başlatılır ve anahtar
+    gerekmez. SERPAPI_BASE_URL tanımlıysa (örn. ayrı süreçte çalışan sahte
+    sunucu) varsayılan adres yerine o kullanılır.
+    
+    Returns:
+        tuple: (base_url, api_key)
+    """
+    load_dotenv()
+    if os.getenv('SERPAPI_BACKEND') == 'fake':
+        from .fake_upstreams import get_fake_serpapi_url
+        return get_fake_serpapi_url(), os.getenv('SERPAPI_KEY') or 'fake'
+    return os.getenv('SERPAPI_BASE_URL', SERPAPI_BASE_URL), os.getenv('SERPAPI_KEY')
@@ -0,0 +1,146 @@
+"""
+FindFlow İstek Süre Bütçesi (Deadline)
+======================================
+
+Bu modül, bir /ask isteği için tek bir süre bütçesi tutar. Ön yüz
+(website/main.js) /ask isteğinden 45 sn sonra vazgeçer; sunucu içinde ise
+generate_with_retry (3-10 sn bekleme), SerpAPI sayfaları ve kuyruk
+beklemeleri kendi zaman aşımlarını kullandığından toplam süre bu bütçeyi
+rahatça aşabiliyordu.
+
+Deadline Flask giriş noktasında oluşturulur ve istek bağlamına
+(contextvars) konur; Agent.handle → _generate_recommendations →
+search_products → upstream çağrıları onu current_deadline() ile okur
+(app.rate_limiter'daki öncelik gibi). Her aşama:
+- Zaman aşımını, kuyruk beklemesini ve retry beklemesini kalan süreye kırpar
+- Kalan süre anlamlı bir deneme için yetmiyorsa upstream'i atlar ve
+  deadline.note(aşama) ile işaretler
+
+İşaretlenmiş bir istek zaman aşımına düşmek yerine eldeki (degraded)
+sonuçla döner; arama sonucu 'degraded' listesine 'deadline' eklenir ve
+önbelleğe yazılmaz. Arka plan thread'leri (shopping doldurma) bağlamı
+devralmaz ve bütçeden etkilenmez; ThreadPoolExecutor'a verilen işler
+(hedge istekleri) contextvars.copy_context() ile devralır.
+
+Yapılandırma:
+- REQUEST_DEADLINE_SECONDS=45 (istemci bütçesi bildirmezse ve üst sınır)
+- REQUEST_DEADLINE_MARGIN=3 (yanıtın istemciye ulaşması için ayrılan pay)
+- İstemci X-Request-Budget-Ms başlığıyla kendi bütçesini bildirebilir
+
+Ana Sınıflar:
+- Deadline: Kalan süre ve atlanan aşamalar
+
+Fonksiyonlar:
+- request_deadline(): Blok için deadline ayarlar
+- current_deadline(): Bağlamdaki deadline (yoksa None)
+- remaining_budget(): Varsayılan süreyi kalan bütçeye kırpar
+- configured_budget(): İstek bütçesi (başlık + yapılandırma)
+
+Kullanım:
+    with request_deadline(configured_budget(request.headers.get(BUDGET_HEADER))):
+        response = agent.handle(data)
+
+    timeout = remaining_budget(self.request_timeout)
+"""
+
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUDGET_SECONDS = 45.0
+DEFAULT_MARGIN_SECONDS = 3.0
+BUDGET_HEADER = 'X-Request-Budget-Ms'
+
+_current = contextvars.ContextVar('findflow_request_deadline', default=None)
+
+
+class Deadline:
+    """
+    Tek bir isteğin süre bütçesi (thread-safe).
+    """
+
+    def __init__(self, budget_seconds):
+        """
+        Args:
+            budget_seconds (float): İsteğin toplam süre bütçesi
+        """
+        self.budget = budget_seconds
+        self.expires_at = time.monotonic() + budget_seconds
+        self.trimmed = []
+        self._lock = threading.Lock()
+
+    def remaining(self):
+        """Kalan süre (saniye, en az 0)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def allows(self, seconds):
+        """Kalan süre `seconds` kadar bir iş için yetiyor mu?"""
+        return self.remaining() >= seconds
+
+    def timeout(self, default):
+        """`default` süreyi kalan bütçeye kırpar (default None ise kalan süre)."""
+        remaining = self.remaining()
+        return remaining if default is None else min(default, remaining)
+
+    def note(self, stage):
+        """Bütçe yüzünden atlanan veya kısaltılan aşamayı işaretler."""
+        with self._lock:
+            if stage not in self.trimmed:
+                self.trimmed.append(stage)
+        print(f"⏱️ İstek bütçesi: {stage} aşaması kısaltıldı ({self.remaining():.1f} sn kaldı)")
+
+
+@contextmanager
+def request_deadline(budget_seconds):
+    """Blok içindeki çağrılar için deadline ayarlar; Deadline nesnesini verir."""
+    deadline = Deadline(budget_seconds)
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def current_deadline():
+    """Bağlamdaki Deadline (istek dışında None)."""
+    return _current.get()
+
+
+def remaining_budget(default):
+    """
+    Varsayılan süreyi bağlamdaki deadline'a kırpar.
+
+    Args:
+        default (float): Aşamanın kendi zaman aşımı (None: sınırsız)
+
+    Returns:
+        float or None: Deadline yoksa default, varsa min(default, kalan süre)
+    """
+    deadline = _current.get()
+    return default if deadline is None else deadline.timeout(default)
+
+
+def configured_budget(client_budget_ms=None):
+    """
+    İstek bütçesini hesaplar: istemci bütçesi (en fazla REQUEST_DEADLINE_SECONDS) - pay.
+
+    Args:
+        client_budget_ms (str): X-Request-Budget-Ms başlığının değeri (opsiyonel)
+
+    Returns:
+        float: Sunucunun kullanabileceği süre (saniye)
+    """
+    ceiling = float(os.getenv('REQUEST_DEADLINE_SECONDS', DEFAULT_BUDGET_SECONDS))
+    margin = float(os.getenv('REQUEST_DEADLINE_MARGIN', DEFAULT_MARGIN_SECONDS))
+    budget = ceiling
+    try:
+        if client_budget_ms:
+            budget = min(ceiling, float(client_budget_ms) / 1000)
+    except ValueError:
+        pass
+    return max(1.0, budget - margin)
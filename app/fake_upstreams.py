@@ -0,0 +1,680 @@
+"""
+FindFlow Sahte Upstream Modülü (Yük Testi İçin)
+===============================================
+
+Bu modül, ücretli API kotası harcamadan yük testi ve profil çıkarma yapmak
+için SerpAPI ve Gemini yerine geçen yerel sahte backend'leri içerir.
+
+Mock fonksiyonlarından (_get_mock_shopping_results vb.) farkı: gerçek istek,
+retry ve parse kodu aynen çalışır. Sadece karşı taraf yereldir ve
+gecikme dağılımı, hata oranı ve cevap içerikleri yapılandırılabilir.
+
+Ana Sınıflar:
+- LatencyProfile: Gecikme dağılımı ve hata oranı
+- FakeGeminiModel: genai.GenerativeModel yerine geçen sahte model
+- FakeSerpApiServer: Yerel sahte SerpAPI HTTP sunucusu
+- FakeRedisServer: Paylaşımlı önbellek (app.cache) için yerel Redis stand-in'i
+
+Yapılandırma (environment variables):
+- GEMINI_BACKEND=fake             → get_gemini_model() FakeGeminiModel döner
+- FAKE_GEMINI_LATENCY=lognormal:800:0.5
+- FAKE_GEMINI_ERROR_RATE=0.05
+- FAKE_GEMINI_QUOTA=20/s          → kota aşılınca 429 (FAKE_SERPAPI_QUOTA aynı)
+- FAKE_GEMINI_PAYLOAD=payload.json  → {"rules": [{"contains": "...", "text": "..."}]}
+- SERPAPI_BACKEND=fake            → süreç içinde sahte SerpAPI sunucusu başlatılır
+- SERPAPI_BASE_URL=http://127.0.0.1:8090/search → harici çalışan sahte sunucu
+- FAKE_SERPAPI_LATENCY=uniform:100:400
+- FAKE_SERPAPI_ERROR_RATE=0.02
+- FAKE_SERPAPI_PAYLOAD=shopping.json → {"shopping_results": [...]}
+- CACHE_BACKEND=fake              → süreç içinde sahte Redis sunucusu başlatılır
+- FAKE_REDIS_LATENCY=fixed:1
+
+Gecikme formatları: "fixed:MS", "uniform:MIN_MS:MAX_MS", "lognormal:MEDIAN_MS:SIGMA",
+"tail:MEDIAN_MS:SIGMA:SLOW_RATE:SLOW_MS"
+
+Kullanım:
+    # Ayrı süreçte sahte SerpAPI
+    python -m app.fake_upstreams --port 8090 --latency lognormal:300:0.4 --error-rate 0.02
+
+    # Ayrı süreçte sahte Redis (worker'lar CACHE_REDIS_URL=redis://127.0.0.1:6390/0 ile paylaşır)
+    python -m app.fake_upstreams --service redis --port 6390
+
+    # Uygulamayı sahte backend'lerle çalıştır
+    GEMINI_BACKEND=fake SERPAPI_BACKEND=fake python run.py
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+
+class FakeUpstreamError(Exception):
+    """Sahte upstream'in enjekte ettiği hata."""
+
+
+class LatencyProfile:
+    """
+    Gecikme dağılımı ve hata oranı.
+
+    Args:
+        spec (str): "fixed:MS" | "uniform:MIN_MS:MAX_MS" | "lognormal:MEDIAN_MS:SIGMA" |
+            "tail:MEDIAN_MS:SIGMA:SLOW_RATE:SLOW_MS" (lognormal; SLOW_RATE olasılıkla SLOW_MS takılma)
+        error_rate (float): 0.0-1.0 arası hata olasılığı
+        seed (int): Tekrarlanabilir ölçümler için rastgelelik tohumu
+        quota (FakeQuota): Aşılınca 429 döndürülen kota (opsiyonel)
+    """
+
+    def __init__(self, spec='fixed:0', error_rate=0.0, seed=None, quota=None):
+        self.spec = spec
+        self.error_rate = float(error_rate)
+        self.quota = quota
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        parts = spec.split(':')
+        kind = parts[0]
+        values = [float(v) for v in parts[1:]]
+        if kind == 'fixed':
+            self._sample = lambda r: values[0] / 1000
+        elif kind == 'uniform':
+            self._sample = lambda r: r.uniform(values[0], values[1]) / 1000
+        elif kind == 'lognormal':
+            mu = math.log(max(values[0], 1e-3))
+            self._sample = lambda r: r.lognormvariate(mu, values[1]) / 1000
+        elif kind == 'tail':
+            mu = math.log(max(values[0], 1e-3))
+            self._sample = lambda r: (values[3] if r.random() < values[2] else r.lognormvariate(mu, values[1])) / 1000
+        else:
+            raise ValueError(f"Unknown latency distribution: '{spec}'")
+
+    @classmethod
+    def from_env(cls, prefix, default_spec='fixed:0'):
+        """FAKE_<PREFIX>_LATENCY, _ERROR_RATE ve _QUOTA değişkenlerinden profil oluşturur."""
+        return cls(
+            os.getenv(f'FAKE_{prefix}_LATENCY', default_spec),
+            float(os.getenv(f'FAKE_{prefix}_ERROR_RATE', '0') or 0),
+            quota=get_fake_quota(prefix)
+        )
+
+    def delay(self):
+        """Dağılımdan bir gecikme örnekler (saniye)."""
+        with self._lock:
+            return self._sample(self._random)
+
+    def should_fail(self):
+        """Bu çağrıya hata enjekte edilecek mi?"""
+        if self.error_rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def over_quota(self):
+        """Kota tanımlıysa ve bu çağrı kotayı aşıyorsa True."""
+        return self.quota is not None and not self.quota.allow()
+
+
+class FakeQuota:
+    """
+    Upstream kotası: saniyede `rate` istek, en fazla bir saniyelik birikme.
+    Kota aşılırsa sahte upstream 429 döndürür (gerçek API gibi beklemeden).
+
+    Args:
+        spec (str): "N/s" veya "N/min"
+    """
+
+    def __init__(self, spec):
+        count, _, unit = spec.partition('/')
+        self.rate = float(count) / (60.0 if unit.strip() in ('min', 'm') else 1.0)
+        self.burst = max(1.0, self.rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            self.rejected += 1
+            return False
+
+
+_quotas = {}
+_quotas_lock = threading.Lock()
+
+
+def get_fake_quota(prefix):
+    """FAKE_<PREFIX>_QUOTA tanımlıysa süreçte paylaşılan kota (sahte modeller çağrı başına oluşturulur)."""
+    spec = os.getenv(f'FAKE_{prefix}_QUOTA')
+    if not spec:
+        return None
+    with _quotas_lock:
+        quota = _quotas.get((prefix, spec))
+        if quota is None:
+            quota = _quotas[(prefix, spec)] = FakeQuota(spec)
+        return quota
+
+
+def _load_payload(path):
+    if not path:
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# ---------------------------------------------------------------------------
+# Sahte Gemini
+# ---------------------------------------------------------------------------
+
+_QUERY_RE = re.compile(r'(?:USER QUERY|User searched for): "([^"]*)"')
+_CATEGORY_LINE_RE = re.compile(r'^\s*- ([^:\n]+):', re.MULTILINE)
+_BATCH_QUERY_RE = re.compile(r'^\s*(\d+)\. "([^"]*)"', re.MULTILINE)
+
+_GROUNDING_TEXT = (
+    "Güncel piyasa araştırmasına göre öne çıkan ürünler:\n"
+    "1. Model A - 12.499 ₺ - https://www.hepsiburada.com/ara?q=model+a\n"
+    "2. Model B - 15.999 ₺ - https://www.trendyol.com/sr?q=model+b\n"
+    "3. Model C - 9.899 ₺ - https://www.n11.com/arama?q=model+c\n"
+)
+
+_PRICE_RESEARCH_TEXT = "Entry 1-3k₺, Mid 3-7k₺, Upper 7-15k₺, Premium 15-30k₺, Luxury 30k₺+"
+
+
+def _fake_category_spec():
+    return json.dumps({
+        "budget_bands": {
+            "tr": ["1-3k₺", "3-7k₺", "7-15k₺", "15-30k₺", "30k₺+"],
+            "en": ["1-3k₺", "3-7k₺", "7-15k₺", "15-30k₺", "30k₺+"]
+        },
+        "specs": [
+            {
+                "id": "usage",
+                "type": "single_choice",
+                "label": {"tr": "Ne için kullanacaksınız?", "en": "What will you use it for?"},
+                "emoji": "🎯",
+                "tooltip": {"tr": "Kullanım amacı seçimi etkiler.", "en": "Usage affects the choice."},
+                "options": [
+                    {"id": "home", "label": {"tr": "Ev", "en": "Home"}},
+                    {"id": "professional", "label": {"tr": "Profesyonel", "en": "Professional"}},
+                    {"id": "no_preference", "label": {"tr": "Fark etmez", "en": "No preference"}}
+                ],
+                "weight": 1.0
+            },
+            {
+                "id": "portable",
+                "type": "boolean",
+                "label": {"tr": "Taşınabilir olmalı mı?", "en": "Should it be portable?"},
+                "emoji": "🎒",
+                "tooltip": {"tr": "Taşınabilirlik ağırlığı etkiler.", "en": "Portability affects weight."},
+                "weight": 0.8
+            }
+        ]
+    }, ensure_ascii=False)
+
+
+class _FakeCandidate:
+    def __init__(self):
+        self.finish_reason = 1
+        self.safety_ratings = []
+
+
+class _FakeUsage:
+    def __init__(self, prompt, text):
+        self.prompt_token_count = max(1, len(prompt) // 4)
+        self.candidates_token_count = max(1, len(text) // 4)
+        self.total_token_count = self.prompt_token_count + self.candidates_token_count
+
+
+class FakeResponse:
+    """genai GenerateContentResponse'un kullanılan alanlarını taklit eder."""
+
+    def __init__(self, prompt, text):
+        self.text = text
+        self.candidates = [_FakeCandidate()]
+        self.usage_metadata = _FakeUsage(prompt, text)
+
+
+class FakeGeminiModel:
+    """
+    genai.GenerativeModel yerine geçen sahte model.
+
+    Cevaplar prompt içeriğine göre seçilir (kategori tanıma, güven skoru,
+    isimlendirme, spec üretimi, grounding). Payload dosyasındaki "rules"
+    listesi ({"contains": "...", "text": "..."}) önce denenir.
+    """
+
+    def __init__(self, latency=None, payload=None):
+        self.latency = latency or LatencyProfile()
+        self.rules = (payload or {}).get('rules', [])
+
+    @classmethod
+    def from_env(cls):
+        """FAKE_GEMINI_* değişkenlerinden sahte model oluşturur."""
+        return cls(
+            LatencyProfile.from_env('GEMINI', 'lognormal:800:0.5'),
+            _load_payload(os.getenv('FAKE_GEMINI_PAYLOAD'))
+        )
+
+    def generate_content(self, prompt, **kwargs):
+        if self.latency.over_quota():
+            raise FakeUpstreamError("429 Resource has been exhausted (e.g. check quota) (fake)")
+        delay = self.latency.delay()
+        # Gerçek SDK gibi request_options={'timeout': sn} aşılırsa 504 döner
+        timeout = (kwargs.get('request_options') or {}).get('timeout')
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise FakeUpstreamError("504 Deadline Exceeded (fake)")
+        time.sleep(delay)
+        if self.latency.should_fail():
+            raise FakeUpstreamError("429 Resource has been exhausted (fake)")
+        return FakeResponse(prompt, self._answer(prompt))
+
+    @staticmethod
+    def _recognize(prompt, query):
+        for name in _CATEGORY_LINE_RE.findall(prompt):
+            if name.strip().lower() in query.lower() or query.lower() in name.strip().lower():
+                return name.strip()
+        return None
+
+    def _answer(self, prompt):
+        for rule in self.rules:
+            if rule.get('contains', '') in prompt:
+                return rule['text']
+
+        query_match = _QUERY_RE.search(prompt)
+        query = query_match.group(1) if query_match else ''
+
+        if 'CATEGORY NAME OR NO_MATCH' in prompt:
+            return self._recognize(prompt, query) or 'NO_MATCH'
+        if 'BATCH RECOGNITION JSON' in prompt:
+            answers = []
+            for index, batch_query in _BATCH_QUERY_RE.findall(prompt):
+                name = self._recognize(prompt, batch_query)
+                answers.append({'index': int(index), 'category': name or 'NO_MATCH', 'confidence': 0.9 if name else 0.0})
+            return json.dumps(answers)
+        if 'RECOGNITION JSON' in prompt:
+            name = self._recognize(prompt, query)
+            return json.dumps({'category': name or 'NO_MATCH', 'confidence': 0.9 if name else 0.0})
+        if 'Rate the accuracy' in prompt:
+            return '0.9'
+        if 'category naming expert' in prompt:
+            return query.title() or 'Product'
+        if 'Research Turkish market prices' in prompt:
+            return _PRICE_RESEARCH_TEXT
+        if 'Generate a complete category specification' in prompt:
+            return _fake_category_spec()
+        return _GROUNDING_TEXT
+
+
+# ---------------------------------------------------------------------------
+# Sahte SerpAPI
+# ---------------------------------------------------------------------------
+
+_SHOPPING_SITES = ('hepsiburada.com', 'trendyol.com', 'n11.com', 'teknosa.com', 'vatanbilgisayar.com')
+
+
+def _synthetic_shopping_results(query, total=150):
+    """Sorgu için deterministik sahte Google Shopping sonuçları üretir."""
+    rng = random.Random(query)
+    query_id = rng.randint(10000, 99999)
+    # "-kılıf" gibi hariç tutma terimleri başlığa yazılmaz
+    name = ' '.join(word for word in query.split() if not word.startswith('-')) or 'Ürün'
+    results = []
+    for i in range(total):
+        price = round(rng.uniform(500, 60000), 2)
+        display = f"₺{price:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+        site = _SHOPPING_SITES[i % len(_SHOPPING_SITES)]
+        results.append({
+            'position': i + 1,
+            'product_id': f'fake-{query_id}-{i}',
+            'title': f'{name} Model {i + 1}',
+            'price': display,
+            'extracted_price': price,
+            'source': site,
+            'link': f'https://www.{site}/urun-p-{100000 + i}',
+            'thumbnail': f'https://via.placeholder.com/150x150?text={i + 1}',
+            'rating': round(rng.uniform(3.5, 5.0), 1),
+            'reviews': rng.randint(0, 5000)
+        })
+    return results
+
+
+class _SerpApiHandler(BaseHTTPRequestHandler):
+    server_version = 'FakeSerpAPI/1.0'
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path != '/search':
+            self._send(404, {'error': 'Not found'})
+            return
+
+        fake = self.server.fake
+        if fake.latency.over_quota():
+            self._send(429, {'error': 'Fake quota exceeded'})
+            return
+        time.sleep(fake.latency.delay())
+        if fake.latency.should_fail():
+            self._send(random.choice(fake.error_statuses), {'error': 'Fake upstream error'})
+            return
+
+        query = parse_qs(parsed.query)
+        q = query.get('q', [''])[0]
+        start = int(query.get('start', ['0'])[0] or 0)
+        num = int(query.get('num', ['50'])[0] or 50)
+
+        results = fake.payload.get('shopping_results') or _synthetic_shopping_results(q)
+        fake.requests += 1
+        body = {
+            'search_metadata': {'status': 'Success', 'fake': True},
+            'search_parameters': {'q': q, 'start': start, 'num': num},
+            'shopping_results': results[start:start + num]
+        }
+        # Gerçek SerpAPI gibi: sonraki sayfa varsa serpapi_pagination.next verilir
+        if start + num < len(results):
+            body['serpapi_pagination'] = {
+                'current': start // num + 1,
+                'next': f'http://{self.headers.get("Host", "localhost")}/search?'
+                        + urlencode({'q': q, 'start': start + num, 'num': num})
+            }
+        self._send(200, body)
+
+    def _send(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeSerpApiServer:
+    """
+    Yerel sahte SerpAPI HTTP sunucusu.
+
+    /search endpoint'i Google Shopping formatında (start/num sayfalamalı)
+    sonuç döndürür.
+
+    Kullanım:
+        server = FakeSerpApiServer(latency=LatencyProfile('uniform:100:300')).start()
+        print(server.url)   # http://127.0.0.1:54321/search
+        server.stop()
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=None, payload=None, error_statuses=(429, 500, 503)):
+        self.latency = latency or LatencyProfile()
+        self.payload = payload or {}
+        self.error_statuses = list(error_statuses)
+        self.requests = 0
+        self.httpd = ThreadingHTTPServer((host, port), _SerpApiHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+        self._thread = None
+
+    @classmethod
+    def from_env(cls, port=0):
+        """FAKE_SERPAPI_* değişkenlerinden sunucu oluşturur."""
+        return cls(
+            port=port,
+            latency=LatencyProfile.from_env('SERPAPI', 'lognormal:400:0.4'),
+            payload=_load_payload(os.getenv('FAKE_SERPAPI_PAYLOAD'))
+        )
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}/search'
+
+    def start(self):
+        """Sunucuyu arka plan thread'inde başlatır."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+_serpapi_server = None
+_serpapi_lock = threading.Lock()
+
+
+def get_fake_serpapi_url():
+    """Süreç içi paylaşımlı sahte SerpAPI sunucusunu (gerekirse başlatıp) URL'sini döndürür."""
+    global _serpapi_server
+    with _serpapi_lock:
+        if _serpapi_server is None:
+            _serpapi_server = FakeSerpApiServer.from_env().start()
+            print(f"🧪 Fake SerpAPI server started: {_serpapi_server.url}")
+        return _serpapi_server.url
+
+
+class _RedisHandler(socketserver.StreamRequestHandler):
+    """RESP2 dizilerini okuyup FakeRedisServer.execute() ile yanıtlar."""
+
+    def handle(self):
+        fake = self.server.fake
+        while True:
+            try:
+                args = self._read_command()
+            except (ValueError, OSError):
+                return
+            if args is None:
+                return
+            delay = fake.latency.delay()
+            if delay:
+                time.sleep(delay)
+            try:
+                reply = fake.execute(args)
+            except FakeUpstreamError as e:
+                reply = e
+            try:
+                self.wfile.write(self._encode(reply))
+            except OSError:
+                return
+
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b'*'):
+            return line.strip().split()
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    @classmethod
+    def _encode(cls, reply):
+        if reply is None:
+            return b'$-1\r\n'
+        if isinstance(reply, FakeUpstreamError):
+            return b'-ERR %s\r\n' % str(reply).encode('utf-8')
+        if isinstance(reply, bool):
+            return b'+OK\r\n' if reply else b'$-1\r\n'
+        if isinstance(reply, int):
+            return b':%d\r\n' % reply
+        if isinstance(reply, str):
+            return b'+%s\r\n' % reply.encode('utf-8')
+        if isinstance(reply, list):
+            return b'*%d\r\n' % len(reply) + b''.join(cls._encode(item) for item in reply)
+        return b'$%d\r\n%s\r\n' % (len(reply), reply)
+
+
+class _ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+
+class FakeRedisServer:
+    """
+    Yerel, bellek içi Redis stand-in'i (RESP2).
+
+    Paylaşımlı önbelleğin (app.cache) kullandığı komutları destekler:
+    PING, GET, MGET, SET (EX/PX/NX/XX), DEL, EXISTS, PTTL, DBSIZE,
+    FLUSHDB/FLUSHALL, SELECT, AUTH. Birden çok worker aynı sunucuya
+    bağlanarak çok node'lu kurulumu taklit eder.
+
+    Kullanım:
+        server = FakeRedisServer().start()
+        print(server.url)   # redis://127.0.0.1:54321/0
+        server.stop()
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=None):
+        self.latency = latency or LatencyProfile()
+        self.commands = 0
+        self._data = {}
+        self._lock = threading.Lock()
+        self.server = _ThreadingTCPServer((host, port), _RedisHandler)
+        self.server.fake = self
+        self._thread = None
+
+    @classmethod
+    def from_env(cls, port=0):
+        """FAKE_REDIS_* değişkenlerinden sunucu oluşturur."""
+        return cls(port=port, latency=LatencyProfile.from_env('REDIS', 'fixed:0'))
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f'redis://{host}:{port}/0'
+
+    def _alive(self, key, now):
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= now:
+            del self._data[key]
+            return None
+        return entry
+
+    def execute(self, args):
+        """Tek bir komutu çalıştırır; yanıt RESP'e _RedisHandler'da kodlanır."""
+        if not args:
+            raise FakeUpstreamError('empty command')
+        if self.latency.should_fail():
+            raise FakeUpstreamError('fake upstream error')
+        command = args[0].decode('utf-8').upper()
+        args = args[1:]
+        now = time.monotonic()
+        with self._lock:
+            self.commands += 1
+            if command == 'PING':
+                return 'PONG'
+            if command in ('SELECT', 'AUTH'):
+                return 'OK'
+            if command == 'GET':
+                entry = self._alive(args[0], now)
+                return entry[0] if entry else None
+            if command == 'MGET':
+                return [(self._alive(key, now) or (None,))[0] for key in args]
+            if command == 'SET':
+                return self._set(args, now)
+            if command == 'DEL':
+                return sum(self._data.pop(key, None) is not None for key in args)
+            if command == 'EXISTS':
+                return sum(self._alive(key, now) is not None for key in args)
+            if command == 'PTTL':
+                entry = self._alive(args[0], now)
+                if entry is None:
+                    return -2
+                return -1 if entry[1] is None else int((entry[1] - now) * 1000)
+            if command == 'DBSIZE':
+                return len(self._data)
+            if command in ('FLUSHDB', 'FLUSHALL'):
+                self._data.clear()
+                return 'OK'
+        raise FakeUpstreamError(f"unknown command '{command}'")
+
+    def _set(self, args, now):
+        key, value = args[0], args[1]
+        options = [arg.decode('utf-8').upper() for arg in args[2:]]
+        expires_at = None
+        for unit, scale in (('EX', 1.0), ('PX', 0.001)):
+            if unit in options:
+                expires_at = now + int(options[options.index(unit) + 1]) * scale
+        exists = self._alive(key, now) is not None
+        if ('NX' in options and exists) or ('XX' in options and not exists):
+            return False
+        self._data[key] = (value, expires_at)
+        return True
+
+    def start(self):
+        """Sunucuyu arka plan thread'inde başlatır."""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+_redis_server = None
+_redis_lock = threading.Lock()
+
+
+def get_fake_redis_url():
+    """Süreç içi paylaşımlı sahte Redis sunucusunu (gerekirse başlatıp) URL'sini döndürür."""
+    global _redis_server
+    with _redis_lock:
+        if _redis_server is None:
+            _redis_server = FakeRedisServer.from_env().start()
+            print(f"🧪 Fake Redis server started: {_redis_server.url}")
+        return _redis_server.url
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fake SerpAPI / Redis server for offline load testing')
+    parser.add_argument('--service', choices=('serpapi', 'redis'), default='serpapi')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=None, help='default: 8090 (serpapi), 6390 (redis)')
+    parser.add_argument('--latency', default=None, help='default: lognormal:400:0.4 (serpapi), fixed:0 (redis)')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--payload', default=None, help='{"shopping_results": [...]} JSON file')
+    args = parser.parse_args(argv)
+
+    if args.service == 'redis':
+        server = FakeRedisServer(
+            host=args.host,
+            port=args.port or 6390,
+            latency=LatencyProfile(args.latency or 'fixed:0', args.error_rate)
+        )
+        print(f"🧪 Fake Redis listening on {server.url}")
+        try:
+            server.server.serve_forever()
+        except KeyboardInterrupt:
+            server.stop()
+        return
+
+    server = FakeSerpApiServer(
+        host=args.host,
+        port=args.port or 8090,
+        latency=LatencyProfile(args.latency or 'lognormal:400:0.4', args.error_rate),
+        payload=_load_payload(args.payload)
+    )
+    print(f"🧪 Fake SerpAPI listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
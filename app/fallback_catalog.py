@@ -0,0 +1,209 @@
+"""
+FindFlow Yedek (Fallback) Ürün Kataloğu
+=======================================
+
+Bu modül, arama sistemi sonuç döndüremediğinde sunulan yedek ürünleri
+fallback_products.json dosyasından yükler ve yükleme anında kategori ve
+fiyata göre indeksler. Bütçe aralığı sorgusu, önceden sıralanmış fiyat
+dizisi üzerinde bisect ile bulunan bir dilimdir; istek başına ürün listesi
+oluşturulmaz.
+
+Kapsam:
+- fallback_products.json'daki elle seçilmiş ürünler (aliases ile eski
+  kategori adları, örn. "Klima" → "Air Conditioner")
+- categories.json'da olup seçilmiş ürünü olmayan kategoriler (AI ile
+  oluşturulanlar dahil): her bütçe bandı için bir arama sayfası önerisi
+- Hiçbirinde olmayan kategoriler: tek bir genel arama önerisi
+
+Katalog, iki dosyadan biri değiştiğinde (mtime) yeniden kurulur.
+
+Ana Sınıflar:
+- FallbackCatalog: Kategori + fiyat indeksli yedek ürünler
+
+Fonksiyonlar:
+- get_fallback_catalog(): Paylaşımlı katalog
+
+Kullanım:
+    products = get_fallback_catalog().lookup('Phone', 10000, 20000)
+"""
+
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from urllib.parse import quote_plus
+
+from .json_codec import load_file
+from .price_parser import parse_budget_band
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PRODUCTS_FILE = os.path.join(ROOT_DIR, 'fallback_products.json')
+CATEGORIES_FILE = os.path.join(ROOT_DIR, 'categories.json')
+
+# Bütçe aralığında ürün yoksa fiyatı aralığa en yakın bu kadar ürün döner
+NEAREST_COUNT = 3
+
+_SITE_LABELS = {
+    'hepsiburada.com': 'Hepsiburada',
+    'trendyol.com': 'Trendyol',
+    'teknosa.com': 'Teknosa',
+    'n11.com': 'N11',
+    'vatanbilgisayar.com': 'Vatan Bilgisayar',
+    'mediamarkt.com.tr': 'MediaMarkt',
+    'gold.com.tr': 'Gold',
+    'itopya.com': 'İtopya'
+}
+
+
+def _price(value):
+    return {'value': value, 'currency': 'TRY', 'display': f'{value:.0f} ₺'}
+
+
+def _prepare(product):
+    """JSON kaydını öneri formatına getirir (fiyat nesnesi ve link alanları)."""
+    product = dict(product)
+    product['price'] = _price(float(product['price']))
+    site = product.get('source_site', '')
+    product.setdefault('link_status', 'fallback')
+    product.setdefault('link_message', f"{_SITE_LABELS.get(site, site)} arama sayfası")
+    return product
+
+
+def _search_product(category, price, query, label):
+    """Seçilmiş ürünü olmayan kategori için arama sayfası önerisi."""
+    return {
+        'title': f'Önerilen {category}' + (f' ({label})' if label else ''),
+        'price': _price(price),
+        'features': ['Kaliteli', 'Güvenilir'],
+        'pros': ['İyi performans'],
+        'cons': ['Sınırlı bilgi'],
+        'match_score': 75,
+        'source_site': 'hepsiburada.com',
+        'product_url': f'https://www.hepsiburada.com/ara?q={quote_plus(query)}',
+        'link_status': 'fallback',
+        'link_message': 'Hepsiburada arama sayfası',
+        'why_recommended': 'Genel öneri - detaylı arama yapılamadı'
+    }
+
+
+def _band_products(category, data):
+    """Kategorinin Türkçe bütçe bantlarından fiyat sıralı arama önerileri."""
+    query = (data.get('synonyms') or [category])[0]
+    products = []
+    for band in (data.get('budget_bands') or {}).get('tr', []):
+        budget_min, budget_max = parse_budget_band(band)
+        if budget_min is None:
+            continue
+        price = (budget_min + budget_max) / 2 if budget_max else budget_min
+        products.append(_search_product(category, price, query, band))
+    return products
+
+
+class FallbackCatalog:
+    """
+    Kategori başına fiyata göre sıralı yedek ürünler.
+
+    Her kategori için (fiyat listesi, ürün listesi) ikilisi tutulur; bütçe
+    sorgusu iki bisect ve bir dilimdir.
+    """
+
+    def __init__(self, products, aliases=None, categories=None):
+        """
+        Args:
+            products (dict): Kategori → ürün kayıtları (price sayısal)
+            aliases (dict): Eski/alternatif kategori adı → katalog adı
+            categories (dict): categories.json içeriği (seçilmiş ürünü olmayan
+                kategoriler bütçe bantlarından doldurulur)
+        """
+        self.aliases = dict(aliases or {})
+        self._index = {}
+        for category, items in products.items():
+            self._add(category, [_prepare(item) for item in items])
+        for category, data in (categories or {}).items():
+            if category not in self._index and isinstance(data, dict):
+                self._add(category, _band_products(category, data))
+
+    def _add(self, category, items):
+        if not items:
+            return
+        items.sort(key=lambda item: item['price']['value'])
+        self._index[category] = ([item['price']['value'] for item in items], items)
+
+    @classmethod
+    def load(cls, products_path=PRODUCTS_FILE, categories_path=CATEGORIES_FILE):
+        """Katalog ve kategori dosyalarından indeksi kurar."""
+        data = _read_json(products_path)
+        return cls(data.get('products', {}), data.get('aliases', {}), _read_json(categories_path))
+
+    def categories(self):
+        return list(self._index)
+
+    def lookup(self, category, budget_min=None, budget_max=None, limit=None):
+        """
+        Bütçe aralığındaki yedek ürünleri eşleşme skoruna göre döndürür.
+
+        Aralıkta ürün yoksa fiyatı aralığa en yakın NEAREST_COUNT ürün döner;
+        kategori hiç bilinmiyorsa tek bir genel arama önerisi üretilir.
+
+        Args:
+            category (str): Kategori adı (alias olabilir)
+            budget_min (float): Alt sınır (None: sınırsız)
+            budget_max (float): Üst sınır (None: sınırsız)
+            limit (int): En fazla ürün sayısı
+
+        Returns:
+            list: Öneri sözlüklerinin sığ kopyaları (çağıran değiştirebilir)
+        """
+        entry = self._index.get(self.aliases.get(category, category))
+        if entry is None:
+            return [_search_product(category, budget_min or 1000, category.lower(), None)]
+
+        prices, items = entry
+        low = bisect_left(prices, budget_min) if budget_min else 0
+        high = bisect_right(prices, budget_max) if budget_max else len(prices)
+        if low < high:
+            selected = items[low:high]
+        else:
+            # low == high: aralık iki komşu fiyatın arasında (veya dışında) kalıyor
+            window = items[max(0, low - NEAREST_COUNT):low + NEAREST_COUNT]
+            target = budget_min or budget_max
+            selected = sorted(window, key=lambda item: abs(item['price']['value'] - target))[:NEAREST_COUNT]
+
+        selected = sorted(selected, key=lambda item: -item.get('match_score', 0))
+        return [dict(item) for item in selected[:limit]]
+
+
+def _read_json(path):
+    try:
+        return load_file(path)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Yedek katalog dosyası okunamadı ({os.path.basename(path)}): {e}")
+        return {}
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+_catalog = None
+_catalog_key = None
+_catalog_lock = threading.Lock()
+
+
+def get_fallback_catalog(products_path=PRODUCTS_FILE, categories_path=CATEGORIES_FILE):
+    """
+    Paylaşımlı yedek kataloğu döndürür.
+
+    fallback_products.json veya categories.json değiştiğinde yeniden kurulur;
+    AI ile oluşturulan kategoriler kaydedildiği anda kapsama girer.
+    """
+    global _catalog, _catalog_key
+    key = (_mtime(products_path), _mtime(categories_path))
+    with _catalog_lock:
+        if _catalog is None or key != _catalog_key:
+            _catalog = FallbackCatalog.load(products_path, categories_path)
+            _catalog_key = key
+            print(f"📚 Yedek katalog yüklendi: {len(_catalog.categories())} kategori")
+        return _catalog
@@ -0,0 +1,195 @@
+"""
+FindFlow Gemini Token ve Maliyet Muhasebesi
+===========================================
+
+Bu modül, her Gemini çağrısının prompt/yanıt token sayısını, süresini,
+deneme sayısını ve tahmini maliyetini çağrı noktası (call site) bazında
+kaydeder ve prompt bütçelerini uygular.
+
+Çağrı noktaları ve varsayılan prompt bütçeleri (token):
+- category_recognition: 1500  (_build_category_context, top-K aday)
+- category_recognition_structured: 1500 (kategori + güven tek JSON çağrısında)
+- category_recognition_batch: 4000 (toplu tespit, grup başına bir çağrı)
+- recognition_confidence: 200
+- category_naming: 400
+- category_specs: 6000        (_get_category_examples JSON örnekleri)
+- price_research: 400
+- grounding: 800              (tercih JSON'u)
+
+Bütçe aşılırsa çağrı noktası, bağlamı kademeli olarak küçülten
+fit_prompt() ile prompt'u yeniden oluşturur (örn. indent'li JSON → kompakt
+JSON → tek örnek). Kırpma ve bütçe aşımları metriklere yazılır; böylece
+büyüyen prompt'lar gecikmeyi bozmadan önce /metrics'te görünür.
+
+Yapılandırma:
+- GEMINI_PROMPT_BUDGETS="category_specs=4000,grounding=600" (0 = sınırsız)
+- GEMINI_PRICE_INPUT_PER_M / GEMINI_PRICE_OUTPUT_PER_M (USD / 1M token)
+
+Fonksiyonlar:
+- estimate_tokens(): Çağrı öncesi token tahmini
+- prompt_budget(): Çağrı noktasının bütçesi
+- fit_prompt(): Bütçeye sığana kadar bağlamı küçülterek prompt üretir
+- record_call(): Tamamlanan çağrıyı kaydeder (generate_with_retry çağırır)
+
+Kullanım:
+    template = f"... KATEGORİLER:\n{CONTEXT_SLOT}\n..."
+    prompt = fit_prompt('category_recognition',
+                        lambda level: template.replace(CONTEXT_SLOT, build_context(level)),
+                        [3, 1, 0])
+    response = generate_with_retry(model, prompt, call_site='category_recognition')
+"""
+
+import os
+import threading
+
+from .telemetry import REGISTRY
+
+DEFAULT_BUDGETS = {
+    'category_recognition': 1500,
+    'category_recognition_structured': 1500,
+    'category_recognition_batch': 4000,
+    'recognition_confidence': 200,
+    'category_naming': 400,
+    'category_specs': 6000,
+    'price_research': 400,
+    'grounding': 800,
+}
+
+# gemini-1.5-flash liste fiyatı (USD / 1M token, ≤128k bağlam)
+DEFAULT_PRICE_INPUT_PER_M = 0.075
+DEFAULT_PRICE_OUTPUT_PER_M = 0.30
+
+# Prompt şablonlarında bütçeye göre doldurulan bağlamın yer tutucusu
+CONTEXT_SLOT = '\x00CONTEXT\x00'
+
+# Bu süreyi aşan çağrılar logda işaretlenir
+SLOW_CALL_SECONDS = 5.0
+
+TOKEN_BUCKETS = (50, 100, 200, 400, 800, 1500, 3000, 6000, 12000, 25000)
+
+PROMPT_TOKENS = REGISTRY.histogram(
+    'findflow_gemini_prompt_tokens', 'Prompt tokens per Gemini call', ('call_site',), TOKEN_BUCKETS)
+RESPONSE_TOKENS = REGISTRY.histogram(
+    'findflow_gemini_response_tokens', 'Response tokens per Gemini call', ('call_site',), TOKEN_BUCKETS)
+CALL_DURATION = REGISTRY.histogram(
+    'findflow_gemini_call_duration_seconds', 'Gemini call duration including retries', ('call_site',))
+CALLS = REGISTRY.counter(
+    'findflow_gemini_calls_total', 'Gemini calls by call site and result', ('call_site', 'result'))
+CALL_RETRIES = REGISTRY.counter(
+    'findflow_gemini_call_retries_total', 'Gemini retries by call site', ('call_site',))
+COST = REGISTRY.counter(
+    'findflow_gemini_cost_usd_total', 'Estimated Gemini cost in USD', ('call_site',))
+OVER_BUDGET = REGISTRY.counter(
+    'findflow_gemini_prompt_over_budget_total', 'Prompts sent over budget after trimming', ('call_site',))
+TRIMMED = REGISTRY.counter(
+    'findflow_gemini_prompt_trimmed_total', 'Prompts whose context was trimmed to fit the budget', ('call_site', 'level'))
+
+
+def estimate_tokens(text):
+    """Çağrı öncesi kaba token tahmini (~4 karakter/token)."""
+    return (len(text) + 3) // 4 if text else 0
+
+
+def configured_budgets():
+    """Varsayılan bütçeler + GEMINI_PROMPT_BUDGETS (çağrı_noktası=token,...); hatalı girdiler atlanır."""
+    budgets = dict(DEFAULT_BUDGETS)
+    for item in os.getenv('GEMINI_PROMPT_BUDGETS', '').split(','):
+        name, _, value = item.partition('=')
+        if not name.strip() or not value.strip():
+            continue
+        try:
+            budgets[name.strip()] = int(value)
+        except ValueError:
+            print(f"⚠️ GEMINI_PROMPT_BUDGETS: geçersiz girdi atlandı: '{item.strip()}'")
+    return budgets
+
+
+_budgets = None
+_budgets_lock = threading.Lock()
+
+
+def prompt_budget(call_site):
+    """Çağrı noktasının prompt bütçesi (token), sınırsızsa None."""
+    global _budgets
+    # Ortam değişkeni ilk kullanımda bir kez ayrıştırılır (get_governor gibi)
+    with _budgets_lock:
+        if _budgets is None:
+            _budgets = configured_budgets()
+        budgets = _budgets
+    return budgets.get(call_site) or None
+
+
+def fit_prompt(call_site, build, levels):
+    """
+    Prompt'u bütçeye sığana kadar sırayla daha küçük bağlam seviyeleriyle üretir.
+
+    Args:
+        call_site (str): Çağrı noktası adı
+        build (Callable): Seviye alıp prompt döndüren fonksiyon
+        levels (list): Büyükten küçüğe bağlam seviyeleri (ilk seviye tam bağlam)
+
+    Returns:
+        str: Bütçeye sığan ilk prompt, hiçbiri sığmazsa en küçük seviye
+    """
+    budget = prompt_budget(call_site)
+    prompt = build(levels[0])
+    if budget is None or estimate_tokens(prompt) <= budget:
+        return prompt
+
+    full_tokens = tokens = estimate_tokens(prompt)
+    level = levels[0]
+    for level in levels[1:]:
+        prompt = build(level)
+        tokens = estimate_tokens(prompt)
+        if tokens <= budget:
+            break
+    TRIMMED.inc(call_site=call_site, level=str(level))
+    print(f"✂️ Prompt kırpıldı [{call_site}]: ≈{full_tokens} → ≈{tokens} token (bütçe {budget}, seviye {level})")
+    return prompt
+
+
+def _price(name, default):
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def record_call(call_site, prompt, response, duration, attempts, ok):
+    """
+    Tamamlanan bir Gemini çağrısını (tüm denemeleriyle) kaydeder.
+
+    Gerçek token sayıları response.usage_metadata'dan okunur; yoksa
+    karakter tabanlı tahmin kullanılır.
+    """
+    usage = getattr(response, 'usage_metadata', None) if response is not None else None
+    prompt_tokens = getattr(usage, 'prompt_token_count', None) or estimate_tokens(prompt)
+    response_tokens = getattr(usage, 'candidates_token_count', None)
+    if response_tokens is None:
+        try:
+            response_tokens = estimate_tokens(response.text) if ok else 0
+        except Exception:
+            response_tokens = 0
+
+    PROMPT_TOKENS.observe(prompt_tokens, call_site=call_site)
+    RESPONSE_TOKENS.observe(response_tokens, call_site=call_site)
+    CALL_DURATION.observe(duration, call_site=call_site)
+    CALLS.inc(call_site=call_site, result='success' if ok else 'failure')
+    if attempts > 1:
+        CALL_RETRIES.inc(attempts - 1, call_site=call_site)
+
+    # Başarısız denemeler de prompt token'ı tüketir
+    cost = (prompt_tokens * attempts * _price('GEMINI_PRICE_INPUT_PER_M', DEFAULT_PRICE_INPUT_PER_M)
+            + response_tokens * _price('GEMINI_PRICE_OUTPUT_PER_M', DEFAULT_PRICE_OUTPUT_PER_M)) / 1_000_000
+    COST.inc(cost, call_site=call_site)
+
+    budget = prompt_budget(call_site)
+    over_budget = budget is not None and prompt_tokens > budget
+    if over_budget:
+        OVER_BUDGET.inc(call_site=call_site)
+
+    flag = ' ⚠️ bütçe aşıldı' if over_budget else ''
+    flag += ' 🐢 yavaş' if duration >= SLOW_CALL_SECONDS else ''
+    print(f"🧮 Gemini [{call_site}]: prompt {prompt_tokens} tok"
+          f"{f' / {budget}' if budget else ''}, yanıt {response_tokens} tok, "
+          f"{duration * 1000:.0f} ms, {attempts} deneme, ≈${cost:.6f}{flag}")
@@ -0,0 +1,230 @@
+"""
+FindFlow Gemini Hedge İstekleri
+===============================
+
+Bu modül, gecikmeye duyarlı Gemini çağrı noktalarında kuyruk gecikmesini
+(p99) azaltmak için "hedged request" politikasını içerir: ilk deneme,
+çağrı noktasının geçmiş gecikmelerinin yapılandırılmış yüzdeliği kadar
+sürede yanıt vermezse aynı istek ikinci kez gönderilir ve önce biten
+kullanılır. Henüz başlamamış kopya iptal edilir; başlamış olan (Gemini
+SDK çağrısı kesilemez) sonuçlanana kadar slotunu tutar ve sonucu atılır.
+
+Hedge çağrısı ek yük oluşturduğu için sınırlıdır:
+- Upstream governor'ından beklemeden slot alabilirse gönderilir
+  (try_acquire); kuyruğun önüne geçmez, kota dolmuşsa gönderilmez
+- Gemini devre kesicisi kapalı değilse gönderilmez
+- Hedge bütçesi: her birincil çağrı max_ratio kadar kredi biriktirir,
+  her hedge bir kredi harcar (varsayılan: çağrıların en fazla %10'u)
+- Yeterli örnek (min_samples) toplanana kadar hedge yapılmaz
+
+Gecikme örnekleri yalnızca birincil çağrılardan toplanır; hedge kazansa
+bile birincil çağrının süresi tamamlandığında kaydedilir.
+
+Varsayılan olarak hedge yapılan çağrı noktaları (yüzdelik):
+- grounding: 95
+- category_recognition_structured: 95
+- category_recognition: 95
+
+Yapılandırma:
+- GEMINI_HEDGING="grounding=90,category_specs=99" (0 = kapalı)
+- GEMINI_HEDGE_MAX_RATIO=0.1 (hedge/çağrı oranı üst sınırı)
+
+Ana Sınıflar:
+- HedgePolicy: Çağrı noktası için gecikme örnekleri, bütçe ve yarış
+
+Fonksiyonlar:
+- get_hedge_policy(): Çağrı noktasının politikası (hedge kapalıysa None)
+
+Kullanım:
+    policy = get_hedge_policy('grounding')
+    with governor.slot():
+        response = policy.call(lambda: model.generate_content(prompt), governor, breaker)
+"""
+
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .circuit_breaker import CLOSED
+from .telemetry import REGISTRY
+
+DEFAULT_HEDGING = {
+    'grounding': 95,
+    'category_recognition_structured': 95,
+    'category_recognition': 95,
+}
+DEFAULT_MAX_RATIO = 0.1
+MIN_SAMPLES = 20
+SAMPLE_WINDOW = 200
+MIN_DELAY_SECONDS = 0.05
+MAX_CREDITS = 10.0
+EXECUTOR_WORKERS = 32
+
+HEDGES = REGISTRY.counter(
+    'findflow_gemini_hedges_total', 'Hedged Gemini attempts by call site and result', ('call_site', 'result'))
+
+_executor = ThreadPoolExecutor(max_workers=EXECUTOR_WORKERS, thread_name_prefix='gemini-hedge')
+
+
+class HedgePolicy:
+    """
+    Tek bir çağrı noktası için hedge politikası (thread-safe).
+    """
+
+    def __init__(self, call_site, percentile=95, max_ratio=DEFAULT_MAX_RATIO, min_samples=MIN_SAMPLES):
+        """
+        Args:
+            call_site (str): Çağrı noktası adı (metrik etiketi)
+            percentile (float): Hedge gecikmesi için yüzdelik (örn. 95)
+            max_ratio (float): Birincil çağrı başına biriken hedge kredisi
+            min_samples (int): Hedge'den önce gereken gecikme örneği
+        """
+        self.call_site = call_site
+        self.percentile = percentile
+        self.max_ratio = max_ratio
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=SAMPLE_WINDOW)
+        self._credits = 1.0
+        self._lock = threading.Lock()
+
+    def observe(self, duration):
+        """Birincil çağrının süresini (saniye) kaydeder."""
+        with self._lock:
+            self._samples.append(duration)
+
+    def delay(self):
+        """Hedge gönderilmeden önce beklenecek süre; yeterli örnek yoksa None."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return max(MIN_DELAY_SECONDS, ordered[index])
+
+    def _earn(self):
+        with self._lock:
+            self._credits = min(MAX_CREDITS, self._credits + self.max_ratio)
+
+    def _spend(self):
+        with self._lock:
+            if self._credits < 1:
+                return False
+            self._credits -= 1
+            return True
+
+    def _start_hedge(self, governor, breaker):
+        """Hedge gönderilebilir mi; gönderilecekse governor slotu alınmış olur."""
+        if breaker.state != CLOSED:
+            HEDGES.inc(call_site=self.call_site, result='skipped_circuit')
+            return False
+        if not self._spend():
+            HEDGES.inc(call_site=self.call_site, result='skipped_budget')
+            return False
+        if not governor.try_acquire():
+            with self._lock:
+                self._credits += 1
+            HEDGES.inc(call_site=self.call_site, result='skipped_slot')
+            return False
+        return True
+
+    def call(self, fn, governor, breaker):
+        """
+        fn()'yi çalıştırır; gecikirse ikinci kopyayı gönderip önce bitenin sonucunu döndürür.
+
+        Çağıran birincil deneme için governor slotunu zaten tutmalıdır; hedge
+        kopyası kendi slotunu alır. Kaybeden kopya bitene kadar slotlardan
+        biri açık kalır, böylece eşzamanlılık sınırı gerçek yükü yansıtır.
+
+        Args:
+            fn (Callable): Upstream çağrısı (örn. model.generate_content)
+            governor (UpstreamGovernor): Upstream governor'ı
+            breaker (CircuitBreaker): Upstream devre kesicisi
+
+        Returns:
+            Any: İlk başarılı kopyanın sonucu
+
+        Raises:
+            Exception: İki kopya da başarısız olursa birincil çağrının hatası
+        """
+        self._earn()
+        started = time.perf_counter()
+        primary = _executor.submit(contextvars.copy_context().run, fn)
+
+        def observe_primary(future):
+            if not future.cancelled() and future.exception() is None:
+                self.observe(time.perf_counter() - started)
+
+        primary.add_done_callback(observe_primary)
+
+        delay = self.delay()
+        done, _ = wait([primary], timeout=delay)
+        if done or delay is None or not self._start_hedge(governor, breaker):
+            return primary.result()
+
+        HEDGES.inc(call_site=self.call_site, result='sent')
+        print(f"🪁 Gemini hedge isteği [{self.call_site}]: {delay * 1000:.0f} ms içinde yanıt yok")
+        hedge = _executor.submit(contextvars.copy_context().run, fn)
+
+        # Hedge slotu, iki kopyadan sonuncusu bittiğinde bırakılır
+        pending = [2]
+        pending_lock = threading.Lock()
+
+        def release_when_both_done(_future):
+            with pending_lock:
+                pending[0] -= 1
+                last = pending[0] == 0
+            if last:
+                governor.release()
+
+        primary.add_done_callback(release_when_both_done)
+        hedge.add_done_callback(release_when_both_done)
+
+        futures = {primary, hedge}
+        while futures:
+            done, futures = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                if not future.cancelled() and future.exception() is None:
+                    for loser in futures:
+                        loser.cancel()
+                    HEDGES.inc(call_site=self.call_site, result='won' if future is hedge else 'lost')
+                    return future.result()
+        HEDGES.inc(call_site=self.call_site, result='failed')
+        return primary.result()
+
+
+def configured_hedging():
+    """Varsayılan çağrı noktaları + GEMINI_HEDGING ortam değişkeni (çağrı_noktası=yüzdelik,...)."""
+    hedging = dict(DEFAULT_HEDGING)
+    for item in os.getenv('GEMINI_HEDGING', '').split(','):
+        name, _, value = item.partition('=')
+        if name.strip() and value.strip():
+            hedging[name.strip()] = float(value)
+    return {name: percentile for name, percentile in hedging.items() if percentile}
+
+
+_policies = {}
+_policies_lock = threading.Lock()
+
+
+def get_hedge_policy(call_site):
+    """
+    Çağrı noktasının paylaşımlı hedge politikasını döndürür.
+
+    Args:
+        call_site (str): generate_with_retry'a verilen çağrı noktası adı
+
+    Returns:
+        HedgePolicy or None: Çağrı noktası için hedge kapalıysa None
+    """
+    with _policies_lock:
+        if call_site not in _policies:
+            percentile = configured_hedging().get(call_site)
+            _policies[call_site] = HedgePolicy(
+                call_site,
+                percentile,
+                max_ratio=float(os.getenv('GEMINI_HEDGE_MAX_RATIO', DEFAULT_MAX_RATIO))
+            ) if percentile else None
+        return _policies[call_site]
@@ -0,0 +1,263 @@
+"""
+FindFlow JSON Kodlayıcı
+=======================
+
+Bu modül, yanıtlar, katalog dosyaları ve log çıktıları için tek bir JSON
+kodlama katmanı sağlar. orjson kuruluysa kullanılır (yanıtları doğrudan
+UTF-8 bytes olarak üretir); değilse standart json modülüne düşülür. İki
+backend de aynı çıktıyı üretir: kompakt ayırıcılar, ensure_ascii=False,
+anahtarlar ekleme sırasıyla (Flask'ın varsayılan sort_keys'i kullanılmaz).
+
+Sık dönen sabit yanıt parçaları (soru payload'ları, kategori listesi)
+PreencodedDict olarak bir kez kodlanır; sonraki isteklerde bytes'ı doğrudan
+yazılır. Sözlük değiştirildiğinde önbelleklenmiş bytes düşürülür,
+with_fields() ise ek alanları (örn. progress) bytes'a ekleyerek yeniden
+kodlamadan yeni payload üretir.
+
+Yapılandırma:
+- FINDFLOW_JSON_BACKEND=auto|orjson|stdlib (varsayılan auto)
+
+Ana Sınıflar:
+- PreencodedDict: Kodlanmış bytes'ını önbellekleyen sözlük
+- FastJSONProvider: Flask JSON sağlayıcısı (jsonify ve dict dönen view'lar)
+
+Fonksiyonlar:
+- dumps() / dumps_text(): bytes / str kodlama (indent=True: 2 boşluk)
+- loads(), load_file(), dump_file(): Okuma ve dosya G/Ç
+- with_fields(): Payload'a bytes düzeyinde alan ekleme
+- cached_file_payload(): mtime'a göre önbelleklenen dosya payload'ı
+- install(app): FastJSONProvider'ı Flask uygulamasına bağlar
+
+Kullanım:
+    from .json_codec import dumps_text, load_file
+
+    print(f"🎯 Preferences: {dumps_text(preferences, indent=True)}")
+    categories = load_file('categories.json')
+"""
+
+import decimal
+import json
+import os
+import threading
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - opsiyonel bağımlılık
+    orjson = None
+
+
+def _select_backend():
+    requested = os.getenv('FINDFLOW_JSON_BACKEND', 'auto').strip().lower()
+    if requested == 'stdlib' or orjson is None:
+        if requested == 'orjson':
+            print("⚠️ FINDFLOW_JSON_BACKEND=orjson ama orjson kurulu değil, standart json kullanılıyor")
+        return 'stdlib'
+    return 'orjson'
+
+
+BACKEND = _select_backend()
+
+
+def _default(obj):
+    """İki backend'in de yerleşik olarak kodlamadığı tipler."""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+    _ORJSON_INDENT = _ORJSON_OPTIONS | orjson.OPT_INDENT_2
+
+
+def _stdlib_dumps(obj, indent):
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2, default=_default).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=_default).encode('utf-8')
+
+
+def dumps(obj, indent=False):
+    """
+    Nesneyi UTF-8 JSON bytes'ına kodlar.
+
+    Args:
+        obj: Kodlanacak nesne
+        indent (bool): True ise 2 boşluk girintili çıktı
+
+    Returns:
+        bytes: JSON
+    """
+    if not indent and type(obj) is PreencodedDict:
+        return obj.encoded()
+    if BACKEND == 'orjson':
+        try:
+            return orjson.dumps(obj, default=_default, option=_ORJSON_INDENT if indent else _ORJSON_OPTIONS)
+        except TypeError:
+            # 64 bit'e sığmayan tamsayılar vb. standart json ile kodlanır
+            pass
+    return _stdlib_dumps(obj, indent)
+
+
+def dumps_text(obj, indent=False):
+    """dumps() çıktısını str olarak döndürür (log ve prompt metinleri için)."""
+    return dumps(obj, indent).decode('utf-8')
+
+
+def loads(data):
+    """JSON metnini (str veya bytes) çözer; hata ValueError alt sınıfıdır."""
+    if BACKEND == 'orjson':
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_file(path):
+    """JSON dosyasını okur ve çözer."""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def dump_file(obj, path, indent=True):
+    """Nesneyi JSON dosyasına yazar (varsayılan 2 boşluk girintili, UTF-8)."""
+    data = dumps(obj, indent)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+class PreencodedDict(dict):
+    """
+    Kodlanmış JSON bytes'ını önbellekleyen sözlük.
+
+    İlk encoded() çağrısında kodlanır; sözlüğü değiştiren her işlem önbelleği
+    düşürür. Sabit payload'lar (soru, kategori listesi) böylece istek başına
+    yeniden kodlanmaz. İç içe değerler değiştirilmemelidir; değiştirilecekse
+    önce kopyalanmalıdır.
+    """
+
+    __slots__ = ('_encoded',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._encoded = None
+
+    def encoded(self):
+        if self._encoded is None:
+            self._encoded = dumps(dict(self))
+        return self._encoded
+
+    def __setitem__(self, key, value):
+        self._encoded = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._encoded = None
+        super().__delitem__(key)
+
+    def update(self, *args, **kwargs):
+        self._encoded = None
+        super().update(*args, **kwargs)
+
+    def setdefault(self, key, default=None):
+        self._encoded = None
+        return super().setdefault(key, default)
+
+    def pop(self, *args):
+        self._encoded = None
+        return super().pop(*args)
+
+    def popitem(self):
+        self._encoded = None
+        return super().popitem()
+
+    def clear(self):
+        self._encoded = None
+        super().clear()
+
+    def __ior__(self, other):
+        self._encoded = None
+        return super().__ior__(other)
+
+    def copy(self):
+        return PreencodedDict(self)
+
+
+def with_fields(payload, **fields):
+    """
+    Payload'a alan ekleyip yeni bir PreencodedDict döndürür.
+
+    payload bir PreencodedDict ise ve eklenen alanlar yeni anahtarlarsa,
+    önbelleklenmiş bytes'ın sonuna yalnızca yeni alanlar kodlanarak eklenir.
+    Orijinal payload (paylaşılan önbellek girdisi) değiştirilmez.
+
+    Args:
+        payload (dict): Temel payload
+        **fields: Eklenecek alanlar
+
+    Returns:
+        PreencodedDict: Temel payload + alanlar
+    """
+    result = PreencodedDict(payload, **fields)
+    if type(payload) is PreencodedDict and payload and fields and not any(key in payload for key in fields):
+        result._encoded = payload.encoded()[:-1] + b',' + dumps(fields)[1:]
+    return result
+
+
+_file_payloads = {}
+_file_payloads_lock = threading.Lock()
+
+
+def cached_file_payload(path):
+    """
+    JSON dosyasını PreencodedDict olarak döndürür; dosya değişene (mtime)
+    kadar aynı nesne ve kodlanmış bytes'ı kullanılır.
+
+    Dönen nesne paylaşılır; çağıran değiştirmemelidir.
+    """
+    path = os.path.abspath(path)
+    mtime = os.path.getmtime(path)
+    with _file_payloads_lock:
+        entry = _file_payloads.get(path)
+        if entry is None or entry[0] != mtime:
+            entry = (mtime, PreencodedDict(load_file(path)))
+            _file_payloads[path] = entry
+        return entry[1]
+
+
+try:
+    from flask.json.provider import JSONProvider
+except ImportError:  # pragma: no cover - Flask < 2.2
+    JSONProvider = None
+
+
+if JSONProvider is not None:
+    class FastJSONProvider(JSONProvider):
+        """
+        jsonify() ve dict/list dönen view'lar için Flask JSON sağlayıcısı.
+
+        Yanıt gövdesi dumps() ile doğrudan bytes olarak üretilir;
+        PreencodedDict'lerin önbelleklenmiş bytes'ı aynen yazılır.
+        """
+
+        mimetype = 'application/json'
+
+        def dumps(self, obj, **kwargs):
+            return dumps_text(obj, indent=bool(kwargs.get('indent')))
+
+        def loads(self, s, **kwargs):
+            return loads(s)
+
+        def response(self, *args, **kwargs):
+            obj = self._prepare_response_obj(args, kwargs)
+            return self._app.response_class(dumps(obj), mimetype=self.mimetype)
+
+
+def install(app):
+    """FastJSONProvider'ı uygulamaya bağlar (Flask ≥ 2.2)."""
+    if JSONProvider is None:
+        print("⚠️ Flask JSON provider API'si yok, varsayılan jsonify kullanılıyor")
+        return
+    app.json = FastJSONProvider(app)
+    print(f"⚡ JSON backend: {BACKEND}")
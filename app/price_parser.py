@@ -0,0 +1,132 @@
+"""
+FindFlow Fiyat Ayrıştırma Modülü
+================================
+
+Bu modül, SerpAPI fiyat metinlerini ve kategori bütçe bantlarını tek bir
+yerde, önceden derlenmiş desenlerle ayrıştırır.
+
+Desteklenen formatlar:
+- Türkçe: "1.250,99 ₺", "12.499,00 TL", "₺899,90"
+- İngilizce: "₺1,250.99", "$1,299.99", "TRY 3450.00"
+- Kısaltma: "2.5k₺", "40k₺+"
+- Bantlar: "15-25k₺", "50k₺+", "3.000-8.000₺", "2.000 - 7.000 ₺", "$130-330"
+
+Fonksiyonlar:
+- parse_number(): Tek bir sayı token'ını float'a çevirir
+- parse_price(): Fiyat metninden sayısal değeri çıkarır
+- parse_budget_band(): Bütçe bandını (min, max) aralığına çevirir (LRU önbellekli)
+
+Kullanım:
+    from app.price_parser import parse_price, parse_budget_band
+
+    parse_price("1.250,99 ₺")        # 1250.99
+    parse_budget_band("15-25k₺")     # (15000, 25000)
+"""
+
+import re
+from functools import lru_cache
+
+# Bir sayı: rakamla başlar/biter, arada binlik/ondalık ayırıcılar olabilir.
+# Ardından gelen 'k' (bin) kısaltması yalnızca harf takip etmiyorsa sayılır.
+_NUMBER_RE = re.compile(r'(\d(?:[\d.,\u00a0\u202f]*\d)?)\s*([kK](?![a-zA-Z]))?')
+_SPACES_RE = re.compile(r'[\u00a0\u202f]')
+
+
+def parse_number(token):
+    """
+    Tek bir sayı token'ını binlik/ondalık ayırıcıları çözerek float'a çevirir.
+
+    Kurallar:
+    - Hem '.' hem ',' varsa sondaki ayırıcı ondalıktır ("1.250,99", "1,250.99")
+    - Aynı ayırıcı birden fazla geçiyorsa binliktir ("1.250.000")
+    - Tek ayırıcıdan sonra tam 3 rakam geliyorsa binliktir ("15.000", "1,250")
+    - Aksi halde ondalıktır ("2.5", "899,90")
+
+    Args:
+        token (str): Sayı metni (örn: "1.250,99")
+
+    Returns:
+        float: Sayısal değer
+    """
+    token = _SPACES_RE.sub('', token)
+    last_dot = token.rfind('.')
+    last_comma = token.rfind(',')
+
+    if last_dot >= 0 and last_comma >= 0:
+        decimal = '.' if last_dot > last_comma else ','
+        thousands = ',' if decimal == '.' else '.'
+        return float(token.replace(thousands, '').replace(decimal, '.'))
+
+    separator = '.' if last_dot >= 0 else ',' if last_comma >= 0 else None
+    if separator is None:
+        return float(token)
+
+    if token.count(separator) > 1 or len(token) - token.rfind(separator) - 1 == 3:
+        return float(token.replace(separator, ''))
+    return float(token.replace(separator, '.'))
+
+
+def _scan(text):
+    """Metindeki (sayı, 'k' var mı) çiftlerini sırayla döndürür."""
+    return [(parse_number(number), bool(k)) for number, k in _NUMBER_RE.findall(text)]
+
+
+def parse_price(price_str):
+    """
+    Fiyat metninden sayısal değeri çıkarır.
+
+    Metinde birden fazla sayı varsa en büyüğü fiyat kabul edilir.
+
+    Args:
+        price_str (str): Fiyat metni (örn: "₺12.499,00", "2.5k₺")
+
+    Returns:
+        float: Fiyat değeri, bulunamazsa 0.0
+    """
+    if not price_str:
+        return 0.0
+    values = [value * 1000 if k else value for value, k in _scan(price_str)]
+    return max(values, default=0.0)
+
+
+@lru_cache(maxsize=512)
+def parse_budget_band(budget_band):
+    """
+    Bütçe bandını (min, max) aralığına çevirir.
+
+    Bantlar kategori tanımlarından geldiği için sürekli tekrar eder; sonuçlar
+    LRU önbellekte tutulur.
+
+    Kurallar:
+    - "15-25k₺": 'k' iki uca da uygulanır → (15000, 25000)
+    - "500-1k₺": alt uç üst uçtan büyükse 'k' yalnızca üst uca uygulanır → (500, 1000)
+    - "50k₺+" / "80.000₺+": açık uçlu bant → (50000, 100000)
+    - "40k₺": tek değer üst sınırdır → (None, 40000)
+
+    Args:
+        budget_band (str): Bütçe bandı metni
+
+    Returns:
+        tuple: (min, max) - bulunamayan uçlar None
+    """
+    if not budget_band:
+        return None, None
+
+    tokens = _scan(budget_band)
+
+    if len(tokens) >= 2:
+        (low, low_k), (high, high_k) = tokens[0], tokens[1]
+        if low_k or (high_k and low <= high):
+            low *= 1000
+        if high_k:
+            high *= 1000
+        return int(low), int(high)
+
+    if tokens:
+        value, k = tokens[0]
+        value = int(value * 1000 if k else value)
+        if '+' in budget_band:
+            return value, value * 2
+        return None, value
+
+    return None, None
@@ -0,0 +1,242 @@
+"""
+FindFlow İstek Bazlı Profil Modülü
+==================================
+
+Bu modül, tek bir yavaş isteğin (örn. çok spec'li, AI ile oluşturulmuş bir
+kategori) profilini, tüm trafiği profillemeden çıkarmak için isteğe bağlı
+bir profil kancası içerir.
+
+Profil yalnızca FINDFLOW_ADMIN_TOKEN tanımlıysa ve istek bu token'ı
+X-Admin-Token header'ında taşıyorsa açılır. Mod, X-Profile header'ı veya
+?profile= query parametresi ile seçilir:
+- sample: Örnekleme profili; hedef thread'in yığını her interval'de
+  okunur, çıktı collapsed stack formatındadır (flamegraph.pl / speedscope)
+- cprofile: Deterministik cProfile; çıktı pstats dosyasıdır
+  (python -m pstats profile.pstats)
+
+Profiller sınırlı bir halka tamponda (ring buffer) tutulur; en eskiler
+düşer. Profil id'si yanıtta X-Profile-Id header'ı ile döner.
+
+Ana Sınıflar:
+- SamplingProfiler: sys._current_frames() tabanlı örnekleyici
+- ProfileStore: Sınırlı profil halka tamponu
+
+Fonksiyonlar:
+- install(app): /ask ve /search/<query> için profil kancası ile
+  /admin/profiles listeleme/indirme endpoint'lerini ekler
+
+Kullanım:
+    FINDFLOW_ADMIN_TOKEN=secret python run.py
+
+    curl -X POST -H "X-Admin-Token: secret" -H "X-Profile: sample" \\
+         -H "Content-Type: application/json" -d '{...}' localhost:8080/ask
+    curl -H "X-Admin-Token: secret" localhost:8080/admin/profiles
+    curl -H "X-Admin-Token: secret" -O localhost:8080/admin/profiles/<id>
+"""
+
+import cProfile
+import hmac
+import marshal
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from datetime import datetime
+
+PROFILED_ENDPOINTS = ('ask', 'search_category')
+PROFILE_MODES = ('sample', 'cprofile')
+
+
+class SamplingProfiler:
+    """
+    Tek bir thread'i arka plan thread'inden örnekleyen profil aracı.
+
+    Her interval'de hedef thread'in yığını okunur ve
+    "modül:fonksiyon;modül:fonksiyon" anahtarıyla sayılır.
+    """
+
+    def __init__(self, thread_id=None, interval=0.005):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        """Collapsed stack formatında çıktı."""
+        return '\n'.join(f'{stack} {count}' for stack, count in self.stacks.most_common()) + '\n'
+
+
+class ProfileStore:
+    """En fazla `capacity` profil tutan halka tampon."""
+
+    def __init__(self, capacity=20):
+        self.capacity = capacity
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, meta, data):
+        profile_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._profiles[profile_id] = (dict(meta, id=profile_id, size=len(data)), data)
+            while len(self._profiles) > self.capacity:
+                self._profiles.popitem(last=False)
+        return profile_id
+
+    def list(self):
+        with self._lock:
+            return [meta for meta, _ in reversed(self._profiles.values())]
+
+    def get(self, profile_id):
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+
+def _admin_token():
+    return os.getenv('FINDFLOW_ADMIN_TOKEN')
+
+
+def is_admin(request):
+    """İstek geçerli admin token'ı taşıyor mu? Token tanımlı değilse her zaman False."""
+    token = _admin_token()
+    provided = request.headers.get('X-Admin-Token', '')
+    return bool(token) and hmac.compare_digest(provided.encode(), token.encode())
+
+
+def requested_mode(request):
+    """İstekte profil istenmişse modu döndürür (admin değilse None)."""
+    mode = request.headers.get('X-Profile') or request.args.get('profile')
+    if not mode or not is_admin(request):
+        return None
+    if mode in ('1', 'true'):
+        mode = 'sample'
+    return mode if mode in PROFILE_MODES else None
+
+
+def install(app, capacity=None, interval=None):
+    """
+    Flask uygulamasına profil kancasını ve admin endpoint'lerini ekler.
+
+    Args:
+        capacity (int): Halka tampon boyutu (varsayılan: FINDFLOW_PROFILE_CAPACITY veya 20)
+        interval (float): Örnekleme aralığı saniye (varsayılan: FINDFLOW_PROFILE_INTERVAL_MS veya 5 ms)
+    """
+    from flask import Response, abort, g, jsonify, request
+
+    store = ProfileStore(capacity or int(os.getenv('FINDFLOW_PROFILE_CAPACITY', '20')))
+    interval = interval or float(os.getenv('FINDFLOW_PROFILE_INTERVAL_MS', '5')) / 1000
+    app.extensions['findflow_profiles'] = store
+
+    @app.before_request
+    def _profile_begin():
+        if request.endpoint not in PROFILED_ENDPOINTS:
+            return
+        mode = requested_mode(request)
+        if mode is None:
+            return
+        if mode == 'cprofile':
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            profiler = SamplingProfiler(interval=interval).start()
+        g.profile = (mode, profiler, time.perf_counter())
+
+    def _stop(mode, profiler):
+        """Profili durdurur (tekrar çağrılabilir)."""
+        if mode == 'cprofile':
+            profiler.disable()
+        else:
+            profiler.stop()
+
+    @app.after_request
+    def _profile_end(response):
+        # Yalnızca profili kaydeder ve header'ı ekler; g.profile'ı teardown temizler
+        state = g.get('profile')
+        if state is None:
+            return response
+        mode, profiler, start = state
+        _stop(mode, profiler)
+        if mode == 'cprofile':
+            profiler.create_stats()
+            data = marshal.dumps(profiler.stats)
+            samples = None
+        else:
+            data = profiler.collapsed().encode('utf-8')
+            samples = profiler.samples
+
+        profile_id = store.add({
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'endpoint': request.endpoint,
+            'path': request.path,
+            'category': (request.get_json(silent=True) or {}).get('category') if request.is_json else None,
+            'mode': mode,
+            'duration_ms': round((time.perf_counter() - start) * 1000, 1),
+            'samples': samples,
+            'status': response.status_code
+        }, data)
+        print(f"🧭 Profil kaydedildi: {profile_id} ({mode}, {request.path})")
+        g.profile_id = profile_id
+        response.headers['X-Profile-Id'] = profile_id
+        return response
+
+    @app.teardown_request
+    def _profile_teardown(error=None):
+        # after_request atlansa bile (debug modda yayılan view hatası) örnekleyici
+        # thread'i durdurulur ve cProfile kapatılır
+        state = g.pop('profile', None)
+        if state is None:
+            return
+        mode, profiler, _ = state
+        _stop(mode, profiler)
+        if g.pop('profile_id', None) is None:
+            print(f"🧭 Profil kaydedilmedi: {request.path} yanıt üretilmeden bitti ({error})")
+
+    @app.route('/admin/profiles')
+    def list_profiles():
+        """Halka tampondaki profillerin listesi (en yeni önce)."""
+        if not is_admin(request):
+            abort(404)
+        return jsonify({'profiles': store.list(), 'capacity': store.capacity})
+
+    @app.route('/admin/profiles/<profile_id>')
+    def download_profile(profile_id):
+        """Profili indirir: sample → .collapsed, cprofile → .pstats"""
+        if not is_admin(request):
+            abort(404)
+        entry = store.get(profile_id)
+        if entry is None:
+            abort(404)
+        meta, data = entry
+        extension = 'pstats' if meta['mode'] == 'cprofile' else 'collapsed'
+        mimetype = 'application/octet-stream' if meta['mode'] == 'cprofile' else 'text/plain; charset=utf-8'
+        return Response(data, mimetype=mimetype, headers={
+            'Content-Disposition': f'attachment; filename=profile-{profile_id}.{extension}'
+        })
+
+    return app
@@ -0,0 +1,319 @@
+"""
+FindFlow Upstream Hız Sınırlayıcı
+=================================
+
+Bu modül, Gemini ve SerpAPI çağrılarını upstream başına bir "governor"
+üzerinden geçirir:
+
+- Token bucket: dakika başına istek kotası (ve ani yük için burst)
+- Eşzamanlılık sınırı: aynı anda en fazla max_concurrency istek
+- Öncelik kuyruğu: bekleyenler öncelik, sonra geliş sırasına göre alınır;
+  etkileşimli /ask çağrıları arka plan işlerinin (kategori oluşturma,
+  toplu tespit, shopping doldurma sayfaları) önüne geçer
+- 429 geri bildirimi: upstream kota hatası döndürürse bucket boşaltılır ve
+  kısa bir süre (Retry-After veya THROTTLE_PAUSE_SECONDS) tüm çağıranlar
+  için duraklatılır. Yeniden deneme uzun bir sleep yerine kuyruğa geri
+  girer; verim kota tavanında kalır, retry fırtınasına dönüşmez
+
+Kuyrukta bekleme süresi findflow_upstream_queue_wait_seconds
+histogramına, kuyruk derinliği ve aktif istek sayısı gauge'lara yazılır.
+
+Öncelik çağrı bağlamından (contextvars) okunur; varsayılan INTERACTIVE'dir:
+
+    with upstream_priority(BACKGROUND):
+        generate_with_retry(model, prompt, call_site='category_specs')
+
+Varsayılan limitler (gemini-1.5-flash: 1000 istek/dk):
+- gemini: rate=1000/dk, concurrency=16
+- serpapi: rate=300/dk, concurrency=8
+
+Yapılandırma:
+- UPSTREAM_LIMITS="gemini.rate=600,gemini.concurrency=8,serpapi.burst=4"
+  (rate: istek/dk, 0 = sınırsız; burst varsayılanı concurrency)
+- UPSTREAM_QUEUE_TIMEOUT=30 (kuyrukta en fazla bekleme, saniye)
+
+Ana Sınıflar:
+- TokenBucket: Kota hesabı
+- UpstreamGovernor: Kuyruk, eşzamanlılık ve kota
+
+Fonksiyonlar:
+- get_governor(): Upstream için paylaşımlı governor
+- upstream_priority(): Bağlam için öncelik ayarlar
+- is_rate_limit_error(): İstisnanın kota (429) hatası olup olmadığı
+
+Kullanım:
+    with get_governor('serpapi').slot():
+        response = requests.get(url, params=params, timeout=10)
+"""
+
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from .telemetry import REGISTRY
+
+INTERACTIVE = 0
+BACKGROUND = 1
+PRIORITY_NAMES = {INTERACTIVE: 'interactive', BACKGROUND: 'background'}
+
+DEFAULT_LIMITS = {
+    'gemini': {'rate': 1000, 'concurrency': 16},
+    'serpapi': {'rate': 300, 'concurrency': 8},
+}
+DEFAULT_QUEUE_TIMEOUT = 30.0
+THROTTLE_PAUSE_SECONDS = 2.0
+
+QUEUE_WAIT = REGISTRY.histogram(
+    'findflow_upstream_queue_wait_seconds', 'Time spent waiting for an upstream slot', ('upstream', 'priority'),
+    buckets=(0.001, 0.005, 0.025, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0))
+QUEUE_TIMEOUTS = REGISTRY.counter(
+    'findflow_upstream_queue_timeouts_total', 'Calls that gave up waiting for an upstream slot', ('upstream', 'priority'))
+THROTTLED = REGISTRY.counter(
+    'findflow_upstream_throttled_total', 'Rate limit (429) responses that paused an upstream', ('upstream',))
+
+_priority = contextvars.ContextVar('findflow_upstream_priority', default=INTERACTIVE)
+
+
+@contextmanager
+def upstream_priority(level):
+    """Blok içindeki upstream çağrılarının önceliğini ayarlar (INTERACTIVE / BACKGROUND)."""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority():
+    return _priority.get()
+
+
+def is_rate_limit_error(error):
+    """Gemini/SerpAPI istisnası kota aşımı (429 / ResourceExhausted) mı?"""
+    if getattr(error, 'code', None) == 429 or type(error).__name__ == 'ResourceExhausted':
+        return True
+    message = str(error).lower()
+    return '429' in message or 'resource has been exhausted' in message or 'quota' in message
+
+
+class UpstreamQueueTimeout(Exception):
+    """Upstream slotu kuyruk zaman aşımı içinde alınamadı."""
+
+
+class TokenBucket:
+    """
+    Saniyede `rate` token üreten, en fazla `burst` token biriktiren kova.
+
+    Thread-safe değildir; UpstreamGovernor kilidi altında kullanılır.
+    """
+
+    def __init__(self, rate_per_second, burst):
+        self.rate = rate_per_second
+        self.burst = max(1.0, float(burst))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def _refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def wait_time(self, now):
+        """Bir token için beklenecek süre (0: hemen alınabilir)."""
+        if not self.rate:
+            return 0.0
+        if now < self.paused_until:
+            return self.paused_until - now
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now):
+        if self.rate:
+            self._refill(now)
+            self.tokens -= 1
+
+    def pause(self, seconds, now):
+        """Kovayı boşaltır ve `seconds` boyunca token vermez."""
+        self.tokens = 0.0
+        self.updated = max(self.updated, now + seconds)
+        self.paused_until = max(self.paused_until, now + seconds)
+
+
+class UpstreamGovernor:
+    """
+    Tek bir upstream için öncelikli kuyruk + eşzamanlılık sınırı + token bucket.
+
+    Kuyruğun başındaki bekleyen, eşzamanlılık ve token uygun olduğunda alınır;
+    daha düşük öncelikli bir bekleyen, daha yüksek öncelikli olanın önüne
+    geçemez.
+    """
+
+    def __init__(self, name, rate_per_minute, max_concurrency, burst=None, queue_timeout=DEFAULT_QUEUE_TIMEOUT):
+        """
+        Args:
+            name (str): Upstream adı (metrik etiketi)
+            rate_per_minute (float): Dakika başına istek (0: sınırsız)
+            max_concurrency (int): Aynı anda en fazla istek
+            burst (float): Biriken en fazla token (varsayılan: max_concurrency)
+            queue_timeout (float): Kuyrukta en fazla bekleme (saniye)
+        """
+        self.name = name
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.queue_timeout = queue_timeout
+        self.bucket = TokenBucket(rate_per_minute / 60.0, burst or self.max_concurrency)
+        self.active = 0
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+
+    @property
+    def limited(self):
+        """Kota uygulanıyor mu (rate=0 ise yalnızca eşzamanlılık sınırı vardır)."""
+        return bool(self.bucket.rate)
+
+    def queued(self):
+        return len(self._waiters)
+
+    def acquire(self, level=None, timeout=None):
+        """
+        Slot alınana kadar bekler.
+
+        Args:
+            level (int): Öncelik (varsayılan: bağlamdaki öncelik)
+            timeout (float): Bekleme sınırı (varsayılan: queue_timeout)
+
+        Returns:
+            float: Kuyrukta beklenen süre (saniye)
+
+        Raises:
+            UpstreamQueueTimeout: Süre içinde slot alınamadı
+        """
+        level = current_priority() if level is None else level
+        timeout = self.queue_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        with self._cond:
+            entry = [level, next(self._sequence)]
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = None
+                    if self._waiters[0] is entry and self.active < self.max_concurrency:
+                        wait = self.bucket.wait_time(now)
+                        if wait <= 0:
+                            self.bucket.take(now)
+                            self.active += 1
+                            break
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        QUEUE_TIMEOUTS.inc(upstream=self.name, priority=PRIORITY_NAMES.get(level, str(level)))
+                        raise UpstreamQueueTimeout(
+                            f"{self.name}: no slot within {timeout:.1f}s "
+                            f"({self.active} active, {len(self._waiters)} queued)")
+                    self._cond.wait(remaining if wait is None else min(wait, remaining))
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                # Kuyruğun yeni başı kontrol etmeli
+                self._cond.notify_all()
+        waited = time.monotonic() - started
+        QUEUE_WAIT.observe(waited, upstream=self.name, priority=PRIORITY_NAMES.get(level, str(level)))
+        return waited
+
+    def try_acquire(self):
+        """
+        Beklemeden slot almayı dener (örn. hedge çağrıları için).
+
+        Kuyrukta bekleyen varsa, eşzamanlılık dolmuşsa veya token yoksa
+        almaz; kuyruktakilerin önüne geçmez.
+
+        Returns:
+            bool: Slot alındıysa True (release() ile bırakılmalı)
+        """
+        with self._cond:
+            now = time.monotonic()
+            if self._waiters or self.active >= self.max_concurrency or self.bucket.wait_time(now) > 0:
+                return False
+            self.bucket.take(now)
+            self.active += 1
+            return True
+
+    def release(self):
+        with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, level=None, timeout=None):
+        """acquire()/release() bağlam yöneticisi; beklenen süreyi verir."""
+        waited = self.acquire(level, timeout)
+        try:
+            yield waited
+        finally:
+            self.release()
+
+    def report_throttled(self, retry_after=None):
+        """Upstream 429 döndürdü: kova boşaltılır ve tüm çağıranlar için kısa süre duraklatılır."""
+        pause = retry_after if retry_after and retry_after > 0 else THROTTLE_PAUSE_SECONDS
+        THROTTLED.inc(upstream=self.name)
+        with self._cond:
+            self.bucket.pause(pause, time.monotonic())
+            self._cond.notify_all()
+        print(f"🚦 {self.name} kota sınırı: {pause:.1f} sn duraklatıldı")
+
+
+def configured_limits():
+    """Varsayılan limitler + UPSTREAM_LIMITS ortam değişkeni (upstream.alan=değer,...)."""
+    limits = {name: dict(values) for name, values in DEFAULT_LIMITS.items()}
+    for item in os.getenv('UPSTREAM_LIMITS', '').split(','):
+        key, _, value = item.partition('=')
+        name, _, field = key.strip().partition('.')
+        if name and field and value.strip():
+            limits.setdefault(name, {})[field] = float(value)
+    return limits
+
+
+_governors = {}
+_governors_lock = threading.Lock()
+
+
+def get_governor(name):
+    """
+    Upstream için paylaşımlı governor'ı döndürür.
+
+    Args:
+        name (str): 'gemini' veya 'serpapi'
+
+    Returns:
+        UpstreamGovernor: Süreçteki tüm çağıranların paylaştığı governor
+    """
+    with _governors_lock:
+        governor = _governors.get(name)
+        if governor is None:
+            limits = configured_limits().get(name, {})
+            governor = UpstreamGovernor(
+                name,
+                rate_per_minute=limits.get('rate', 0),
+                max_concurrency=limits.get('concurrency', 8),
+                burst=limits.get('burst'),
+                queue_timeout=float(os.getenv('UPSTREAM_QUEUE_TIMEOUT', DEFAULT_QUEUE_TIMEOUT))
+            )
+            _governors[name] = governor
+        return governor
+
+
+def _queue_stats():
+    with _governors_lock:
+        governors = list(_governors.values())
+    return [((governor.name, 'queued'), governor.queued()) for governor in governors] + \
+        [((governor.name, 'active'), governor.active) for governor in governors]
+
+
+REGISTRY.gauge_callback('findflow_upstream_slots', 'Upstream calls waiting in queue or in flight', ('upstream', 'state'),
+                        _queue_stats)
@@ -0,0 +1,116 @@
+"""
+FindFlow Toplu Öneri Puanlama Modülü
+====================================
+
+Bu modül, öneri listelerinin bütçe filtrelemesini ve match_score hesaplamasını
+tek bir fonksiyon setinde toplar.
+
+Fiyatlar her öneriden bir kez çıkarılıp kompakt bir array('d') dizisine
+yazılır; bütçe maskesi ve skor formülü bu dizi üzerinde düz Python
+döngüleriyle (list comprehension) hesaplanır. Vektörize değildir: NumPy
+bağımlılık değildir ve 50 öğelik listelerde döngü maliyeti ihmal
+edilebilir. Kazanç, fiyatın öneri başına bir kez ayrıştırılması ve
+SerpAPI'nin döndürdüğü 50 sonucun tamamının ilk 20'ye kırpılmadan
+puanlanabilmesidir.
+
+Seçilen öneriler SerpAPI'nin alaka sırasıyla döndürülür; skor yalnızca
+hangi önerilerin ilk N'e gireceğini belirler.
+
+Fonksiyonlar:
+- extract_prices(): Önerilerden fiyat dizisi çıkarır (fiyatsızlar NaN)
+- budget_mask(): Fiyat dizisi için bütçe maskesi üretir
+- score_batch(): Sıra ve bütçe uyumuna göre skor dizisi üretir
+- filter_by_budget(): Bütçe dışı ve fiyatsız önerileri eler
+- rank_recommendations(): Puanlar, en iyi N öneriyi girdi sırasıyla döndürür
+"""
+
+import math
+from array import array
+from typing import Dict, List, Optional
+
+from .price_parser import parse_price
+
+NAN = float('nan')
+
+# Skor formülü: ilk ürünler 95'ten başlar, her sırada 2 puan düşer (min 60)
+BASE_SCORE = 95
+SCORE_STEP = 2
+MIN_SCORE = 60
+MAX_SCORE = 100
+IN_BUDGET_BONUS = 10
+OUT_OF_BUDGET_PENALTY = -5
+
+
+def _price_of(rec: Dict) -> float:
+    """Tek bir öneriden sayısal fiyatı çıkarır, bulunamazsa NaN döner."""
+    price = rec.get('price')
+    if isinstance(price, dict):
+        price = price.get('value')
+    if isinstance(price, str):
+        return parse_price(price) or NAN
+    if isinstance(price, (int, float)) and not isinstance(price, bool):
+        return float(price)
+    return NAN
+
+
+def extract_prices(recommendations: List[Dict]) -> array:
+    """Önerilerin fiyatlarını tek geçişte array('d') dizisine çıkarır."""
+    return array('d', [_price_of(rec) for rec in recommendations])
+
+
+def budget_mask(prices: array, budget_min: Optional[float], budget_max: Optional[float]) -> List[bool]:
+    """
+    Fiyat dizisi için bütçe maskesi üretir (öğe başına düz döngü).
+
+    Boş (None/0) sınırlar uygulanmaz. NaN fiyatlar maskede her zaman False olur.
+    """
+    low = budget_min or -math.inf
+    high = budget_max or math.inf
+    return [low <= price <= high for price in prices]
+
+
+def score_batch(prices: array, budget_min: Optional[float], budget_max: Optional[float]) -> array:
+    """
+    Sıra pozisyonu ve bütçe uyumuna göre match_score dizisi üretir (öğe başına düz döngü).
+
+    Skor = clamp(max(95 - 2*i, 60) + bonus, 60, 100); bonus bütçe içindeyse
+    +10, dışındaysa -5'tir.
+    """
+    in_budget = budget_mask(prices, budget_min or 0, budget_max or 999999)
+    return array('d', [
+        min(MAX_SCORE, max(MIN_SCORE,
+                           max(BASE_SCORE - i * SCORE_STEP, MIN_SCORE)
+                           + (IN_BUDGET_BONUS if ok else OUT_OF_BUDGET_PENALTY)))
+        for i, ok in enumerate(in_budget)
+    ])
+
+
+def filter_by_budget(recommendations: List[Dict], budget_min: Optional[float], budget_max: Optional[float]) -> List[Dict]:
+    """Bütçe aralığı dışındaki ve fiyatı olmayan önerileri sırayı bozmadan eler."""
+    mask = budget_mask(extract_prices(recommendations), budget_min, budget_max)
+    return [rec for rec, keep in zip(recommendations, mask) if keep]
+
+
+def rank_recommendations(recommendations: List[Dict], budget_min: Optional[float],
+                         budget_max: Optional[float], limit: Optional[int] = None) -> List[Dict]:
+    """
+    Önerileri puanlar ve en yüksek skorlu `limit` tanesini girdi sırasıyla döndürür.
+
+    Skor yalnızca seçimi belirler (örn. 20. sıradan sonraki bütçe içi ürünler
+    listeye girebilir); döndürülen liste SerpAPI'nin alaka sırasını korur.
+    Eşit skorlarda önce gelen öneri seçilir. Her döndürülen öneriye
+    'match_score' alanı yazılır.
+    """
+    scores = score_batch(extract_prices(recommendations), budget_min, budget_max)
+    order = range(len(recommendations))
+    if limit is not None and limit < len(recommendations):
+        # sorted() kararlıdır: eşit skorlu öneriler girdi sırasıyla seçilir
+        selected = sorted(order, key=lambda i: -scores[i])[:limit]
+        order = sorted(selected)
+
+    ranked = []
+    for i in order:
+        rec = recommendations[i]
+        rec['match_score'] = int(scores[i])
+        ranked.append(rec)
+    return ranked
@@ -0,0 +1,198 @@
+"""
+FindFlow Yanıt Şeması Sürümleri
+===============================
+
+Bu modül, /ask son adımındaki öneri yanıtları için sürümlü yanıt şemasını
+içerir. İstemci sürümü istek gövdesindeki "response_version" alanı veya
+?v= parametresi ile seçer; belirtilmezse v1 (tam yanıt) döner.
+
+v1 (varsayılan): Agent'ın ürettiği yanıt aynen döner. grounding_results
+(tam Gemini metni), shopping_results, recommendations (shopping_results ile
+aynı sözlükler), tercihlerin yankısı ve hata ayıklama alanları dahildir.
+
+v2 (kompakt):
+- products: tekilleştirilmiş ürün listesi; her ürün bir kez yazılır
+- recommendations / shopping_results: products listesindeki indeksler
+  (ürün id'si yanıt içindeki indekstir)
+- grounding: {"id", "url", "chars"}; metin GET /ask/grounding/<id> ile alınır
+- preferences, original_count, filtered_count, budget_filter_applied,
+  fallback_reason ve ürünlerdeki link_status / link_message / source /
+  product_url alanları yazılmaz (ürün linki "url" alanındadır)
+
+Soru ve hata yanıtları her iki sürümde de aynıdır.
+
+Tekilleştirme önce sözlük kimliğine (recommendations, shopping_results ile
+aynı sözlükleri paylaşır), sonra (link, başlık) anahtarına bakar; ürün
+başına hash veya JSON karşılaştırması yapılmaz.
+
+Ana Sınıflar:
+- GroundingStore: Grounding metinleri için sınırlı LRU depo
+
+Fonksiyonlar:
+- requested_version(): İstekten yanıt sürümünü belirler
+- compact_response(): v1 öneri yanıtını v2'ye çevirir
+- install(app): /ask/grounding/<id> endpoint'ini ekler
+
+Kullanım:
+    response = agent.handle(data)
+    if requested_version(data, request.args) >= 2:
+        response = compact_response(response)
+"""
+
+import os
+import threading
+import uuid
+from collections import OrderedDict
+
+SUPPORTED_VERSIONS = (1, 2)
+DEFAULT_VERSION = 1
+
+# v2'de ürün başına yazılmayan hata ayıklama / tekrar alanları
+PRODUCT_DROP_FIELDS = ('link_status', 'link_message', 'source', 'product_url', 'link')
+
+# v2'de yanıt düzeyinde yazılmayan alanlar
+RESPONSE_DROP_FIELDS = ('preferences', 'original_count', 'filtered_count',
+                        'budget_filter_applied', 'fallback_reason')
+
+GROUNDING_URL = '/ask/grounding/{}'
+
+
+def requested_version(data, args=None):
+    """
+    İstekten yanıt şeması sürümünü belirler.
+
+    Args:
+        data (dict): İstek gövdesi ("response_version" alanı)
+        args: Sorgu parametreleri (?v=)
+
+    Returns:
+        int: Desteklenen sürüm; geçersiz veya desteklenmeyen değerde DEFAULT_VERSION
+    """
+    value = (data or {}).get('response_version')
+    if value is None and args is not None:
+        value = args.get('v')
+    try:
+        version = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_VERSION
+    return version if version in SUPPORTED_VERSIONS else DEFAULT_VERSION
+
+
+def _compact_product(product, url):
+    compact = dict(product)
+    for key in PRODUCT_DROP_FIELDS:
+        compact.pop(key, None)
+    if url:
+        compact['url'] = url
+    if 'source_site' not in compact and product.get('source'):
+        compact['source_site'] = product['source']
+    return compact
+
+
+class GroundingStore:
+    """
+    Grounding sonuçlarını rastgele id ile tutan, en fazla `capacity`
+    girdili LRU depo.
+    """
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, grounding):
+        grounding_id = uuid.uuid4().hex[:16]
+        with self._lock:
+            self._items[grounding_id] = grounding
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+        return grounding_id
+
+    def get(self, grounding_id):
+        with self._lock:
+            grounding = self._items.get(grounding_id)
+            if grounding is not None:
+                self._items.move_to_end(grounding_id)
+            return grounding
+
+
+grounding_store = GroundingStore(int(os.getenv('GROUNDING_STORE_SIZE', '256')))
+
+
+def compact_response(response):
+    """
+    v1 öneri yanıtını v2 kompakt şemaya çevirir.
+
+    Öneri içermeyen yanıtlar (soru, hata) aynen döner. Ürünler sözlük
+    kimliği ve (link, başlık) anahtarıyla tekilleştirilir; Agent'ın
+    sözlükleri değiştirilmez.
+
+    Args:
+        response (dict): Agent.handle() çıktısı
+
+    Returns:
+        dict: v2 yanıtı
+    """
+    if not isinstance(response, dict) or 'recommendations' not in response:
+        return response
+
+    products = []
+    by_identity = {}
+    by_key = {}
+
+    def ids(items):
+        result = []
+        for item in items or []:
+            index = by_identity.get(id(item))
+            if index is None:
+                if not isinstance(item, dict):
+                    continue
+                url = item.get('product_url') or item.get('link')
+                key = (url, item.get('title') or item.get('name'))
+                index = by_key.get(key)
+                if index is None:
+                    index = by_key[key] = len(products)
+                    products.append(_compact_product(item, url))
+                by_identity[id(item)] = index
+            result.append(index)
+        return result
+
+    compact = {'v': 2}
+    for key, value in response.items():
+        if key in RESPONSE_DROP_FIELDS or key in ('recommendations', 'shopping_results', 'grounding_results'):
+            continue
+        if key == 'sources' and not value:
+            continue
+        compact[key] = value
+
+    compact['recommendations'] = ids(response.get('recommendations'))
+    if response.get('shopping_results'):
+        compact['shopping_results'] = ids(response['shopping_results'])
+    compact['products'] = products
+
+    grounding = response.get('grounding_results')
+    if isinstance(grounding, dict) and grounding.get('response'):
+        grounding_id = grounding_store.add(grounding)
+        compact['grounding'] = {
+            'id': grounding_id,
+            'url': GROUNDING_URL.format(grounding_id),
+            'chars': len(grounding['response'])
+        }
+    return compact
+
+
+def install(app):
+    """
+    Flask uygulamasına GET /ask/grounding/<id> endpoint'ini ekler.
+
+    Args:
+        app: Flask uygulama nesnesi
+    """
+
+    @app.route('/ask/grounding/<grounding_id>', methods=['GET'])
+    def ask_grounding(grounding_id):
+        """v2 yanıtındaki grounding id'si için tam grounding sonucunu döndürür."""
+        grounding = grounding_store.get(grounding_id)
+        if grounding is None:
+            return {'error': 'Grounding result not found or expired'}, 404
+        return grounding
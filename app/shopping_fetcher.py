@@ -0,0 +1,341 @@
+"""
+FindFlow Sayfalı Shopping Getirici
+==================================
+
+Bu modül, SerpAPI Google Shopping sonuçlarını sayfa sayfa (start offset)
+getiren ve sayfaları önbellekleyen katmanı içerir.
+
+İlk sayfa istek içinde senkron olarak alınır ve hemen döndürülür. Aksesuar
+ve bütçe filtrelerinden geçen sonuç sayısı hedefin altında kalırsa, sonraki
+sayfalar arka planda bir thread ile hedefe ulaşılana veya süre dolana kadar
+çekilir. Aynı sorgunun sonraki istekleri önbellekteki tüm sayfaları kullanır;
+böylece daha az kullanıcı sabit fallback listesine düşer. Filtreden geçen
+sonuçlar da sayfa kümesinde tutulur: her ham sonuç (filtre anahtarı
+başına) bir kez formatlanır, doldurma yalnızca yeni sayfayı filtreler.
+
+İlk sayfadaki hiçbir sonuç filtreden geçmezse istek, fallback'e düşmeden önce
+arka plan doldurmasını en fazla refill_deadline saniye bekler.
+
+Sayfa istekleri SerpAPI governor'ından (app.rate_limiter) slot alır; arka
+plan doldurma sayfaları (istek onları beklemiyorsa) BACKGROUND önceliğiyle
+kuyruğa girer ve etkileşimli ilk sayfa isteklerinin önüne geçmez. 429
+yanıtı governor'ı duraklatır. SerpAPI devre kesicisi açıksa sayfa istenmez
+(getirici None döner ve arama fallback'e geçer).
+
+İstek deadline'ı (app.deadline) varsa ilk sayfanın zaman aşımı, kuyruk
+beklemesi ve doldurma beklemesi kalan süreye kırpılır; kalan süre bir
+sayfa için yetmiyorsa sayfa istenmez. Arka plan doldurma thread'i istek
+bağlamını devralmadığından kendi refill_deadline süresiyle çalışır.
+
+Ana Sınıflar:
+- PaginatedShoppingFetcher: Sayfalı getirici ve sayfa önbelleği
+
+Fonksiyonlar:
+- get_shopping_fetcher(): Paylaşımlı getirici örneği
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from .config import SERPAPI_BASE_URL, get_serpapi_settings
+from .circuit_breaker import get_breaker
+from .deadline import current_deadline, remaining_budget
+from .rate_limiter import BACKGROUND, UpstreamQueueTimeout, current_priority, get_governor, upstream_priority
+from .telemetry import record_cache, record_upstream, span
+
+# İstek bütçesinde bundan az süre kaldıysa sayfa istenmez
+MIN_PAGE_SECONDS = 1.0
+
+
+def _retry_after(response):
+    """Retry-After başlığı (saniye) veya None."""
+    try:
+        return float(response.headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+class _PageSet:
+    """Tek bir sorgu için çekilmiş ham sonuçlar, filtreden geçenler ve doldurma durumu."""
+
+    def __init__(self):
+        self.results = []
+        # accept_key → [filtreden geçen formatlanmış sonuçlar, işlenmiş ham sonuç sayısı]
+        self.accepted = {}
+        self.seen = set()
+        self.pages = 0
+        self.exhausted = False
+        self.refilling = False
+        self.created_at = datetime.now()
+        self.condition = threading.Condition()
+
+    def add_page(self, page_results, has_next):
+        """
+        Sayfanın yeni sonuçlarını ekler.
+
+        Sorgu yalnızca boş sayfada veya SerpAPI sayfalaması sonraki sayfa
+        bildirmediğinde tükenmiş sayılır; filtrelenmiş/kısa sayfalar (num'dan
+        az sonuç) doldurmayı durdurmaz.
+        """
+        with self.condition:
+            for result in page_results:
+                key = result.get('product_id') or result.get('link') or result.get('title')
+                if key in self.seen:
+                    continue
+                self.seen.add(key)
+                self.results.append(result)
+            self.pages += 1
+            if not page_results or not has_next:
+                self.exhausted = True
+            self.condition.notify_all()
+
+    def accept_new(self, accept, accept_key):
+        """
+        Henüz işlenmemiş ham sonuçları accept'ten geçirir (her ham sonuç anahtar başına bir kez).
+
+        Returns:
+            list: Anahtar için biriken formatlanmış sonuçlar (paylaşılan liste; kopyalanmadan değiştirilmemeli)
+        """
+        with self.condition:
+            state = self.accepted.setdefault(accept_key, [[], 0])
+            for result in self.results[state[1]:]:
+                item = accept(result)
+                if item:
+                    state[0].append(item)
+            state[1] = len(self.results)
+            return state[0]
+
+
+class PaginatedShoppingFetcher:
+    """
+    SerpAPI shopping sonuçlarını sayfalı getiren ve önbellekleyen sınıf.
+
+    Özellikler:
+    - page_size: Sayfa başına istenen sonuç (SerpAPI 'num')
+    - max_pages: Bir sorgu için çekilecek maksimum sayfa
+    - target_count: Filtreden geçmesi hedeflenen sonuç sayısı
+    - refill_deadline: Arka plan doldurmasının süresi (saniye)
+    - cache_duration: Sayfa önbelleği süresi
+    """
+
+    def __init__(self, base_url=SERPAPI_BASE_URL, page_size=50, max_pages=5, target_count=20,
+                 refill_deadline=8.0, request_timeout=10, cache_duration=timedelta(hours=6),
+                 max_entries=256):
+        self.base_url = base_url
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.target_count = target_count
+        self.refill_deadline = refill_deadline
+        self.request_timeout = request_timeout
+        self.cache_duration = cache_duration
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fetch(self, params: Dict, accept: Callable[[Dict], Optional[Dict]],
+              target_count: Optional[int] = None, accept_key=None) -> Optional[List[Dict]]:
+        """
+        Sorgu için filtreden geçmiş sonuçları döndürür.
+
+        accept her ham sonuç için bir kez çalışır; sonuçları sayfa kümesinde
+        accept_key altında tutulur. Önbellek isabetleri ve doldurma sayfaları
+        yalnızca yeni ham sonuçları filtreler.
+
+        Args:
+            params (Dict): SerpAPI parametreleri ('start' hariç)
+            accept (Callable): Ham sonucu formatlayan/filtreleyen fonksiyon, elenirse None döner
+            target_count (int): Hedef sonuç sayısı (varsayılan: self.target_count)
+            accept_key: accept'in sonucunu belirleyen değerler (örn. kategori ve
+                bütçe); aynı sayfaları farklı filtrelerle kullanan çağıranları ayırır
+
+        Returns:
+            List[Dict] or None: Formatlanmış sonuçlar, ilk sayfa alınamazsa None
+        """
+        target_count = target_count or self.target_count
+        key = self._cache_key(params)
+
+        entry = self._get_entry(key)
+        record_cache('shopping_pages', entry is not None)
+        if entry is None:
+            first_page = self._request_page(params, 0)
+            if first_page is None:
+                return None
+            entry = _PageSet()
+            entry.add_page(*first_page)
+            self._store_entry(key, entry)
+        else:
+            print(f"⚡ Shopping page cache hit: {entry.pages} sayfa, {len(entry.results)} ham sonuç")
+
+        results = self._collect(entry, accept, accept_key)
+
+        if len(results) < target_count and not entry.exhausted:
+            # İstek sonuçsuz kalıp doldurmayı bekleyecekse sayfalar çağıranın önceliğiyle çekilir
+            level = BACKGROUND if results else current_priority()
+            self._start_refill(entry, params, accept, accept_key, target_count, level)
+            if not results:
+                # İlk sayfada kullanılabilir sonuç yok - fallback'e düşmeden önce doldurmayı bekle
+                print(f"⏳ Filtreden geçen sonuç yok, arka plan doldurması bekleniyor...")
+                self._wait_for_results(entry, accept, accept_key)
+                results = self._collect(entry, accept, accept_key)
+
+        return results
+
+    def _collect(self, entry, accept, accept_key):
+        """Filtreden geçen sonuçların çağırana ait kopyası (yalnızca yeni ham sonuçlar filtrelenir)."""
+        with entry.condition:
+            # Öneri puanlama sonuçlara alan yazar; istekler aynı sözlükleri paylaşmamalı
+            return [dict(item) for item in entry.accept_new(accept, accept_key)]
+
+    def _start_refill(self, entry, params, accept, accept_key, target_count, level=BACKGROUND):
+        with entry.condition:
+            if entry.refilling:
+                return
+            entry.refilling = True
+
+        thread = threading.Thread(
+            target=self._refill,
+            args=(entry, dict(params), accept, accept_key, target_count, level),
+            daemon=True
+        )
+        thread.start()
+
+    def _refill(self, entry, params, accept, accept_key, target_count, level=BACKGROUND):
+        """Hedef sayıya ulaşılana veya süre dolana kadar sonraki sayfaları çeker."""
+        deadline = time.monotonic() + self.refill_deadline
+        try:
+            with upstream_priority(level):
+                self._refill_pages(entry, params, accept, accept_key, target_count, deadline)
+        finally:
+            with entry.condition:
+                entry.refilling = False
+                entry.condition.notify_all()
+
+    def _refill_pages(self, entry, params, accept, accept_key, target_count, deadline):
+        while (not entry.exhausted and entry.pages < self.max_pages
+               and time.monotonic() < deadline):
+            page = self._request_page(params, entry.pages * self.page_size)
+            if page is None:
+                break
+            entry.add_page(*page)
+            # Yalnızca yeni sayfanın sonuçları filtrelenir; liste kopyalanmadan sayılır
+            with entry.condition:
+                passed = len(entry.accept_new(accept, accept_key))
+            print(f"📄 Shopping refill: sayfa {entry.pages}, {passed} sonuç filtreden geçti")
+            if passed >= target_count:
+                break
+
+    def _wait_for_results(self, entry, accept, accept_key):
+        """Doldurma bitene, süre dolana veya kullanılabilir sonuç gelene kadar bekler."""
+        deadline = time.monotonic() + remaining_budget(self.refill_deadline)
+        seen_pages = entry.pages
+        while True:
+            with entry.condition:
+                remaining = deadline - time.monotonic()
+                if not entry.refilling or remaining <= 0:
+                    return
+                if entry.pages == seen_pages:
+                    entry.condition.wait(remaining)
+                seen_pages = entry.pages
+                if entry.accept_new(accept, accept_key):
+                    return
+
+    def _request_page(self, params, start):
+        """
+        Tek bir sonuç sayfası ister.
+
+        Returns:
+            tuple or None: (sonuçlar, sonraki sayfa var mı); istek yapılamazsa None
+        """
+        page_params = dict(params)
+        page_params['num'] = self.page_size
+        if start:
+            page_params['start'] = start
+        governor = get_governor('serpapi')
+        breaker = get_breaker('serpapi')
+        deadline = current_deadline()
+        if deadline is not None and not deadline.allows(MIN_PAGE_SECONDS):
+            print(f"⏱️ İstek süresi doluyor, SerpAPI sayfa isteği atlandı (start={start})")
+            record_upstream('serpapi', False, 'deadline')
+            deadline.note('serpapi')
+            return None
+        if not breaker.allow():
+            print(f"🔌 SerpAPI devresi açık, sayfa isteği atlandı (start={start})")
+            record_upstream('serpapi', False, 'circuit_open')
+            return None
+        call_started = None
+        try:
+            with governor.slot(timeout=remaining_budget(governor.queue_timeout)):
+                call_started = time.perf_counter()
+                with span('serpapi_page'):
+                    response = requests.get(self.base_url, params=page_params,
+                                            timeout=remaining_budget(self.request_timeout))
+            duration = time.perf_counter() - call_started
+            if response.status_code != 200:
+                print(f"❌ SerpAPI error: {response.status_code} (start={start})")
+                record_upstream('serpapi', False, f'http_{response.status_code}')
+                if response.status_code == 429:
+                    governor.report_throttled(_retry_after(response))
+                else:
+                    breaker.record(False, duration)
+                return None
+            payload = response.json()
+            results = payload.get('shopping_results', [])
+            has_next = bool((payload.get('serpapi_pagination') or {}).get('next'))
+            breaker.record(True, duration)
+            record_upstream('serpapi', True)
+            return results, has_next
+        except UpstreamQueueTimeout as e:
+            print(f"⏳ SerpAPI kuyruğu zaman aşımı (start={start}): {e}")
+            record_upstream('serpapi', False, 'queue_timeout')
+            if deadline is not None and not deadline.allows(MIN_PAGE_SECONDS):
+                deadline.note('serpapi')
+            return None
+        except Exception as e:
+            print(f"❌ SerpAPI page error (start={start}): {e}")
+            record_upstream('serpapi', False)
+            if deadline is not None and not deadline.allows(MIN_PAGE_SECONDS):
+                # Bütçeye kırpılan zaman aşımı upstream hatası sayılmaz
+                deadline.note('serpapi')
+            elif call_started is not None:
+                breaker.record(False, time.perf_counter() - call_started)
+            return None
+
+    def _cache_key(self, params):
+        return tuple(sorted((k, str(v)) for k, v in params.items() if k not in ('api_key', 'start', 'num')))
+
+    def _get_entry(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if datetime.now() - entry.created_at > self.cache_duration:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _store_entry(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+
+def get_shopping_fetcher() -> PaginatedShoppingFetcher:
+    """Tüm ModernSearchEngine örneklerinin paylaştığı getiriciyi döndürür."""
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            base_url, _ = get_serpapi_settings()
+            _fetcher = PaginatedShoppingFetcher(base_url=base_url)
+        return _fetcher
@@ -0,0 +1,155 @@
+"""
+FindFlow Alışveriş Sonucu Filtre Motoru
+=======================================
+
+Bu modül, SerpAPI shopping başlıklarını kategori bazlı anahtar kelimelerle
+filtreleyen motoru içerir (aksesuar, kılıf, yanlış ürün tipi vb.).
+
+Filtre verisi categories.json içindeki her kategorinin isteğe bağlı
+"shopping_filter" alanından okunur:
+
+    "shopping_filter": {
+        "exclude": ["kılıf", "stand"],       # başlıkta geçerse ele
+        "include": ["telefon", "iphone"],    # hiçbiri geçmezse ele
+        "min_budget_ratio": 0.3              # bütçe alt sınırının bu oranından ucuzsa ele
+    }
+
+Alanı olmayan kategoriler (AI ile oluşturulanlar dahil) DEFAULT_EXCLUDE
+listesini kullanır. Her kategorinin kelimeleri yükleme anında tek bir regex
+alternation'ına derlenir; böylece her başlık tek geçişte taranır.
+
+Ana Sınıflar:
+- CategoryFilter: Tek kategori için derlenmiş filtre
+- ShoppingFilterEngine: Kategori adı → CategoryFilter eşlemesi
+
+Fonksiyonlar:
+- get_shopping_filter(): categories.json değiştiğinde yeniden derlenen paylaşımlı motor
+"""
+
+import os
+import re
+import threading
+from typing import Dict, Optional, Tuple
+
+from .json_codec import load_file
+
+# Tüm kategoriler için geçerli aksesuar kelimeleri
+DEFAULT_EXCLUDE = (
+    'kılıf', 'aksesuar', 'tutacak', 'cam koruyucu', 'temperli cam', 'ekran koruyucu'
+)
+
+CATEGORIES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'categories.json')
+
+
+def _alternation(keywords):
+    """Kelimeleri uzundan kısaya sıralı, kaçışlı bir regex alternation'ına çevirir."""
+    unique = sorted({k.lower() for k in keywords if k}, key=len, reverse=True)
+    return '|'.join(re.escape(k) for k in unique)
+
+
+class CategoryFilter:
+    """
+    Tek bir kategori için derlenmiş başlık filtresi.
+
+    Exclude ve include kelimeleri tek bir lookahead regex'inde birleştirilir:
+    her pozisyonda önce exclude, sonra include denenir. Böylece örtüşen
+    kelimeler de kaçırılmadan başlık tek geçişte taranır.
+    """
+
+    def __init__(self, exclude=DEFAULT_EXCLUDE, include=(), min_budget_ratio=None):
+        self.has_include = bool(include)
+        self.min_budget_ratio = min_budget_ratio
+
+        groups = []
+        exclude_pattern = _alternation(exclude)
+        include_pattern = _alternation(include)
+        if exclude_pattern:
+            groups.append(f'(?P<exclude>{exclude_pattern})')
+        if include_pattern:
+            groups.append(f'(?P<include>{include_pattern})')
+        self.pattern = re.compile(f"(?=(?:{'|'.join(groups)}))") if groups else None
+
+    def check(self, title: str, price_value: float = 0.0, budget_min: Optional[float] = None) -> Tuple[bool, Optional[str]]:
+        """
+        Başlığı ve fiyatı filtreden geçirir.
+
+        Args:
+            title (str): Ürün başlığı
+            price_value (float): Ürün fiyatı
+            budget_min (float): Kullanıcının bütçe alt sınırı
+
+        Returns:
+            tuple: (geçti mi, elenme nedeni: 'accessory' | 'low_price' | 'wrong_type' | None)
+        """
+        included = False
+        if self.pattern is not None:
+            for match in self.pattern.finditer(title.lower()):
+                if match.lastgroup == 'exclude':
+                    return False, 'accessory'
+                included = True
+
+        if self.min_budget_ratio is not None and price_value > 0:
+            # Bütçe belirtilmemişse 1000₺ taban kabul edilir
+            if price_value < (budget_min or 1000) * self.min_budget_ratio:
+                return False, 'low_price'
+
+        if self.has_include and not included:
+            return False, 'wrong_type'
+
+        return True, None
+
+
+class ShoppingFilterEngine:
+    """Kategori adından derlenmiş CategoryFilter'a eşleme yapan motor."""
+
+    def __init__(self, filters: Optional[Dict[str, CategoryFilter]] = None):
+        self.filters = filters or {}
+        self.default_filter = CategoryFilter()
+
+    @classmethod
+    def from_catalog(cls, categories: Dict) -> 'ShoppingFilterEngine':
+        """Kategori kataloğundaki "shopping_filter" alanlarından motoru derler."""
+        filters = {}
+        for cat_name, cat_data in categories.items():
+            config = cat_data.get('shopping_filter') if isinstance(cat_data, dict) else None
+            if not config:
+                continue
+            filters[cat_name] = CategoryFilter(
+                exclude=tuple(DEFAULT_EXCLUDE) + tuple(config.get('exclude', [])),
+                include=tuple(config.get('include', [])),
+                min_budget_ratio=config.get('min_budget_ratio')
+            )
+        return cls(filters)
+
+    def for_category(self, category: Optional[str]) -> CategoryFilter:
+        """Kategorinin filtresini, tanımlı değilse varsayılan aksesuar filtresini döndürür."""
+        return self.filters.get(category, self.default_filter)
+
+
+_engine = None
+_engine_mtime = None
+_engine_lock = threading.Lock()
+
+
+def get_shopping_filter(path: str = CATEGORIES_FILE) -> ShoppingFilterEngine:
+    """
+    categories.json'dan derlenmiş paylaşımlı filtre motorunu döndürür.
+
+    Motor yalnızca dosya değiştiğinde (mtime) yeniden derlenir.
+    """
+    global _engine, _engine_mtime
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+
+    with _engine_lock:
+        if _engine is None or mtime != _engine_mtime:
+            try:
+                categories = load_file(path)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Shopping filter kataloğu yüklenemedi: {e}")
+                categories = {}
+            _engine = ShoppingFilterEngine.from_catalog(categories)
+            _engine_mtime = mtime
+        return _engine
@@ -0,0 +1,227 @@
+"""
+FindFlow Statik Dosya Hattı
+===========================
+
+Bu modül, website/ klasöründeki ön yüz dosyalarını (main.html, main.js)
+başlangıçta belleğe alır ve her istekte diskten okumadan sunar:
+
+- Sıkıştırma: gzip (ve brotli paketi kuruluysa br) varyantları bir kez
+  üretilir; Accept-Encoding'e göre en küçük kabul edilen varyant döner
+- ETag: İçerik hash'i (varyant başına "<hash>", "<hash>-gz", "<hash>-br");
+  If-None-Match eşleşirse gövdesiz 304 döner
+- Sürümlü URL'ler: HTML içindeki yerel referanslar içerik hash'i ile
+  yeniden yazılır (main.js → main.js?v=<hash>). Hash'i tutan istekler
+  bir yıl "immutable" önbelleklenir; HTML her seferinde doğrulanır
+  (no-cache + ETag) ve değişmediyse 304 alır
+
+Dosyalar değişirse (mtime/boyut) hat en fazla RELOAD_CHECK_SECONDS
+aralıkla kontrol edilip yeniden kurulur; geliştirme sırasında yapılan
+düzenlemeler sunucu yeniden başlatılmadan yansır.
+
+Ana Sınıflar:
+- StaticAsset: Tek dosyanın varyantları ve başlıkları
+- StaticAssetPipeline: Klasör manifesti ve istek sunumu
+
+Kullanım:
+    pipeline = StaticAssetPipeline(app.static_folder)
+
+    @app.route('/<path:filename>')
+    def static_files(filename):
+        return pipeline.serve(filename)
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+import time
+
+from .telemetry import record_cache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - opsiyonel bağımlılık
+    brotli = None
+
+# Bu tiplerdeki dosyalar sıkıştırılır
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+
+# Bu boyutun altındaki dosyalarda sıkıştırma kazancı başlık maliyetine değmez
+MIN_COMPRESS_BYTES = 1024
+
+# Sürüm hash'i tutan URL'ler (?v=<hash>) ve sürümsüz istekler için Cache-Control
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+DEFAULT_CACHE_CONTROL = 'public, max-age=300'
+DOCUMENT_CACHE_CONTROL = 'no-cache'
+
+RELOAD_CHECK_SECONDS = 1.0
+
+# HTML içindeki yerel src/href referansları (mutlak URL ve anchor'lar hariç)
+_LOCAL_REF_RE = re.compile(r'''(\b(?:src|href)=["'])(?![a-z]+:|//|#)([^"'?#]+)(["'])''', re.IGNORECASE)
+
+
+def _content_type(filename):
+    mimetype, _ = mimetypes.guess_type(filename)
+    mimetype = mimetype or 'application/octet-stream'
+    if mimetype == 'text/javascript':
+        mimetype = 'application/javascript'
+    return mimetype
+
+
+class StaticAsset:
+    """Bir dosyanın içerik hash'i ve encoding → (gövde, ETag) varyantları."""
+
+    def __init__(self, filename, data, stat):
+        self.filename = filename
+        self.stat = stat
+        self.mimetype = _content_type(filename)
+        self.is_document = self.mimetype == 'text/html'
+        self.version = hashlib.sha256(data).hexdigest()[:16]
+        self.variants = {'identity': (data, f'"{self.version}"')}
+
+        if self.mimetype.startswith(COMPRESSIBLE_TYPES) and len(data) >= MIN_COMPRESS_BYTES:
+            compressed = gzip.compress(data, compresslevel=9, mtime=0)
+            if len(compressed) < len(data):
+                self.variants['gzip'] = (compressed, f'"{self.version}-gz"')
+            if brotli is not None:
+                compressed = brotli.compress(data, quality=11)
+                if len(compressed) < len(data):
+                    self.variants['br'] = (compressed, f'"{self.version}-br"')
+
+    def select(self, accept_encodings):
+        """Kabul edilen en küçük varyantın (encoding, gövde, ETag) üçlüsü."""
+        best = 'identity'
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and accept_encodings[encoding]:
+                if len(self.variants[encoding][0]) < len(self.variants[best][0]):
+                    best = encoding
+        body, etag = self.variants[best]
+        return best, body, etag
+
+    def etags(self):
+        return [etag for _, etag in self.variants.values()]
+
+
+class StaticAssetPipeline:
+    """
+    Statik klasörün belleğe alınmış, sıkıştırılmış ve ETag'li manifesti.
+
+    Manifest klasördeki tüm dosyaları içerir; manifestte olmayan yollar
+    (dizin dışına çıkmaya çalışanlar dahil) 404 alır.
+    """
+
+    def __init__(self, folder):
+        """
+        Args:
+            folder (str): Statik dosya klasörü (Flask app.static_folder)
+        """
+        self.folder = os.path.abspath(folder)
+        self._lock = threading.Lock()
+        self._assets = {}
+        self._last_check = 0.0
+        self.build()
+
+    def _scan(self):
+        files = {}
+        for root, _, names in os.walk(self.folder):
+            for name in names:
+                path = os.path.join(root, name)
+                filename = os.path.relpath(path, self.folder).replace(os.sep, '/')
+                stat = os.stat(path)
+                files[filename] = (path, (stat.st_mtime_ns, stat.st_size))
+        return files
+
+    def build(self):
+        """Klasörü okuyup tüm varyantları üretir (önce varlıklar, sonra onlara referans veren HTML)."""
+        files = self._scan()
+        assets = {}
+        documents = []
+        for filename, (path, stat) in files.items():
+            with open(path, 'rb') as f:
+                data = f.read()
+            if _content_type(filename) == 'text/html':
+                documents.append((filename, data, stat))
+            else:
+                assets[filename] = StaticAsset(filename, data, stat)
+
+        for filename, data, stat in documents:
+            assets[filename] = StaticAsset(filename, self._version_references(data, assets), stat)
+
+        with self._lock:
+            self._assets = assets
+            self._last_check = time.monotonic()
+        sizes = ', '.join(
+            f"{name} {len(asset.variants['identity'][0]) // 1024}K"
+            + ''.join(f"/{enc} {len(body) // 1024}K" for enc, (body, _) in asset.variants.items() if enc != 'identity')
+            for name, asset in sorted(assets.items())
+        )
+        print(f"📦 Statik dosyalar hazırlandı: {sizes}")
+
+    @staticmethod
+    def _version_references(data, assets):
+        """HTML'deki yerel referanslara içerik sürümünü ekler (main.js → main.js?v=<hash>)."""
+        def replace(match):
+            asset = assets.get(match.group(2).lstrip('/'))
+            if asset is None:
+                return match.group(0)
+            return f"{match.group(1)}{match.group(2)}?v={asset.version}{match.group(3)}"
+
+        try:
+            text = data.decode('utf-8')
+        except UnicodeDecodeError:
+            return data
+        return _LOCAL_REF_RE.sub(replace, text).encode('utf-8')
+
+    def _reload_if_changed(self):
+        now = time.monotonic()
+        if now - self._last_check < RELOAD_CHECK_SECONDS:
+            return
+        self._last_check = now
+        try:
+            current = {filename: stat for filename, (_, stat) in self._scan().items()}
+        except OSError:
+            return
+        known = {filename: asset.stat for filename, asset in self._assets.items()}
+        if current != known:
+            print("🔄 Statik dosyalar değişti, yeniden hazırlanıyor")
+            self.build()
+
+    def get(self, filename):
+        self._reload_if_changed()
+        return self._assets.get(filename)
+
+    def serve(self, filename):
+        """
+        Dosyayı mevcut Flask isteğine göre sunar.
+
+        Args:
+            filename (str): Klasöre göre dosya yolu
+
+        Returns:
+            Response: 200 (varyant gövdesi), 304 (ETag eşleşti) veya 404
+        """
+        from flask import abort, current_app, request
+
+        asset = self.get(filename)
+        if asset is None:
+            abort(404)
+
+        encoding, body, etag = asset.select(request.accept_encodings)
+        if asset.is_document:
+            cache_control = DOCUMENT_CACHE_CONTROL
+        elif request.args.get('v') == asset.version:
+            cache_control = IMMUTABLE_CACHE_CONTROL
+        else:
+            cache_control = DEFAULT_CACHE_CONTROL
+
+        headers = {'ETag': etag, 'Cache-Control': cache_control, 'Vary': 'Accept-Encoding'}
+        not_modified = any(request.if_none_match.contains_weak(tag.strip('"')) for tag in asset.etags())
+        record_cache('static_etag', not_modified)
+        if not_modified:
+            return current_app.response_class(status=304, headers=headers)
+
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return current_app.response_class(body, headers=headers, mimetype=asset.mimetype)
@@ -0,0 +1,322 @@
+"""
+FindFlow Telemetri Modülü
+=========================
+
+Bu modül, istek içi zaman ölçümü (span), Prometheus formatında metrikler ve
+Server-Timing header'ı için hafif bir katman içerir. Harici bağımlılık
+gerektirmez; Prometheus text exposition formatı (0.0.4) doğrudan üretilir.
+
+Bir /ask isteğinde span'ler istek bağlamında (contextvars) toplanır ve
+after_request'te Server-Timing header'ına yazılır. Aynı süreler
+findflow_span_duration_seconds histogramına da işlenir. Arka plan
+thread'lerindeki span'ler (örn. shopping refill) yalnızca histograma yazılır.
+
+Ana Sınıflar:
+- Counter, Histogram: Etiketli metrik tipleri
+- MetricsRegistry: Metrik kaydı ve Prometheus çıktısı
+
+Fonksiyonlar:
+- span(): Süre ölçen context manager
+- traced(): span() decorator'ı
+- record_cache(): Önbellek hit/miss sayacı
+- begin_request() / server_timing_header(): İstek bağlamı
+- install(app): Flask uygulamasına /metrics ve Server-Timing ekler
+
+Kullanım:
+    from .telemetry import span, traced, record_cache
+
+    with span('gemini_attempt'):
+        response = model.generate_content(prompt)
+
+    @traced('serpapi_shopping')
+    def _search_shopping_serp(self, preferences, degraded=None):
+        ...
+"""
+
+import contextvars
+import functools
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{escaped}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Yalnızca artan, etiketli sayaç."""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, key, value) for key, value in items]
+
+
+class Histogram:
+    """Sabit bucket'lı, etiketli histogram."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) + (math.inf,)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(s[0]), s[1], s[2])) for key, s in self._values.items())
+        samples = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                samples.append((f'{self.name}_bucket', key + (_format_value(bound),), cumulative))
+            samples.append((f'{self.name}_sum', key, total))
+            samples.append((f'{self.name}_count', key, count))
+        return samples
+
+    def sample_labelnames(self, sample_name):
+        return self.labelnames + ('le',) if sample_name.endswith('_bucket') else self.labelnames
+
+
+class MetricsRegistry:
+    """Metriklerin kaydı ve Prometheus text formatında çıktısı."""
+
+    def __init__(self):
+        self._metrics = []
+        self._gauge_callbacks = []
+        self._lock = threading.Lock()
+
+    def counter(self, name, documentation, labelnames=()):
+        metric = Counter(name, documentation, labelnames)
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, documentation, labelnames, buckets)
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def gauge_callback(self, name, documentation, labelnames, callback):
+        """
+        Çıktı anında hesaplanan gauge kaydeder.
+
+        Args:
+            callback: [(etiket değerleri tuple'ı, değer), ...] döndüren fonksiyon
+        """
+        with self._lock:
+            self._gauge_callbacks.append((name, documentation, tuple(labelnames), callback))
+
+    def render(self):
+        """Tüm metrikleri Prometheus text exposition formatında döndürür."""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics)
+            gauges = list(self._gauge_callbacks)
+
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for sample_name, key, value in metric.samples():
+                labelnames = metric.sample_labelnames(sample_name) if metric.kind == 'histogram' else metric.labelnames
+                lines.append(f'{sample_name}{_format_labels(labelnames, key)} {_format_value(value)}')
+
+        for name, documentation, labelnames, callback in gauges:
+            lines.append(f'# HELP {name} {documentation}')
+            lines.append(f'# TYPE {name} gauge')
+            try:
+                values = callback()
+            except Exception as e:
+                print(f"⚠️ Metrik hesaplanamadı ({name}): {e}")
+                continue
+            for key, value in values:
+                lines.append(f'{name}{_format_labels(labelnames, key)} {_format_value(value)}')
+
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+SPAN_DURATION = REGISTRY.histogram(
+    'findflow_span_duration_seconds', 'Duration of traced operations', ('span',))
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    'findflow_http_request_duration_seconds', 'Duration of HTTP requests', ('endpoint', 'method', 'status'))
+CACHE_REQUESTS = REGISTRY.counter(
+    'findflow_cache_requests_total', 'Cache lookups by result', ('cache', 'result'))
+GEMINI_ATTEMPTS = REGISTRY.counter(
+    'findflow_gemini_attempts_total', 'Gemini generate_content attempts by result', ('result',))
+GEMINI_RETRIES = REGISTRY.counter(
+    'findflow_gemini_retries_total', 'Gemini retries after a failed attempt')
+UPSTREAM_REQUESTS = REGISTRY.counter(
+    'findflow_upstream_requests_total', 'Upstream requests by outcome', ('upstream', 'outcome'))
+
+
+def _cache_hit_ratios():
+    totals = {}
+    for _, (cache, result), value in CACHE_REQUESTS.samples():
+        hits, count = totals.get(cache, (0, 0))
+        totals[cache] = (hits + (value if result == 'hit' else 0), count + value)
+    return [((cache,), hits / count) for cache, (hits, count) in sorted(totals.items()) if count]
+
+
+def _upstream_error_rates():
+    totals = {}
+    for _, (upstream, outcome), value in UPSTREAM_REQUESTS.samples():
+        errors, count = totals.get(upstream, (0, 0))
+        totals[upstream] = (errors + (value if outcome != 'ok' else 0), count + value)
+    return [((upstream,), errors / count) for upstream, (errors, count) in sorted(totals.items()) if count]
+
+
+REGISTRY.gauge_callback('findflow_cache_hit_ratio', 'Cache hit ratio since start', ('cache',), _cache_hit_ratios)
+REGISTRY.gauge_callback('findflow_upstream_error_ratio', 'Upstream error ratio since start', ('upstream',),
+                        _upstream_error_rates)
+
+
+def record_cache(cache, hit):
+    """Önbellek hit/miss sayacını artırır."""
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def record_upstream(upstream, ok, outcome=None):
+    """Upstream istek sonucunu kaydeder (outcome: 'ok', 'error', 'http_429' vb.)."""
+    UPSTREAM_REQUESTS.inc(upstream=upstream, outcome=outcome or ('ok' if ok else 'error'))
+
+
+# ---------------------------------------------------------------------------
+# Span'ler ve istek bağlamı
+# ---------------------------------------------------------------------------
+
+_request_spans = contextvars.ContextVar('findflow_request_spans', default=None)
+
+
+@contextmanager
+def span(name):
+    """Bloğun süresini histograma ve (varsa) istek Server-Timing kaydına yazar."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        SPAN_DURATION.observe(duration, span=name)
+        spans = _request_spans.get()
+        if spans is not None:
+            total, count = spans.get(name, (0.0, 0))
+            spans[name] = (total + duration, count + 1)
+
+
+def traced(name):
+    """Fonksiyonu span(name) ile saran decorator."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def begin_request():
+    """Mevcut istek için span kaydını başlatır."""
+    _request_spans.set({})
+    return time.perf_counter()
+
+
+def server_timing_header(request_start):
+    """İstekte toplanan span'lerden Server-Timing header değerini üretir."""
+    spans = _request_spans.get() or {}
+    parts = []
+    for name, (total, count) in spans.items():
+        entry = f'{name};dur={total * 1000:.1f}'
+        if count > 1:
+            entry += f';desc="x{count}"'
+        parts.append(entry)
+    parts.append(f'total;dur={(time.perf_counter() - request_start) * 1000:.1f}')
+    _request_spans.set(None)
+    return ', '.join(parts)
+
+
+def install(app):
+    """
+    Flask uygulamasına istek zamanlaması, Server-Timing header'ı ve
+    /metrics endpoint'ini ekler.
+    """
+    from flask import Response, g, request
+
+    @app.before_request
+    def _telemetry_begin():
+        g.telemetry_start = begin_request()
+
+    @app.after_request
+    def _telemetry_end(response):
+        start = g.pop('telemetry_start', None)
+        if start is not None:
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                endpoint=request.endpoint or 'unknown',
+                method=request.method,
+                status=str(response.status_code)
+            )
+            response.headers['Server-Timing'] = server_timing_header(start)
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        """Prometheus formatında metrikler."""
+        return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+    return app
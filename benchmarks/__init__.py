@@ -0,0 +1,8 @@
+"""
+FindFlow Benchmark Paketi
+=========================
+
+Performans ölçüm betikleri. Depo kök dizininden modül olarak çalıştırılır:
+
+    python -m benchmarks.bench_price_parser
+"""
@@ -0,0 +1,311 @@
+"""
+/ask Soru-Cevap Akışı Uçtan Uca Benchmark'ı
+===========================================
+
+categories.json içindeki her kategori için tam bir anket oturumunu (step 0,
+kategori seçimi, her spec cevabı, bütçe bandı ve son öneriler) /ask
+endpoint'ine tekrar oynatır. Her adımın p50/p95/p99 gecikmesini, N eşzamanlı
+kullanıcıdaki throughput'u ve (isteğe bağlı) istek başına bellek
+ayırımlarını ölçer. Sonuçlar benchmarks/results/ altına JSON olarak yazılır.
+
+Adımlar, isteğin döndürdüğü cevaba göre etiketlenir:
+- categories: step 0 (kategori listesi)
+- spec:<id>: spec sorusu döndüren istek
+- budget_band: bütçe sorusu döndüren istek
+- recommendations: öneri döndüren son istek
+
+Modlar:
+- client (varsayılan): run.py Flask test client'ı ile süreç içinde çalışır.
+  Aksi belirtilmedikçe sahte Gemini ve SerpAPI backend'leri kullanılır
+  (bkz. app/fake_upstreams.py), böylece API kotası harcanmaz.
+- server: --url ile verilen çalışan bir sunucuya HTTP istekleri gönderir.
+
+Kullanım:
+    python -m benchmarks.bench_ask_flow --users 8 --sessions 3
+    python -m benchmarks.bench_ask_flow --users 1 --trace-allocations
+    python -m benchmarks.bench_ask_flow --mode server --url http://localhost:8080 --users 16
+    python -m benchmarks.bench_ask_flow --compare benchmarks/results/ask_flow-20250101-120000.json
+
+Not: tracemalloc süreç genelidir; istek başına ayırım değerleri yalnızca
+--users 1 ile kesindir.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import compare_results, run_metadata, summarize, write_results
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CATEGORIES_FILE = os.path.join(ROOT_DIR, 'categories.json')
+
+# Sonsuz soru döngüsüne karşı oturum başına maksimum istek
+MAX_STEPS = 40
+
+
+class _Recorder:
+    """İstek ölçümlerini thread-safe biçimde toplar."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.allocations = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.sessions = 0
+        self.failed_sessions = 0
+        self._lock = threading.Lock()
+
+    def record(self, label, duration_ms, ok, allocation=None):
+        with self._lock:
+            self.samples[label].append(duration_ms)
+            if allocation is not None:
+                self.allocations[label].append(allocation)
+            if not ok:
+                self.errors[label] += 1
+
+    def finish_session(self, ok):
+        with self._lock:
+            self.sessions += 1
+            if not ok:
+                self.failed_sessions += 1
+
+
+class _ClientTransport:
+    """run.py uygulamasına Flask test client ile istek gönderir."""
+
+    def __init__(self, trace_allocations):
+        os.environ.setdefault('FINDFLOW_SKIP_INSTALL', '1')
+        if ROOT_DIR not in sys.path:
+            sys.path.insert(0, ROOT_DIR)
+        os.chdir(ROOT_DIR)
+        import run
+        self.app = run.app
+        self.trace_allocations = trace_allocations
+        self._local = threading.local()
+
+    def post(self, payload):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+
+        allocation = None
+        if self.trace_allocations:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+        response = client.post('/ask', json=payload)
+        data = response.get_json(silent=True)
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        if self.trace_allocations:
+            after, peak = tracemalloc.get_traced_memory()
+            allocation = {'retained_bytes': after - before, 'peak_bytes': peak - before}
+        return response.status_code, data, duration_ms, allocation
+
+
+class _ServerTransport:
+    """Çalışan bir sunucuya HTTP ile istek gönderir."""
+
+    def __init__(self, base_url, timeout):
+        import requests
+        self.url = base_url.rstrip('/') + '/ask'
+        self.timeout = timeout
+        self._requests = requests
+        self._local = threading.local()
+
+    def post(self, payload):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._requests.Session()
+        start = time.perf_counter()
+        try:
+            response = session.post(self.url, json=payload, timeout=self.timeout)
+            status = response.status_code
+            data = response.json()
+        except Exception:
+            status, data = 0, None
+        return status, data, (time.perf_counter() - start) * 1000, None
+
+
+def _label(data):
+    """Cevaba göre adım etiketini belirler."""
+    if not isinstance(data, dict):
+        return 'invalid'
+    if 'recommendations' in data:
+        return 'recommendations'
+    if 'categories' in data:
+        return 'categories'
+    if data.get('id') == 'budget_band':
+        return 'budget_band'
+    if data.get('id'):
+        return f"spec:{data['id']}"
+    return 'error'
+
+
+def _choose(options, rng):
+    option = rng.choice(options)
+    if isinstance(option, dict):
+        return option.get('label') or option.get('id')
+    return option
+
+
+def replay_session(transport, recorder, category, language, seed):
+    """Bir kategori için step 0'dan önerilere kadar tam oturumu oynatır."""
+    rng = random.Random(seed)
+    step, answers = 0, []
+    ok = True
+    for _ in range(MAX_STEPS):
+        payload = {'step': step, 'category': category if step else '', 'answers': list(answers), 'language': language}
+        status, data, duration_ms, allocation = transport.post(payload)
+        label = _label(data)
+        request_ok = status == 200 and label not in ('invalid', 'error')
+        recorder.record(label, duration_ms, request_ok, allocation)
+        if not request_ok:
+            ok = False
+            break
+        if label == 'recommendations':
+            break
+        if label == 'categories':
+            step = 1
+            continue
+        options = data.get('options') or []
+        if not options:
+            ok = False
+            break
+        answers.append(_choose(options, rng))
+        step += 1
+    else:
+        ok = False
+    recorder.finish_session(ok)
+
+
+def _mean(values):
+    return round(sum(values) / len(values), 1) if values else None
+
+
+def build_report(recorder, args, wall_seconds, categories):
+    total_requests = sum(len(v) for v in recorder.samples.values())
+    steps = {}
+    for label, durations in sorted(recorder.samples.items()):
+        stats = summarize(durations)
+        stats['errors'] = recorder.errors.get(label, 0)
+        allocations = recorder.allocations.get(label)
+        if allocations:
+            stats['alloc_retained_kib_mean'] = _mean([a['retained_bytes'] / 1024 for a in allocations])
+            stats['alloc_peak_kib_mean'] = _mean([a['peak_bytes'] / 1024 for a in allocations])
+        steps[label] = stats
+
+    all_durations = [d for durations in recorder.samples.values() for d in durations]
+    return {
+        'benchmark': 'ask_flow',
+        'metadata': run_metadata(),
+        'config': {
+            'mode': args.mode,
+            'users': args.users,
+            'sessions_per_category': args.sessions,
+            'language': args.language,
+            'seed': args.seed,
+            'categories': categories,
+            'allocations_exact': bool(args.trace_allocations and args.users == 1)
+        },
+        'throughput': {
+            'wall_seconds': round(wall_seconds, 3),
+            'requests': total_requests,
+            'requests_per_second': round(total_requests / wall_seconds, 2) if wall_seconds else None,
+            'sessions': recorder.sessions,
+            'failed_sessions': recorder.failed_sessions,
+            'sessions_per_second': round(recorder.sessions / wall_seconds, 2) if wall_seconds else None
+        },
+        'overall': summarize(all_durations),
+        'steps': steps
+    }
+
+
+def print_report(report):
+    throughput = report['throughput']
+    print(f"\n📊 /ask benchmark - {report['config']['users']} eşzamanlı kullanıcı, mod: {report['config']['mode']}")
+    print(f"   {throughput['requests']} istek, {throughput['sessions']} oturum "
+          f"({throughput['failed_sessions']} başarısız), {throughput['wall_seconds']} s")
+    print(f"   Throughput: {throughput['requests_per_second']} istek/s, {throughput['sessions_per_second']} oturum/s\n")
+    print(f"   {'adım':<32}{'n':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'hata':>6}{'alloc KiB':>11}")
+    for label, stats in report['steps'].items():
+        alloc = stats.get('alloc_peak_kib_mean')
+        print(f"   {label:<32}{stats['count']:>6}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}"
+              f"{stats['p99_ms']:>10.1f}{stats['errors']:>6}{(alloc if alloc is not None else '-'):>11}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='/ask uçtan uca gecikme benchmark')
+    parser.add_argument('--mode', choices=('client', 'server'), default='client')
+    parser.add_argument('--url', default='http://localhost:8080', help='server modunda hedef adres')
+    parser.add_argument('--users', type=int, default=4, help='eşzamanlı kullanıcı (worker) sayısı')
+    parser.add_argument('--sessions', type=int, default=1, help='kategori başına oturum sayısı')
+    parser.add_argument('--language', choices=('tr', 'en'), default='tr')
+    parser.add_argument('--categories', nargs='*', help='yalnızca bu kategoriler (varsayılan: tümü)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--timeout', type=float, default=45.0, help='server modunda istek zaman aşımı (frontend ile aynı)')
+    parser.add_argument('--trace-allocations', action='store_true', help='tracemalloc ile istek başına ayırımları ölç')
+    parser.add_argument('--real-upstreams', action='store_true', help='client modunda gerçek Gemini/SerpAPI kullan')
+    parser.add_argument('--verbose', action='store_true', help='uygulama loglarını gizleme')
+    parser.add_argument('--output', help='sonuç dosyası (varsayılan: benchmarks/results/ask_flow-<zaman>.json)')
+    parser.add_argument('--compare', help='p95 değerlerinin karşılaştırılacağı önceki sonuç dosyası')
+    args = parser.parse_args(argv)
+
+    with open(CATEGORIES_FILE, 'r', encoding='utf-8') as f:
+        categories = args.categories or list(json.load(f).keys())
+
+    if args.mode == 'client' and not args.real_upstreams:
+        os.environ.setdefault('GEMINI_BACKEND', 'fake')
+        os.environ.setdefault('SERPAPI_BACKEND', 'fake')
+
+    if args.trace_allocations and args.mode == 'client':
+        if args.users > 1:
+            print("⚠️ tracemalloc süreç geneli: ayırım değerleri yalnızca --users 1 ile kesin")
+        tracemalloc.start()
+
+    # Uygulama her istekte yoğun log basar; ölçümü bozmaması için gizlenir
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+
+    with quiet:
+        if args.mode == 'client':
+            transport = _ClientTransport(args.trace_allocations)
+        else:
+            transport = _ServerTransport(args.url, args.timeout)
+
+        recorder = _Recorder()
+        jobs = [(category, args.seed + i * 1000 + n)
+                for i, category in enumerate(categories)
+                for n in range(args.sessions)]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.users) as pool:
+            futures = [pool.submit(replay_session, transport, recorder, category, args.language, seed)
+                       for category, seed in jobs]
+            for future in futures:
+                future.result()
+        wall_seconds = time.perf_counter() - start
+
+    report = build_report(recorder, args, wall_seconds, categories)
+    print_report(report)
+
+    if args.compare:
+        print(f"\n🔁 Karşılaştırma (p95): {args.compare}")
+        for name, old, new, change in compare_results(args.compare, report):
+            print(f"   {name:<32}{old:>10.1f} → {new:>10.1f} ms ({change:+.1f}%)")
+
+    path = write_results('ask_flow', report, args.output)
+    print(f"\n💾 Sonuçlar: {path}")
+    return 1 if recorder.failed_sessions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Toplu Kategori Tespiti Benchmark'ı
+==================================
+
+CategoryGenerator.batch_category_detection'ın farklı batch boyutlarında
+saniyede çözdüğü sorgu sayısını sahte Gemini backend'i ile ölçer. Sorguların
+bir kısmı yerelde (exact/local) çözülür, kalanı AI gruplarına düşer; gecikme
+sahte backend'in sabit gecikmesidir, böylece sonuçlar çağrı sayısını yansıtır.
+
+Kullanım:
+    python -m benchmarks.bench_batch_detection
+    python -m benchmarks.bench_batch_detection --queries 400 --latency-ms 200 --sizes 1 10 50
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+from benchmarks.common import run_metadata, write_results
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_queries(names, count):
+    """Yarısı yerelde, yarısı AI ile çözülecek deterministik sorgular."""
+    local = ['kablosuz kulaklık', 'iphone 15', 'oyuncu faresi', 'klimalar', 'mekanik klavye', 'oled tv']
+    queries = []
+    for i in range(count):
+        if i % 2:
+            queries.append(f'{local[i % len(local)]} {i}')
+        else:
+            # Yerel eşleştiricinin tanımadığı, sahte modelin isimden tanıdığı sorgular
+            queries.append(f'zz{names[i % len(names)].lower()} {i}')
+    return queries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Toplu kategori tespiti benchmark')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 5, 25, 100])
+    parser.add_argument('--latency-ms', type=int, default=100, help='sahte Gemini gecikmesi')
+    parser.add_argument('--output', help='sonuç dosyası (varsayılan: benchmarks/results/batch_detection-<zaman>.json)')
+    args = parser.parse_args(argv)
+
+    os.environ['GEMINI_BACKEND'] = 'fake'
+    os.environ['FAKE_GEMINI_LATENCY'] = f'fixed:{args.latency_ms}'
+    os.environ.setdefault('FAKE_GEMINI_ERROR_RATE', '0')
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    os.chdir(ROOT_DIR)
+
+    results = {}
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        from app.category_generator import CategoryGenerator
+
+        names = list(CategoryGenerator()._load_categories())
+        queries = make_queries(names, args.queries)
+        for size in args.sizes:
+            generator = CategoryGenerator()  # boş önbellek
+            start = time.perf_counter()
+            batch_results, stats = generator.batch_category_detection(queries, batch_size=size)
+            elapsed = time.perf_counter() - start
+            results[str(size)] = {
+                'batch_size': size,
+                'seconds': round(elapsed, 3),
+                'queries_per_second': round(len(queries) / elapsed, 1),
+                'resolved': sum(1 for r in batch_results if r['category']),
+                'stats': stats
+            }
+
+    print(f"\n📦 Toplu tespit: {args.queries} sorgu, sahte Gemini {args.latency_ms} ms")
+    print(f"   {'batch':>6}{'çağrı':>7}{'süre (s)':>10}{'sorgu/s':>10}{'çözülen':>9}")
+    for stats in results.values():
+        print(f"   {stats['batch_size']:>6}{stats['stats']['ai_batches']:>7}{stats['seconds']:>10.2f}"
+              f"{stats['queries_per_second']:>10.1f}{stats['resolved']:>9}")
+
+    report = {
+        'benchmark': 'batch_detection',
+        'metadata': run_metadata(),
+        'config': {'queries': args.queries, 'latency_ms': args.latency_ms},
+        'results': results
+    }
+    path = write_results('batch_detection', report, args.output)
+    print(f"\n💾 Sonuçlar: {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
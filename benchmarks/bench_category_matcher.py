@@ -0,0 +1,105 @@
+"""
+Yerel Kategori Eşleştirici Benchmark'ı
+======================================
+
+category_queries.json içindeki etiketli sorgular (katalogda olmayan ürünler
+için "expected": null) üzerinde app.category_index.CategoryMatcher'ın
+eşik bazında doğruluğunu ve sorgu başına süresini ölçer.
+
+Her eşik için:
+- precision: Yerelde kabul edilen eşleşmelerin doğru olanlarının oranı
+- recall: Katalogdaki sorguların yerelde doğru çözülenlerinin oranı
+- ai: AI tanımaya bırakılan sorguların oranı
+
+Önerilen eşik, --min-precision'ı sağlayan en düşük eşiktir; bu değer
+app.category_index.DEFAULT_MATCH_THRESHOLD'u kalibre etmek için kullanılır.
+
+Kullanım:
+    python -m benchmarks.bench_category_matcher
+    python -m benchmarks.bench_category_matcher --min-precision 0.98 --verbose
+
+Mevcut eşikte yanlış kabul edilen eşleşme varsa betik 1 çıkış koduyla biter.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from app.category_index import get_category_matcher, match_threshold
+
+CORPUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'category_queries.json')
+THRESHOLDS = [round(0.05 * i, 2) for i in range(4, 20)]
+
+
+def load_corpus(path=CORPUS_FILE):
+    """Etiketli sorgu korpusunu yükler."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['queries']
+
+
+def evaluate(scored, threshold):
+    """(beklenen, sonuç) çiftleri için eşikteki precision/recall/AI oranı."""
+    accepted = correct = 0
+    for expected, result in scored:
+        if result is not None and result['confidence'] >= threshold:
+            accepted += 1
+            correct += result['category'] == expected
+    positives = sum(1 for expected, _ in scored if expected is not None)
+    return {
+        'precision': correct / accepted if accepted else 1.0,
+        'recall': correct / positives if positives else 0.0,
+        'ai': 1 - accepted / len(scored)
+    }
+
+
+def measure(matcher, queries, iterations):
+    """Sorgu başına ortalama süre (mikrosaniye)."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for query in queries:
+            matcher.score(query)
+    return (time.perf_counter() - start) / (iterations * len(queries)) * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Yerel kategori eşleştirici benchmark')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--min-precision', type=float, default=1.0)
+    parser.add_argument('--verbose', action='store_true', help='sorgu bazında sonuçları yazdır')
+    args = parser.parse_args(argv)
+
+    matcher = get_category_matcher()
+    corpus = load_corpus()
+    scored = [(case['expected'], matcher.score(case['query'])) for case in corpus]
+    current = match_threshold()
+
+    if args.verbose:
+        for case, (expected, result) in zip(corpus, scored):
+            found = f"{result['category']} ({result['method']}, {result['confidence']:.3f})" if result else '-'
+            mark = '✅' if result and result['category'] == expected else '❌' if expected else '·'
+            print(f"  {mark} {case['query']:<28} beklenen={expected or '-':<16} bulunan={found}")
+
+    print(f"🧪 {len(corpus)} sorgu ({sum(1 for e, _ in scored if e is None)} katalog dışı)")
+    print(f"   {'eşik':>6}{'precision':>11}{'recall':>9}{'AI':>7}")
+    suggested = None
+    for threshold in THRESHOLDS:
+        stats = evaluate(scored, threshold)
+        if suggested is None and stats['precision'] >= args.min_precision:
+            suggested = threshold
+        marker = ' ◀ mevcut' if abs(threshold - current) < 1e-9 else ''
+        print(f"   {threshold:>6.2f}{stats['precision']:>11.3f}{stats['recall']:>9.3f}{stats['ai']:>7.1%}{marker}")
+
+    print(f"🎯 Önerilen eşik (precision ≥ {args.min_precision}): {suggested}")
+    print(f"⚡ score(): {measure(matcher, [case['query'] for case in corpus], args.iterations):.1f} µs/sorgu")
+
+    wrong = [(expected, result) for expected, result in scored
+             if result and result['confidence'] >= current and result['category'] != expected]
+    for expected, result in wrong:
+        print(f"  ❌ yanlış kabul: {result['category']} ({result['method']}, {result['confidence']:.3f}), beklenen={expected}")
+    return 1 if wrong else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Devre Kesici Benchmark'ı
+========================
+
+Sahte upstream'lerle iki olay senaryosu kurar ve farklı tercihlerle
+(önbellek/birleştirme devreye girmesin diye) art arda
+ModernSearchEngine.search_products çağırır:
+
+- serpapi: SerpAPI her istekte `--latency-ms` sonra 500 döner
+- gemini: Gemini yanıt veriyor ama her çağrı `--latency-ms` sürüyor
+  (yavaş çağrı eşiği benchmark için latency/2'ye çekilir; sahte Gemini'nin
+  hataları 429 olduğundan devre kesiciye sayılmaz)
+
+Her senaryo devre kesici kapalıyken (her istek arızalı upstream'i bekler)
+ve açıkken çalıştırılır; istek gecikmesinin ortalama/p50/p95/max değerleri
+ve yanıt durumları raporlanır.
+
+Kullanım:
+    python -m benchmarks.bench_circuit_breaker
+    python -m benchmarks.bench_circuit_breaker --requests 20 --latency-ms 2000
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+from benchmarks.common import summarize
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_requests(count, offset):
+    """Farklı tercihlerle `count` arama; (süreler ms, durum sayıları)."""
+    from app.search_engine import ModernSearchEngine
+
+    durations = []
+    statuses = {}
+    for i in range(count):
+        preferences = {'category': 'Phone', 'budget_min': 1000 + offset + i, 'budget_max': 40000,
+                       'features': [f'özellik {offset + i}'], 'language': 'tr'}
+        start = time.perf_counter()
+        result = ModernSearchEngine().search_products(preferences)
+        durations.append((time.perf_counter() - start) * 1000)
+        status = result['status'] + ('+' + ','.join(result['degraded']) if result.get('degraded') else '')
+        statuses[status] = statuses.get(status, 0) + 1
+    return durations, statuses
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Devre kesici benchmark')
+    parser.add_argument('--requests', type=int, default=20)
+    parser.add_argument('--latency-ms', type=int, default=1000, help='arızalı upstream\'in gecikmesi')
+    args = parser.parse_args(argv)
+
+    os.environ['GEMINI_BACKEND'] = 'fake'
+    os.environ['SERPAPI_BACKEND'] = 'fake'
+    os.environ['FAKE_GEMINI_LATENCY'] = 'fixed:20'
+    os.environ['FAKE_SERPAPI_LATENCY'] = 'fixed:20'
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    os.chdir(ROOT_DIR)
+
+    rows = []
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        from app import circuit_breaker, fake_upstreams
+        from app.circuit_breaker import CircuitBreaker, configured_breakers
+        from app.fake_upstreams import LatencyProfile
+
+        fake_upstreams.get_fake_serpapi_url()
+        serpapi = fake_upstreams._serpapi_server
+        healthy = serpapi.latency
+        offset = 0
+        for scenario in ('serpapi', 'gemini'):
+            for enabled in (False, True):
+                for name, settings in configured_breakers().items():
+                    settings = dict(settings, enabled=enabled)
+                    if name == 'gemini':
+                        settings['slow_seconds'] = args.latency_ms / 2000
+                    circuit_breaker._breakers[name] = CircuitBreaker(name, **settings)
+                if scenario == 'serpapi':
+                    serpapi.latency = LatencyProfile(f'fixed:{args.latency_ms}', error_rate=1.0)
+                    serpapi.error_statuses = [500]
+                else:
+                    serpapi.latency = healthy
+                    os.environ['FAKE_GEMINI_LATENCY'] = f'fixed:{args.latency_ms}'
+                durations, statuses = run_requests(args.requests, offset)
+                offset += args.requests
+                rows.append((scenario, enabled, summarize(durations), statuses))
+            os.environ['FAKE_GEMINI_LATENCY'] = 'fixed:20'
+
+    print(f"\n🔌 {args.requests} ardışık arama, arızalı upstream gecikmesi {args.latency_ms} ms")
+    for scenario, enabled, stats, statuses in rows:
+        label = f"{scenario} {'devre kesici' if enabled else 'kesicisiz'}"
+        print(f"  ⚡ {label:<22} ort {stats['mean_ms']:6.0f} ms  p50 {stats['p50_ms']:6.0f} ms  "
+              f"p95 {stats['p95_ms']:6.0f} ms  max {stats['max_ms']:6.0f} ms  {statuses}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+İstek Süre Bütçesi Benchmark'ı
+==============================
+
+Yavaş ve hata veren sahte upstream'lerle ModernSearchEngine.search_products
+çağırır:
+
+- Gemini: her deneme `--gemini-ms` sonra 429 döner (governor duraklar,
+  yeniden deneme kuyrukta bekler)
+- SerpAPI: her sayfa `--serpapi-ms` sonra 500 döner
+
+Aramalar deadline olmadan ve `--budget` saniyelik istek bütçesi
+(app.deadline) içinde çalıştırılır; istek süresinin bütçeyi aşıp aşmadığı
+ve sonuçların degraded işaretleri raporlanır. Devre kesiciler ve hedge
+kapatılır; yalnızca bütçenin etkisi ölçülür.
+
+Kullanım:
+    python -m benchmarks.bench_deadline
+    python -m benchmarks.bench_deadline --budget 3 --requests 6
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+from benchmarks.common import summarize
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_requests(count, offset, budget):
+    """Farklı tercihlerle `count` arama; (süreler ms, durum sayıları)."""
+    from app.deadline import request_deadline
+    from app.search_engine import ModernSearchEngine
+
+    durations = []
+    statuses = {}
+    for i in range(count):
+        preferences = {'category': 'Laptop', 'budget_min': 20000 + offset + i, 'budget_max': 60000,
+                       'features': [], 'language': 'tr'}
+        start = time.perf_counter()
+        if budget is None:
+            result = ModernSearchEngine().search_products(preferences)
+        else:
+            with request_deadline(budget):
+                result = ModernSearchEngine().search_products(preferences)
+        durations.append((time.perf_counter() - start) * 1000)
+        status = result['status'] + ('+' + ','.join(result['degraded']) if result.get('degraded') else '')
+        statuses[status] = statuses.get(status, 0) + 1
+    return durations, statuses
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='İstek süre bütçesi benchmark')
+    parser.add_argument('--requests', type=int, default=4)
+    parser.add_argument('--budget', type=float, default=5.0, help='istek bütçesi (saniye)')
+    parser.add_argument('--gemini-ms', type=int, default=2500)
+    parser.add_argument('--serpapi-ms', type=int, default=3000)
+    args = parser.parse_args(argv)
+
+    os.environ['GEMINI_BACKEND'] = 'fake'
+    os.environ['SERPAPI_BACKEND'] = 'fake'
+    os.environ['FAKE_GEMINI_LATENCY'] = f'fixed:{args.gemini_ms}'
+    os.environ['FAKE_GEMINI_ERROR_RATE'] = '1.0'
+    os.environ['FAKE_SERPAPI_LATENCY'] = f'fixed:{args.serpapi_ms}'
+    os.environ['FAKE_SERPAPI_ERROR_RATE'] = '1.0'
+    os.environ['CIRCUIT_BREAKERS'] = 'gemini.enabled=0,serpapi.enabled=0'
+    os.environ['GEMINI_HEDGING'] = 'grounding=0'
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    os.chdir(ROOT_DIR)
+
+    rows = []
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        from app import fake_upstreams
+
+        fake_upstreams.get_fake_serpapi_url()
+        fake_upstreams._serpapi_server.error_statuses = [500]
+        for offset, (name, budget) in enumerate((('bütçesiz', None), (f'{args.budget:g} sn bütçe', args.budget))):
+            durations, statuses = run_requests(args.requests, offset * args.requests, budget)
+            rows.append((name, summarize(durations), statuses))
+
+    print(f"\n⏱️ {args.requests} arama, Gemini {args.gemini_ms} ms sonra 429, SerpAPI {args.serpapi_ms} ms sonra 500")
+    for name, stats, statuses in rows:
+        print(f"  ⚡ {name:<12} p50 {stats['p50_ms']:6.0f} ms  max {stats['max_ms']:6.0f} ms  {statuses}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Gemini Hedge İstekleri Benchmark'ı
+==================================
+
+Ara sıra takılan sahte Gemini'ye (`tail` gecikme profili: lognormal
+gövde + `--slow-rate` olasılıkla `--slow-ms` takılma) `--threads` thread
+ile toplam `--calls` grounding çağrısı gönderir ve generate_with_retry'ı
+hedge kapalı ve açık (p`--percentile`) karşılaştırır. Çağrı gecikmesinin
+p50/p95/p99/max değerleri, hedge'in ek upstream yükü ve atlanan hedge'ler
+(bütçe / boş slot yok) raporlanır. Kota varsayılan olarak çağrı hızının
+üzerinde tutulur (UPSTREAM_LIMITS); kota doluyken hedge gönderilmez.
+
+Kullanım:
+    python -m benchmarks.bench_hedging
+    python -m benchmarks.bench_hedging --calls 600 --slow-rate 0.03 --percentile 90
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import threading
+import time
+
+from benchmarks.common import summarize
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_calls(calls, threads, model):
+    """`threads` thread ile toplam `calls` çağrı; süreler (ms)."""
+    from app.config import generate_with_retry
+
+    remaining = [calls]
+    lock = threading.Lock()
+    durations = []
+
+    def worker():
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            start = time.perf_counter()
+            generate_with_retry(model, 'USER PREFERENCES: {"category": "Phone"}', max_retries=2, delay=1,
+                                call_site='grounding')
+            with lock:
+                durations.append((time.perf_counter() - start) * 1000)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return durations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Gemini hedge benchmark')
+    parser.add_argument('--calls', type=int, default=400)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--median-ms', type=int, default=150)
+    parser.add_argument('--slow-rate', type=float, default=0.04, help='takılan çağrı oranı')
+    parser.add_argument('--slow-ms', type=int, default=3000)
+    parser.add_argument('--percentile', type=float, default=95)
+    args = parser.parse_args(argv)
+
+    os.environ['GEMINI_BACKEND'] = 'fake'
+    os.environ['FAKE_GEMINI_ERROR_RATE'] = '0'
+    os.environ.setdefault('UPSTREAM_LIMITS', 'gemini.rate=6000')
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+
+    rows = []
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        from app import hedging
+        from app.fake_upstreams import FakeGeminiModel, LatencyProfile
+
+        for name, policy in (('hedge kapalı', None),
+                             (f'hedge p{args.percentile:g}', hedging.HedgePolicy('grounding', args.percentile))):
+            hedging._policies['grounding'] = policy
+            model = FakeGeminiModel(LatencyProfile(
+                f'tail:{args.median_ms}:0.3:{args.slow_rate}:{args.slow_ms}', seed=7))
+            upstream_calls = [0]
+            generate = model.generate_content
+
+            def counted(prompt, _generate=generate, **kwargs):
+                upstream_calls[0] += 1
+                return _generate(prompt, **kwargs)
+
+            model.generate_content = counted
+            results = ('sent', 'won', 'skipped_budget', 'skipped_slot')
+            before = {result: hedging.HEDGES.value(call_site='grounding', result=result) for result in results}
+            durations = run_calls(args.calls, args.threads, model)
+            hedges = {result: hedging.HEDGES.value(call_site='grounding', result=result) - before[result]
+                      for result in results}
+            rows.append((name, summarize(durations), upstream_calls[0], hedges))
+
+    print(f"\n🪁 {args.calls} grounding çağrısı / {args.threads} thread, sahte Gemini medyan {args.median_ms} ms, "
+          f"%{args.slow_rate * 100:g} çağrı {args.slow_ms} ms takılıyor")
+    for name, stats, upstream, hedges in rows:
+        print(f"  ⚡ {name:<12} p50 {stats['p50_ms']:6.0f} ms  p95 {stats['p95_ms']:6.0f} ms  "
+              f"p99 {stats['p99_ms']:6.0f} ms  max {stats['max_ms']:6.0f} ms  "
+              f"upstream {upstream:>4} (+%{(upstream - args.calls) / args.calls * 100:.1f})  "
+              f"hedge {hedges['sent']:.0f} (kazanan {hedges['won']:.0f}, atlanan "
+              f"{hedges['skipped_budget'] + hedges['skipped_slot']:.0f})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""
+Agent ve Ayrıştırıcı Sıcak Yol Micro-Benchmark'ları
+==================================================
+
+Her istekte çalışan fonksiyonları, 10/100/1000 boyutlarında üretilmiş
+sentetik kataloglar üzerinde ölçer. Böylece her fonksiyonun katalog boyutu
+ve cevap derinliği ile nasıl ölçeklendiği görülebilir.
+
+Boyut N için:
+- Katalog N kategori içerir; ölçülen kategori N spec'e sahiptir
+- Cevap derinliği N'dir (her spec cevaplanmış)
+- Tek öğe işleyen fonksiyonlar N farklı girdi üzerinde çalıştırılır
+
+Ölçülen fonksiyonlar:
+- Agent._analyze_current_preferences (sıcak ve soğuk cevap önbelleği)
+- Agent._determine_next_followup
+- Agent._format_question
+- Agent._extract_budget_range
+- ModernSearchEngine._extract_price_value
+- ModernSearchEngine._format_shopping_result
+- ModernSearchEngine._build_shopping_query
+- CategoryGenerator._parse_ai_response
+
+Kullanım:
+    python -m benchmarks.bench_hot_paths
+    python -m benchmarks.bench_hot_paths --sizes 10 100 --only analyze followup
+    python -m benchmarks.bench_hot_paths --compare benchmarks/results/hot_paths-20250101-120000.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+from benchmarks.common import compare_results, run_metadata, write_results
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SIZES = (10, 100, 1000)
+
+
+# ---------------------------------------------------------------------------
+# Sentetik veri
+# ---------------------------------------------------------------------------
+
+def make_spec(i, rng):
+    """Gerçek categories.json spec'lerine benzeyen sentetik bir spec üretir."""
+    spec = {
+        'id': f'spec_{i}',
+        'label': {'tr': f'Özellik {i} sizin için ne kadar önemli?', 'en': f'How important is feature {i}?'},
+        'emoji': '⚙️',
+        'tooltip': {'tr': f'Özellik {i} seçimi fiyatı etkiler.', 'en': f'Feature {i} affects the price.'},
+        'weight': round(rng.uniform(0.3, 1.0), 2)
+    }
+    if i % 8 == 7:
+        spec['type'] = 'boolean'
+    else:
+        spec['type'] = 'single_choice'
+        spec['options'] = [
+            {'id': f'opt_{i}_{j}', 'label': {'tr': f'Seçenek {i}-{j}', 'en': f'Option {i}-{j}'}}
+            for j in range(4)
+        ] + [{'id': 'no_preference', 'label': {'tr': 'Fark etmez', 'en': 'No preference'}}]
+    if i % 10 == 9:
+        spec['depends_on'] = [{'id': f'spec_{i - 1}', 'eq': f'opt_{i - 1}_0'}]
+    return spec
+
+
+def make_catalog(n, seed=0):
+    """N kategorili katalog; ilk kategori N spec, diğerleri 5 spec içerir."""
+    rng = random.Random(seed)
+    catalog = {}
+    for c in range(n):
+        spec_count = n if c == 0 else 5
+        catalog[f'Synthetic {c}'] = {
+            'budget_bands': {
+                'tr': ['1-3k₺', '3-7k₺', '7-15k₺', '15-30k₺', '30k₺+'],
+                'en': ['$30-100', '$100-200', '$200-500', '$500-1000', '$1000+']
+            },
+            'specs': [make_spec(i, rng) for i in range(spec_count)]
+        }
+    return catalog
+
+
+def make_answers(specs, rng, language='tr'):
+    answers = []
+    for spec in specs:
+        if spec['type'] == 'boolean':
+            answers.append(rng.choice(['Evet', 'Hayır', 'Fark etmez']))
+        else:
+            answers.append(rng.choice(spec['options'])['label'][language])
+    return answers
+
+
+def make_shopping_results(n, rng):
+    results = []
+    for i in range(n):
+        price = round(rng.uniform(500, 60000), 2)
+        results.append({
+            'title': f'akıllı telefon Model {i}' if i % 6 else f'telefon kılıfı {i}',
+            'price': f"₺{price:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.'),
+            'extracted_price': price if i % 3 else '',
+            'source': 'hepsiburada.com',
+            'link': f'https://www.hepsiburada.com/urun-p-{i}',
+            'thumbnail': '',
+            'rating': 4.5,
+            'reviews': 120
+        })
+    return results
+
+
+def make_price_strings(n, rng):
+    formats = ('₺{:,.2f}', '{:,.2f} TL', '{:.0f} ₺', '${:,.2f}', 'TRY {:.2f}')
+    prices = []
+    for i in range(n):
+        text = formats[i % len(formats)].format(rng.uniform(100, 90000))
+        if i % 2:
+            text = text.replace(',', 'X').replace('.', ',').replace('X', '.')
+        prices.append(text)
+    return prices
+
+
+def make_ai_response(n, category_name):
+    rng = random.Random(n)
+    body = json.dumps({
+        'budget_bands': {'tr': ['1-3k₺', '3-7k₺'], 'en': ['1-3k₺', '3-7k₺']},
+        'specs': [make_spec(i, rng) for i in range(n)]
+    }, ensure_ascii=False, indent=2)
+    return f"Here is the category specification for {category_name}:\n```json\n{body}\n```\nLet me know."
+
+
+# ---------------------------------------------------------------------------
+# Senaryolar
+# ---------------------------------------------------------------------------
+
+def build_scenarios(n, agent, engine, generator):
+    """Boyut N için (isim, çağrı, öğe sayısı) üçlülerini hazırlar."""
+    rng = random.Random(n)
+    catalog = make_catalog(n)
+    category = 'Synthetic 0'
+    specs = catalog[category]['specs']
+    answers = make_answers(specs, rng)
+    agent.categories = catalog
+
+    half_prefs = agent._analyze_current_preferences(answers[:n // 2], specs, category)
+    confidence = agent._calculate_confidence_score(half_prefs, specs)
+    asked = [spec['id'] for spec in specs[:n // 2]]
+
+    bands = [{'budget_band': f'{i}-{i + 5}k₺'} for i in range(n)]
+    price_strings = make_price_strings(n, rng)
+    shopping = make_shopping_results(n, rng)
+    shopping_prefs = {'category': 'Phone', 'budget_min': 15000, 'budget_max': 30000}
+    # search_engine'deki gibi kategori filtresi arama başına bir kez çözülür
+    from app.shopping_filter import get_shopping_filter
+    shopping_filter = get_shopping_filter().for_category(shopping_prefs['category'])
+    query_prefs = [
+        {'category': name, 'brand_preference': rng.choice(['apple', 'samsung', 'no_preference', '']),
+         'usage_type': rng.choice(['photography', 'gaming', ''])}
+        for name in list(catalog)[:n - 3] + ['Phone', 'Tire', 'Headphones']
+    ]
+    ai_text = make_ai_response(n, category)
+
+    def analyze_cold():
+        agent.answer_normalizer.clear()
+        agent._analyze_current_preferences(answers, specs, category)
+
+    return {
+        'analyze': ('Agent._analyze_current_preferences',
+                    lambda: agent._analyze_current_preferences(answers, specs, category), 1),
+        'analyze_cold': ('Agent._analyze_current_preferences (cold cache)', analyze_cold, 1),
+        'followup': ('Agent._determine_next_followup',
+                     lambda: agent._determine_next_followup(specs, half_prefs, confidence, 'tr', category, asked), 1),
+        'format_question': ('Agent._format_question',
+                            lambda: [agent._format_question(spec, 'tr', reason='importance') for spec in specs], n),
+        'budget_range': ('Agent._extract_budget_range',
+                         lambda: [agent._extract_budget_range(prefs) for prefs in bands], n),
+        'price_value': ('ModernSearchEngine._extract_price_value',
+                        lambda: [engine._extract_price_value(text) for text in price_strings], n),
+        'shopping_result': ('ModernSearchEngine._format_shopping_result',
+                            lambda: [engine._format_shopping_result(result, shopping_prefs, shopping_filter)
+                                     for result in shopping], n),
+        'shopping_query': ('ModernSearchEngine._build_shopping_query',
+                           lambda: [engine._build_shopping_query(prefs) for prefs in query_prefs], len(query_prefs)),
+        'parse_ai': ('CategoryGenerator._parse_ai_response',
+                     lambda: generator._parse_ai_response(ai_text, category), 1)
+    }
+
+
+def time_scenario(func, repeats, min_run_seconds):
+    """
+    Çağrı sayısını bir çalıştırma en az min_run_seconds sürecek şekilde
+    kalibre eder, ardından repeats kez ölçer.
+
+    Returns:
+        tuple: (çağrı başına süreler listesi (saniye), çalıştırma başına çağrı sayısı)
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_run_seconds or number >= 1_000_000:
+            break
+        number *= 2 if elapsed * 10 < min_run_seconds else 1 + int(min_run_seconds / max(elapsed, 1e-9))
+
+    samples = [elapsed / number]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return samples, number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Sıcak yol micro-benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--only', nargs='*', help='yalnızca bu senaryolar (örn. analyze followup parse_ai)')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--min-run', type=float, default=0.05, help='tek ölçüm turunun minimum süresi (saniye)')
+    parser.add_argument('--output', help='sonuç dosyası (varsayılan: benchmarks/results/hot_paths-<zaman>.json)')
+    parser.add_argument('--compare', help='median değerlerinin karşılaştırılacağı önceki sonuç dosyası')
+    args = parser.parse_args(argv)
+
+    # Sınıflar başlatılırken gerçek API'lere bağlanılmasın
+    os.environ.setdefault('GEMINI_BACKEND', 'fake')
+    os.environ.setdefault('SERPAPI_BACKEND', 'fake')
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    os.chdir(ROOT_DIR)
+
+    results = {}
+    # Fonksiyonlar yoğun log basar; log maliyeti ölçüme dahil, çıktısı değil
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        from app.agent import Agent
+        from app.category_generator import CategoryGenerator
+        from app.search_engine import ModernSearchEngine
+
+        agent = Agent()
+        engine = ModernSearchEngine()
+        generator = CategoryGenerator()
+
+        for n in args.sizes:
+            for key, (name, func, items) in build_scenarios(n, agent, engine, generator).items():
+                if args.only and key not in args.only:
+                    continue
+                samples, number = time_scenario(func, args.repeats, args.min_run)
+                median = statistics.median(samples)
+                results[f'{key}@{n}'] = {
+                    'function': name,
+                    'size': n,
+                    'items_per_call': items,
+                    'calls_per_run': number,
+                    'median_us': round(median * 1e6, 3),
+                    'min_us': round(min(samples) * 1e6, 3),
+                    'per_item_us': round(median * 1e6 / items, 3)
+                }
+
+    report = {
+        'benchmark': 'hot_paths',
+        'metadata': run_metadata(),
+        'config': {'sizes': args.sizes, 'repeats': args.repeats, 'min_run_seconds': args.min_run},
+        'results': results
+    }
+
+    print(f"\n📊 Sıcak yol micro-benchmark ({args.repeats} tekrar, medyan)")
+    print(f"   {'senaryo':<22}{'N':>6}{'µs/çağrı':>14}{'µs/öğe':>12}{'x (N=ilk)':>11}")
+    first = {}
+    for key, stats in results.items():
+        scenario = key.split('@')[0]
+        base = first.setdefault(scenario, stats['median_us'])
+        ratio = stats['median_us'] / base if base else 0.0
+        print(f"   {scenario:<22}{stats['size']:>6}{stats['median_us']:>14.1f}{stats['per_item_us']:>12.2f}{ratio:>11.1f}")
+
+    if args.compare:
+        print(f"\n🔁 Karşılaştırma (median µs): {args.compare}")
+        for name, old, new, change in compare_results(args.compare, report, key='results', metric='median_us'):
+            print(f"   {name:<28}{old:>12.1f} → {new:>12.1f} ({change:+.1f}%)")
+
+    path = write_results('hot_paths', report, args.output)
+    print(f"\n💾 Sonuçlar: {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+JSON Yanıt Kodlama Benchmark'ı
+==============================
+
+Büyük bir /ask öneri yanıtını (20 öneri, 30 shopping sonucu, grounding
+metni, tercihler), /categories payload'ını ve bir soru payload'ını Flask'ın
+varsayılan JSON sağlayıcısı ile app.json_codec backend'leri üzerinde
+kodlar ve çağrı başına süreyi karşılaştırır. Çıktıların aynı JSON'a
+çözüldüğü de kontrol edilir. Öneri yanıtı ayrıca v1 (tam) ve v2 (kompakt)
+yanıt şemalarında boyut ve kodlama süresi olarak karşılaştırılır.
+
+Kullanım:
+    python -m benchmarks.bench_json_encoding
+    python -m benchmarks.bench_json_encoding --iterations 5000
+
+Çıktılar farklı çözülürse betik 1 çıkış koduyla biter.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app import json_codec
+from app.agent import Agent
+from app.fallback_catalog import get_fallback_catalog
+from app.response_schema import compact_response
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_recommendation_response(count=20, shopping_count=30):
+    """
+    /ask son adımına benzer bir yanıt üretir: öneriler, shopping sonuçlarının
+    puanlanmış ilk `count` tanesidir (gerçek akıştaki gibi aynı sözlükler).
+    """
+    products = get_fallback_catalog().lookup('Phone') + get_fallback_catalog().lookup('Headphones')
+    shopping = []
+    for i in range(shopping_count):
+        product = products[i % len(products)]
+        shopping.append({
+            'title': f"{product['title']} #{i}",
+            'price': product['price'],
+            'source': product['source_site'],
+            'link': f"{product['product_url']}&p={i}",
+            'link_status': 'serpapi_direct',
+            'link_message': 'SerpAPI link - doğrulama atlandı',
+            'thumbnail': f'https://encrypted-tbn0.gstatic.com/shopping?q=tbn:{i:04d}',
+            'rating': 4.5,
+            'reviews': 120 + i
+        })
+    recommendations = shopping[:count]
+    for rec in recommendations:
+        rec.update(features=rec['title'].split()[:3], pros=['SerpAPI doğrulanmış ürün', 'Gerçek fiyat bilgisi'],
+                   cons=['Stok durumu değişebilir'], match_score=85, source_site=rec['source'],
+                   why_recommended=f"SerpAPI'den doğrulanmış ürün - {rec['source']}'den önerildi")
+    return {
+        'type': 'modern_recommendation',
+        'grounding_results': {'query': 'telefon 20000-40000 TL', 'response': 'Türkiye pazarında öne çıkan modeller ve güncel fiyatlar. ' * 80,
+                              'citations': []},
+        'shopping_results': shopping,
+        'sources': [],
+        'recommendations': recommendations,
+        'category': 'Phone',
+        'preferences': {'camera_quality': 'high', 'battery_life': 'long', 'budget_band': '20-40k₺'},
+        'confidence_score': 0.92,
+        'budget_filter_applied': True,
+        'original_count': count,
+        'filtered_count': count
+    }
+
+
+def per_call_us(func, iterations):
+    """func'ı iterations kez çağırır, çağrı başına mikrosaniyeyi döndürür."""
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='JSON yanıt kodlama benchmark')
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    flask_default = DefaultJSONProvider(Flask(__name__))
+    recommendation = make_recommendation_response()
+    categories = json_codec.load_file(os.path.join(ROOT_DIR, 'categories.json'))
+    agent = Agent()
+    category = next(iter(agent.categories))
+    spec = agent.categories[category]['specs'][0]
+    encoders = {'flask-default': lambda obj: flask_default.dumps(obj).encode('utf-8'),
+                'stdlib': lambda obj: json_codec._stdlib_dumps(obj, False)}
+    if json_codec.BACKEND == 'orjson':
+        encoders['orjson'] = json_codec.dumps
+    else:
+        print("⚠️ orjson backend'i kullanılmıyor, yalnızca standart json ölçülüyor")
+
+    failures = 0
+    for payload_name, payload in (('recommendation', recommendation), ('categories', categories)):
+        print(f"📦 {payload_name}: {len(json_codec.dumps(payload)):,} bytes (kompakt)")
+        for encoder_name, encode in encoders.items():
+            if json.loads(encode(payload)) != json.loads(json.dumps(payload)):
+                print(f"  ❌ {encoder_name}: çıktı farklı çözülüyor")
+                failures += 1
+            print(f"  ⚡ {encoder_name:<14}{per_call_us(lambda: encode(payload), args.iterations):>10.1f} µs")
+
+    v1_bytes = len(json_codec.dumps(recommendation))
+    v2_bytes = len(json_codec.dumps(compact_response(recommendation)))
+    print(f"📐 response schema (backend {json_codec.BACKEND})")
+    print(f"  📦 v1 {v1_bytes:,} bytes → v2 {v2_bytes:,} bytes ({(1 - v2_bytes / v1_bytes) * 100:.0f}% daha az)")
+    print(f"  ⚡ {'v1 encode':<16}{per_call_us(lambda: json_codec.dumps(recommendation), args.iterations):>8.1f} µs")
+    print(f"  ⚡ {'v2 build+encode':<16}"
+          f"{per_call_us(lambda: json_codec.dumps(compact_response(recommendation)), args.iterations):>8.1f} µs")
+
+    def question_uncached():
+        payload = dict(agent._build_question(spec, 'tr', 'mandatory'))
+        payload['progress'] = 40
+        return json_codec.dumps(payload)
+
+    def question_cached():
+        return json_codec.dumps(json_codec.with_fields(agent._format_question(spec, 'tr', 'mandatory'), progress=40))
+
+    print(f"❓ question payload ({category}/{spec['id']}, backend {json_codec.BACKEND})")
+    print(f"  ⚡ {'build+encode':<16}{per_call_us(question_uncached, args.iterations * 10):>8.2f} µs")
+    print(f"  ⚡ {'cached bytes':<16}{per_call_us(question_cached, args.iterations * 10):>8.2f} µs")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
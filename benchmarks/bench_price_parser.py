@@ -0,0 +1,84 @@
+"""
+Fiyat Ayrıştırıcı Benchmark'ı
+=============================
+
+price_corpus.json içindeki gerçek SerpAPI fiyat metinleri ve kategori bütçe
+bantları üzerinde app.price_parser fonksiyonlarının doğruluğunu kontrol eder
+ve saniyedeki ayrıştırma sayısını ölçer.
+
+Kullanım:
+    python -m benchmarks.bench_price_parser
+    python -m benchmarks.bench_price_parser --iterations 20000
+
+Doğruluk hatası varsa betik 1 çıkış koduyla biter.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from app.price_parser import parse_price, parse_budget_band
+
+CORPUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'price_corpus.json')
+
+
+def load_corpus(path=CORPUS_FILE):
+    """Fiyat ve bant korpusunu yükler."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def check_correctness(corpus):
+    """Korpustaki her girdiyi beklenen değerle karşılaştırır, hataları döndürür."""
+    failures = []
+    for case in corpus['prices']:
+        actual = parse_price(case['input'])
+        if abs(actual - case['expected']) > 1e-6:
+            failures.append(('price', case['input'], case['expected'], actual))
+    for case in corpus['bands']:
+        actual = list(parse_budget_band.__wrapped__(case['input']))
+        if actual != case['expected']:
+            failures.append(('band', case['input'], case['expected'], actual))
+    return failures
+
+
+def measure(func, inputs, iterations):
+    """func'ı inputs üzerinde iterations kez çalıştırır, saniyedeki çağrı sayısını döndürür."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for value in inputs:
+            func(value)
+    elapsed = time.perf_counter() - start
+    return (iterations * len(inputs)) / elapsed if elapsed > 0 else float('inf')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fiyat ayrıştırıcı benchmark')
+    parser.add_argument('--iterations', type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus()
+    failures = check_correctness(corpus)
+    total = len(corpus['prices']) + len(corpus['bands'])
+    print(f"🧪 Doğruluk: {total - len(failures)}/{total} girdi doğru")
+    for kind, text, expected, actual in failures:
+        print(f"  ❌ {kind}: '{text}' beklenen={expected} bulunan={actual}")
+
+    prices = [case['input'] for case in corpus['prices']]
+    bands = [case['input'] for case in corpus['bands']]
+
+    results = {
+        'parse_price': measure(parse_price, prices, args.iterations),
+        'parse_budget_band (cold)': measure(parse_budget_band.__wrapped__, bands, args.iterations),
+        'parse_budget_band (memo)': measure(parse_budget_band, bands, args.iterations),
+    }
+    for name, ops in results.items():
+        print(f"⚡ {name}: {ops:,.0f} ops/s")
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
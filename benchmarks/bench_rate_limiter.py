@@ -0,0 +1,136 @@
+"""
+Upstream Hız Sınırlayıcı Benchmark'ı
+====================================
+
+Kotası sınırlı sahte Gemini'ye (FAKE_GEMINI_QUOTA) eşzamanlı bir çağrı
+patlaması gönderir ve generate_with_retry'ı iki kurulumda karşılaştırır:
+
+- sınırsız: governor kotayı bilmez; her 429 çağıranı `--retry-delay`
+  saniye uyutur (gerçekte 10-15 sn), yeniden denemeler yine 429 alır
+- governor: kota governor'da uygulanır; 429 gelirse governor duraklar ve
+  yeniden deneme kuyrukta bekler
+
+Ayrıca dar bir kotada önce arka plan, sonra etkileşimli çağrılar kuyruğa
+sokulur ve iki önceliğin kuyrukta bekleme süreleri raporlanır.
+
+Kullanım:
+    python -m benchmarks.bench_rate_limiter
+    python -m benchmarks.bench_rate_limiter --calls 300 --threads 48 --quota 30
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import threading
+import time
+
+from benchmarks.common import summarize
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def burst(calls, threads, retry_delay):
+    """`threads` thread ile toplam `calls` çağrı; (başarılı, başarısız, süreler ms, toplam s)."""
+    from app.config import generate_with_retry
+    from app.fake_upstreams import FakeGeminiModel
+
+    remaining = [calls]
+    lock = threading.Lock()
+    outcomes = {'ok': 0, 'failed': 0}
+    durations = []
+
+    def worker():
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            start = time.perf_counter()
+            response = generate_with_retry(FakeGeminiModel.from_env(), 'USER QUERY: "telefon"', max_retries=3,
+                                           delay=retry_delay, call_site='bench_rate_limiter')
+            with lock:
+                outcomes['ok' if response else 'failed'] += 1
+                durations.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return outcomes['ok'], outcomes['failed'], durations, time.perf_counter() - start
+
+
+def priority_demo(rate_per_minute):
+    """Önce 12 arka plan, sonra 4 etkileşimli çağrı; öncelik başına kuyruk bekleme süreleri (ms)."""
+    from app.rate_limiter import BACKGROUND, INTERACTIVE, UpstreamGovernor
+
+    governor = UpstreamGovernor('demo', rate_per_minute=rate_per_minute, max_concurrency=2, burst=1)
+    waits = {INTERACTIVE: [], BACKGROUND: []}
+
+    def call(level):
+        with governor.slot(level) as waited:
+            waits[level].append(waited * 1000)
+            time.sleep(0.01)
+
+    pool = []
+    for level, count in ((BACKGROUND, 12), (INTERACTIVE, 4)):
+        for _ in range(count):
+            thread = threading.Thread(target=call, args=(level,))
+            thread.start()
+            pool.append(thread)
+        time.sleep(0.05)
+    for thread in pool:
+        thread.join()
+    return summarize(waits[INTERACTIVE]), summarize(waits[BACKGROUND])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Upstream hız sınırlayıcı benchmark')
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--quota', type=int, default=40, help='sahte Gemini kotası (istek/sn)')
+    parser.add_argument('--latency-ms', type=int, default=50)
+    parser.add_argument('--retry-delay', type=float, default=2.0, help='sınırsız kurulumda 429 sonrası bekleme')
+    args = parser.parse_args(argv)
+
+    os.environ['GEMINI_BACKEND'] = 'fake'
+    os.environ['FAKE_GEMINI_LATENCY'] = f'fixed:{args.latency_ms}'
+    os.environ['FAKE_GEMINI_ERROR_RATE'] = '0'
+    os.environ['FAKE_GEMINI_QUOTA'] = f'{args.quota}/s'
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+
+    from app import rate_limiter
+    from app.fake_upstreams import get_fake_quota
+
+    rows = []
+    setups = (
+        ('sınırsız', rate_limiter.UpstreamGovernor('gemini', rate_per_minute=0, max_concurrency=args.threads)),
+        ('governor', rate_limiter.UpstreamGovernor('gemini', rate_per_minute=args.quota * 60 * 0.95,
+                                                   max_concurrency=16, burst=4)),
+    )
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        for name, governor in setups:
+            # Her kurulum taze bir kota ile başlar
+            quota = get_fake_quota('GEMINI')
+            quota.tokens, quota.rejected = quota.burst, 0
+            rate_limiter._governors['gemini'] = governor
+            ok, failed, durations, elapsed = burst(args.calls, args.threads, args.retry_delay)
+            rows.append((name, ok, failed, quota.rejected, elapsed, summarize(durations)))
+        interactive, background = priority_demo(rate_per_minute=600)
+
+    print(f"\n🚦 {args.calls} çağrı / {args.threads} thread, sahte Gemini kotası {args.quota}/s, "
+          f"gecikme {args.latency_ms} ms")
+    for name, ok, failed, rejected, elapsed, stats in rows:
+        print(f"  ⚡ {name:<9} başarılı {ok:>4}  başarısız {failed:>4}  429 {rejected:>4}  "
+              f"{ok / elapsed:6.1f} çağrı/s  p95 {stats['p95_ms']:7.0f} ms")
+    print("⏳ kuyruk bekleme (10/s kota, 2 eşzamanlı, arka plan önce kuyrukta)")
+    print(f"  ⚡ etkileşimli  p50 {interactive['p50_ms']:6.0f} ms  max {interactive['max_ms']:6.0f} ms")
+    print(f"  ⚡ arka plan    p50 {background['p50_ms']:6.0f} ms  max {background['max_ms']:6.0f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+İstek Birleştirme Benchmark'ı
+=============================
+
+Trafik sıçramasını taklit eder: `--requests` adet eşzamanlı arama,
+`--distinct` farklı tercih setine dağılır ve aynı anda başlar. Sahte
+SerpAPI ve sahte Gemini ile ModernSearchEngine.search_products
+(önbellek + istek birleştirme) ve önbelleksiz/birleştirmesiz gövde
+(_search_products_uncached) çalıştırılır; arama zincirinin (grounding →
+SerpAPI → öneriler) kaç kez çalıştığı ve istek gecikmesi karşılaştırılır.
+
+Kullanım:
+    python -m benchmarks.bench_request_coalescing
+    python -m benchmarks.bench_request_coalescing --requests 64 --distinct 4 --latency-ms 300
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import threading
+import time
+
+from benchmarks.common import summarize
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_preferences(distinct):
+    brands = ['Apple', 'Samsung', 'Xiaomi', 'Huawei', 'Oppo', 'Google', 'Sony', 'Nokia']
+    return [{'category': 'Phone', 'budget_min': 25000, 'budget_max': 40000,
+             'features': [brands[i % len(brands)], f'seri {i}'], 'language': 'tr'} for i in range(distinct)]
+
+
+def spike(search, preferences, requests):
+    """requests adet thread'i aynı anda başlatır; istek sürelerini (ms) döndürür."""
+    barrier = threading.Barrier(requests)
+    durations = []
+
+    def worker(i):
+        barrier.wait()
+        start = time.perf_counter()
+        search(dict(preferences[i % len(preferences)]))
+        durations.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(requests)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return durations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='İstek birleştirme benchmark')
+    parser.add_argument('--requests', type=int, default=32)
+    parser.add_argument('--distinct', type=int, default=3)
+    parser.add_argument('--latency-ms', type=int, default=200, help='sahte Gemini/SerpAPI gecikmesi')
+    args = parser.parse_args(argv)
+
+    os.environ['GEMINI_BACKEND'] = 'fake'
+    os.environ['SERPAPI_BACKEND'] = 'fake'
+    os.environ['FAKE_GEMINI_LATENCY'] = f'fixed:{args.latency_ms}'
+    os.environ['FAKE_SERPAPI_LATENCY'] = f'fixed:{args.latency_ms}'
+    os.environ.setdefault('FAKE_GEMINI_ERROR_RATE', '0')
+    os.environ.setdefault('FAKE_SERPAPI_ERROR_RATE', '0')
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    os.chdir(ROOT_DIR)
+
+    preferences = make_preferences(args.distinct)
+    rows = []
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        from app.cache import get_cache
+        from app.search_engine import ModernSearchEngine
+
+        from app.shopping_fetcher import get_shopping_fetcher
+
+        executions = [0]
+        uncached = ModernSearchEngine._search_products_uncached
+
+        def counted(self, *args, **kwargs):
+            executions[0] += 1
+            return uncached(self, *args, **kwargs)
+
+        ModernSearchEngine._search_products_uncached = counted
+        modes = (
+            ('birleştirmesiz', lambda prefs: counted(ModernSearchEngine(), prefs)),
+            ('birleştirmeli', lambda prefs: ModernSearchEngine().search_products(prefs)),
+        )
+        for name, search in modes:
+            get_cache('search_results').clear_local()
+            get_shopping_fetcher()._entries.clear()
+            executions[0] = 0
+            start = time.perf_counter()
+            durations = spike(search, preferences, args.requests)
+            rows.append((name, executions[0], time.perf_counter() - start, summarize(durations)))
+
+    print(f"\n🌊 {args.requests} eşzamanlı arama, {args.distinct} farklı tercih seti, "
+          f"sahte upstream {args.latency_ms} ms")
+    for name, upstream, elapsed, stats in rows:
+        print(f"  ⚡ {name:<16} arama zinciri {upstream:>4}  toplam {elapsed:5.2f} s  "
+              f"p50 {stats['p50_ms']:7.0f} ms  p95 {stats['p95_ms']:7.0f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
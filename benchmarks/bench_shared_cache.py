@@ -0,0 +1,107 @@
+"""
+Paylaşımlı Önbellek Benchmark'ı
+===============================
+
+Birden çok worker'ı (her biri kendi L1'i olan ayrı TieredCache) aynı
+sahte Redis sunucusuna bağlayıp Zipf dağılımlı bir sorgu akışını işler.
+Upstream çağrısı (compute) sayısı ve isabet oranı üç kurulumda karşılaştırılır:
+
+- yok: istek başına önbellek (eski CategoryGenerator/ModernSearchEngine davranışı)
+- L1: worker başına süreç içi önbellek
+- L1+L2: worker başına L1 + paylaşımlı sahte Redis
+
+Ayrıca aynı anahtarı aynı anda isteyen thread'lerde (farklı worker'lar)
+compute'un kaç kez çalıştığı ölçülür (stampede koruması).
+
+Kullanım:
+    python -m benchmarks.bench_shared_cache
+    python -m benchmarks.bench_shared_cache --workers 8 --requests 4000 --keys 500
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+
+from app.cache import LocalCache, RedisClient, TieredCache
+from app.fake_upstreams import FakeRedisServer
+
+
+def zipf_stream(keys, requests, s=1.1, seed=42):
+    """Popüler sorguların çok tekrarlandığı bir sorgu akışı."""
+    rng = random.Random(seed)
+    weights = [1 / (rank ** s) for rank in range(1, keys + 1)]
+    return rng.choices(range(keys), weights=weights, k=requests)
+
+
+def run(stream, workers, mode, url, compute_ms):
+    """Akışı worker'lara sırayla dağıtır; (compute sayısı, süre) döndürür."""
+    computes = [0]
+    caches = []
+    for _ in range(workers):
+        l2 = RedisClient.from_url(url) if mode == 'L1+L2' else None
+        caches.append(TieredCache('bench', l1=LocalCache(4096), l2=l2, ttl=600))
+
+    def compute(key):
+        computes[0] += 1
+        time.sleep(compute_ms / 1000)
+        return {'query': key, 'recommendations': list(range(20))}
+
+    start = time.perf_counter()
+    for i, key in enumerate(stream):
+        if mode == 'yok':
+            compute(key)
+            continue
+        caches[i % workers].get_or_set(f'q{key}', lambda key=key: compute(key))
+    return computes[0], time.perf_counter() - start
+
+
+def stampede(url, threads, compute_ms):
+    """threads adet worker aynı anahtarı aynı anda ister; compute sayısını döndürür."""
+    computes = [0]
+    barrier = threading.Barrier(threads)
+
+    def compute():
+        computes[0] += 1
+        time.sleep(compute_ms / 1000)
+        return 'value'
+
+    def worker():
+        cache = TieredCache('stampede', l1=LocalCache(), l2=RedisClient.from_url(url), ttl=600)
+        barrier.wait()
+        cache.get_or_set('hot', compute)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return computes[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Paylaşımlı önbellek benchmark')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--keys', type=int, default=300)
+    parser.add_argument('--compute-ms', type=float, default=1.0, help='simüle edilen upstream süresi')
+    args = parser.parse_args(argv)
+
+    server = FakeRedisServer().start()
+    stream = zipf_stream(args.keys, args.requests)
+    print(f"📦 {args.requests} istek, {len(set(stream))} farklı sorgu, {args.workers} worker")
+    for mode in ('yok', 'L1', 'L1+L2'):
+        server.execute([b'FLUSHALL'])
+        computes, elapsed = run(stream, args.workers, mode, server.url, args.compute_ms)
+        hit_rate = 1 - computes / len(stream)
+        print(f"  ⚡ {mode:<6} upstream çağrısı {computes:>6}  isabet %{hit_rate * 100:5.1f}  {elapsed:6.2f} s")
+
+    computes = stampede(server.url, 16, compute_ms=200)
+    print(f"🐘 stampede: 16 worker aynı anahtar → compute {computes} kez")
+    server.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
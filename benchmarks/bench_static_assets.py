@@ -0,0 +1,79 @@
+"""
+Statik Dosya Sunumu Benchmark'ı
+===============================
+
+website/ dosyalarını Flask'ın send_from_directory'si ile ve
+app.static_assets hattı ile sunar; istek başına süreyi ve aktarılan byte'ı
+karşılaştırır. Hat için ilk ziyaret (gzip gövde) ve tekrar ziyaret
+(If-None-Match → 304) ayrı ölçülür. "boş istek" satırı, Flask test
+istemcisinin kendi istek başına maliyetini gösterir.
+
+Kullanım:
+    python -m benchmarks.bench_static_assets
+    python -m benchmarks.bench_static_assets --iterations 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from flask import Flask, send_from_directory
+
+from app.static_assets import StaticAssetPipeline
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_app():
+    app = Flask(__name__, static_folder=os.path.join(ROOT_DIR, 'website'))
+    pipeline = StaticAssetPipeline(app.static_folder)
+
+    @app.route('/baseline/<path:filename>')
+    def baseline(filename):
+        return send_from_directory(app.static_folder, filename)
+
+    @app.route('/pipeline/<path:filename>')
+    def pipeline_files(filename):
+        return pipeline.serve(filename)
+
+    @app.route('/noop')
+    def noop():
+        return ''
+
+    return app
+
+
+def measure(client, url, headers, iterations):
+    """Çağrı başına mikrosaniye, son yanıtın durum kodu ve gövde boyutu."""
+    response = client.get(url, headers=headers)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        response = client.get(url, headers=headers)
+    elapsed = (time.perf_counter() - start) / iterations * 1e6
+    return elapsed, response.status_code, len(response.data), response.headers.get('ETag')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Statik dosya sunumu benchmark')
+    parser.add_argument('--iterations', type=int, default=500)
+    args = parser.parse_args(argv)
+
+    client = make_app().test_client()
+    accept = {'Accept-Encoding': 'gzip, deflate, br'}
+    us, _, _, _ = measure(client, '/noop', {}, args.iterations)
+    print(f"⏱️ boş istek (test istemcisi maliyeti): {us:.0f} µs")
+    for filename in ('main.html', 'main.js'):
+        print(f"📄 {filename}")
+        us, status, size, _ = measure(client, f'/baseline/{filename}', accept, args.iterations)
+        print(f"  ⚡ {'send_from_directory':<22}{us:>8.0f} µs  {status}  {size:>7,} bytes")
+        us, status, size, etag = measure(client, f'/pipeline/{filename}', accept, args.iterations)
+        print(f"  ⚡ {'pipeline (ilk ziyaret)':<22}{us:>8.0f} µs  {status}  {size:>7,} bytes")
+        us, status, size, _ = measure(client, f'/pipeline/{filename}', dict(accept, **{'If-None-Match': etag}),
+                                      args.iterations)
+        print(f"  ⚡ {'pipeline (tekrar, 304)':<22}{us:>8.0f} µs  {status}  {size:>7,} bytes")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
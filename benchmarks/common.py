@@ -0,0 +1,100 @@
+"""
+Benchmark Ortak Yardımcıları
+============================
+
+Benchmark betiklerinin paylaştığı yüzdelik hesabı, özet istatistikler ve
+makine tarafından okunabilir sonuç dosyası yazımı.
+
+Fonksiyonlar:
+- percentile(): Nearest-rank yüzdelik
+- summarize(): Süre listesinden count/mean/p50/p95/p99/max özeti
+- run_metadata(): Git revizyonu, Python sürümü ve backend ayarları
+- write_results(): Sonuçları JSON olarak yazar
+- compare_results(): İki sonuç dosyasının p95 değerlerini karşılaştırır
+"""
+
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def percentile(sorted_values, pct):
+    """Sıralı listede nearest-rank yüzdeliği döndürür."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(durations_ms):
+    """Milisaniye cinsinden süre listesinin özetini döndürür."""
+    values = sorted(durations_ms)
+    if not values:
+        return {'count': 0}
+    return {
+        'count': len(values),
+        'mean_ms': round(sum(values) / len(values), 3),
+        'p50_ms': round(percentile(values, 50), 3),
+        'p95_ms': round(percentile(values, 95), 3),
+        'p99_ms': round(percentile(values, 99), 3),
+        'max_ms': round(values[-1], 3)
+    }
+
+
+def run_metadata():
+    """Sonuçların karşılaştırılabilmesi için çalışma ortamı bilgisi."""
+    try:
+        revision = subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_revision': revision,
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'backends': {
+            'gemini': os.getenv('GEMINI_BACKEND', 'google'),
+            'serpapi': os.getenv('SERPAPI_BACKEND') or os.getenv('SERPAPI_BASE_URL') or 'serpapi.com'
+        }
+    }
+
+
+def write_results(name, payload, path=None):
+    """Sonuçları JSON olarak yazar, yazılan dosya yolunu döndürür."""
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        path = os.path.join(RESULTS_DIR, f'{name}-{stamp}.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def compare_results(baseline_path, current, key='steps', metric='p95_ms'):
+    """
+    Temel sonuç dosyası ile mevcut sonuçları karşılaştırır.
+
+    Returns:
+        list: (isim, temel değer, mevcut değer, yüzde değişim) satırları
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    rows = []
+    for name, stats in current.get(key, {}).items():
+        old = baseline.get(key, {}).get(name, {}).get(metric)
+        new = stats.get(metric)
+        if old is None or new is None:
+            continue
+        change = (new - old) / old * 100 if old else 0.0
+        rows.append((name, old, new, round(change, 1)))
+    return rows
@@ -17,9 +17,13 @@ Ana Özellikler:
 
 API Endpoint'leri:
 - /detect_category: Kullanıcı sorgusundan kategori tespiti
+- /detect_category/batch: Çok sayıda sorgu için toplu kategori tespiti
 - /search/<query>: Akıllı kategori arama
 - /categories: Mevcut kategorileri listele
-- /ask: Soru-cevap akışını yönet
+- /ask: Soru-cevap akışını yönet (response_version=2: kompakt öneri şeması)
+- /ask/grounding/<id>: v2 yanıtlarındaki grounding metni
+- /metrics: Prometheus formatında metrikler
+- /admin/profiles: İstek profilleri (FINDFLOW_ADMIN_TOKEN gerekli)
 - /: Ana web sayfası
 
 Gereksinimler:
@@ -48,10 +52,11 @@ def install_requirements():
     req_file = os.path.join(os.path.dirname(__file__), 'requirements.txt')
     subprocess.check_call([sys.executable, '-m', 'pip', 'install', '-r', req_file])
 
-install_requirements()
+# Benchmark/test ortamında (run.py import edilirken) kurulum atlanabilir
+if os.getenv('FINDFLOW_SKIP_INSTALL') != '1':
+    install_requirements()
 
-import json
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify
 from dotenv import load_dotenv
 from app.agent import Agent
 from app.agent import detect_category_from_query
@@ -59,13 +64,29 @@ from app.agent import detect_category_from_query
 # .env dosyasını yükle (SerpAPI anahtarı için kritik!)
 load_dotenv()
 from app.category_generator import add_dynamic_category_route
+from app import telemetry, profiling, json_codec, response_schema
+from app.deadline import BUDGET_HEADER, configured_budget, request_deadline
+from app.static_assets import StaticAssetPipeline
 
 app = Flask(__name__, static_folder='website')
+# Ön yüz dosyaları başlangıçta gzip/br varyantları ve ETag'leri ile belleğe alınır
+static_assets = StaticAssetPipeline(app.static_folder)
+# jsonify ve dict dönen view'lar orjson (varsa) ile doğrudan bytes'a kodlanır
+json_codec.install(app)
 agent = Agent()
 
 # Dinamik kategori oluşturma özelliğini ekle
 add_dynamic_category_route(app)
 
+# Kompakt (v2) öneri yanıtlarının grounding metni ayrı endpoint'ten alınır
+response_schema.install(app)
+
+# İstek zamanlaması, Server-Timing header'ı ve /metrics endpoint'i
+telemetry.install(app)
+
+# Admin token'lı isteklerde isteğe bağlı profil (X-Profile: sample|cprofile)
+profiling.install(app)
+
 @app.route('/detect_category', methods=['POST'])
 def detect_category():
     """
@@ -104,12 +125,13 @@ def index():
     Ana web sayfasını döndürür.
     
     Bu endpoint, kullanıcıların ürün arama ve kategori seçimi
-    yapabileceği ana arayüzü sunar.
+    yapabileceği ana arayüzü sunar. Sayfa her ziyarette ETag ile
+    doğrulanır; değişmediyse 304 döner.
     
     Returns:
         HTML: Ana web sayfası
     """
-    return app.send_static_file('main.html')
+    return static_assets.serve('main.html')
 
 @app.route('/<path:filename>')
 def static_files(filename):
@@ -117,15 +139,16 @@ def static_files(filename):
     Statik dosyaları (CSS, JS, resimler) sunar.
     
     Bu endpoint, web sitesinin statik dosyalarını (JavaScript,
-    CSS, resimler vb.) sunar.
+    CSS, resimler vb.) bellekteki sıkıştırılmış varyantlarından sunar.
+    Sürümlü istekler (?v=<hash>) bir yıl önbelleklenir.
     
     Args:
         filename: İstenen dosya adı
         
     Returns:
-        İstenen statik dosya
+        İstenen statik dosya (200), 304 veya 404
     """
-    return send_from_directory(app.static_folder, filename)
+    return static_assets.serve(filename)
 
 @app.route('/categories')
 def get_categories():
@@ -138,9 +161,8 @@ def get_categories():
     Returns:
         JSON: Kategori listesi ve özellikleri
     """
-    with open('categories.json', 'r', encoding='utf-8') as f:
-        categories = json.load(f)
-    return jsonify(categories)
+    # Dosya değişene kadar ayrıştırılmış ve kodlanmış hali önbellekte
+    return jsonify(json_codec.cached_file_payload('categories.json'))
 
 @app.route('/ask', methods=['POST'])
 def ask():
@@ -155,14 +177,21 @@ def ask():
         "step": 1,
         "category": "Headphones", 
         "answers": ["Yes", "No"],
-        "language": "tr"
+        "language": "tr",
+        "response_version": 2   # opsiyonel (veya ?v=2), varsayılan 1
     }
     
     Döner:
     - Soru varsa: {"question": "...", "options": ["Yes", "No"], "emoji": "🎧"}
-    - Öneriler varsa: {"recommendations": [...], "amazon_products": [...]}
+    - Öneriler varsa (v1): {"recommendations": [...], "shopping_results": [...], "grounding_results": {...}, ...}
+    - Öneriler varsa (v2): {"v": 2, "products": [...], "recommendations": [index, ...],
+      "shopping_results": [index, ...], "grounding": {"url": ...}} (index: products listesindeki sıra)
     - Hata varsa: {"error": "..."}
     
+    İstek, istemcinin X-Request-Budget-Ms başlığından (varsayılan 45 sn)
+    hesaplanan bir deadline içinde çalışır (app.deadline); süre yetmezse
+    upstream aşamaları atlanır ve degraded sonuç döner.
+    
     Özellikler:
     - Dinamik soru akışı
     - Tercih analizi
@@ -177,7 +206,10 @@ def ask():
     # Dosyaya da yazdıralım
     with open('debug_log.txt', 'a', encoding='utf-8') as f:
         f.write(f"📩 /ask veri: {data}\n")
-    response = agent.handle(data)
+    with request_deadline(configured_budget(request.headers.get(BUDGET_HEADER))):
+        response = agent.handle(data)
+    if response_schema.requested_version(data, request.args) >= 2:
+        response = response_schema.compact_response(response)
     return jsonify(response)
 
 @app.route('/amazon/product/<asin>', methods=['GET'])
@@ -10,6 +10,9 @@ let currentCategory = ''; // Global kategori değişkeni
 let currentQuestionIndex = 0;
 let totalQuestions = 7;
 
+// /ask zaman aşımı (ms); sunucuya X-Request-Budget-Ms ile bildirilir
+const ASK_TIMEOUT_MS = 45000;
+
 // Otomatik tamamlama için global değişkenler
 let autocompleteData = [];
 let selectedAutocompleteIndex = -1;
@@ -765,6 +768,15 @@ function renderQuestion(question, options, emoji) {
     interaction.style.display = 'block';
 }
 
+// v2 kompakt yanıtta öneriler products listesindeki indekslerdir; render için ürün nesnelerine çevir
+function expandCompactResponse(data) {
+    if (!data || data.v !== 2 || !data.products) return data;
+    const lookup = ids => (ids || []).map(id => data.products[id]).filter(Boolean);
+    data.recommendations = lookup(data.recommendations);
+    if (data.shopping_results) data.shopping_results = lookup(data.shopping_results);
+    return data;
+}
+
 function renderRecommendations(recs) {
     console.log("🎯 renderRecommendations called");
     console.log("📊 Recommendations data:", recs);
@@ -967,16 +979,21 @@ function askAgent() {
             if (loadingElement) loadingElement.style.display = 'none';
             showErrorScreen();
         }
-    }, 45000);
+    }, ASK_TIMEOUT_MS);
     
     fetch('/ask', {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
+        headers: {
+            'Content-Type': 'application/json',
+            // Sunucu kendi süre bütçesini bu değere göre ayarlar
+            'X-Request-Budget-Ms': String(ASK_TIMEOUT_MS)
+        },
         body: JSON.stringify({ 
             step: step, 
             category: category, 
             answers: answers,
-            language: currentLanguage
+            language: currentLanguage,
+            response_version: 2
         })
     })
     .then(res => {
@@ -989,6 +1006,7 @@ function askAgent() {
     .then(data => {
         clearTimeout(timeoutId);
         isRequestInProgress = false;
+        data = expandCompactResponse(data);
         console.log("🔄 Sunucudan gelen yanıt:", data);
         console.log("🔍 Response type:", data.type);
         console.log("🔍 Response keys:", Object.keys(data));
@@ -1018,8 +1036,8 @@ function askAgent() {
             renderRecommendations(data.recommendations);
             
             // Grounding results varsa göster
-            if (data.grounding_results) {
-                console.log("🔍 Grounding results:", data.grounding_results);
+            if (data.grounding_results || data.grounding) {
+                console.log("🔍 Grounding results:", data.grounding_results || data.grounding);
             }
             
             // Shopping results varsa göster